@@ -28,6 +28,10 @@ class Config:
     POINT_SIZE = 3.0  # 点云大小（增大以便于查看）
     BACKGROUND_COLOR = [0.9, 0.9, 0.95]  # 浅灰白色背景（高对比度，便于查看点云）
     
+    # Debug面板配置
+    TREE_VIEW_CHUNK_ROWS = 200  # Treeview（debug.txt、匹配列表）每次滚动到底部时追加显示的行数
+    DEBUG_SMALL_FILE_BYTES = 4096  # 不超过该大小的debug.txt直接用Label显示，不创建Treeview
+    
     # 坐标系配置
     COORDINATE_AXIS_LENGTH = 8.0  # 坐标轴长度（默认值，会根据点云自动调整，已增大）
     COORDINATE_AXIS_RADIUS = 0.02  # 坐标轴半径（用于圆柱体）
@@ -36,6 +40,12 @@ class Config:
     COORDINATE_GRID_SIZE = 0.5  # 网格大小（每个网格单元的尺寸）
     COORDINATE_GRID_COLOR = [0.3, 0.3, 0.3]  # 网格颜色（深灰色）
     
+    # 日志配置
+    VERBOSE_DEBUG = False  # 是否输出高频调用（如按id取颜色）和逐个点云/匹配项的日志
+    
+    # 数据加载配置
+    PLY_LOAD_WORKERS = 4  # 并行读取同一帧ply文件的线程数
+    
     # 支持的文件类型
     PLY_EXTENSION = ".ply"
     JSON_EXTENSION = ".json"
@@ -3,7 +3,7 @@
 定义用于存储从data文件夹读取的数据的数据类
 """
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 import open3d as o3d
 import numpy as np
 
@@ -190,6 +190,12 @@ class DebugInfo:
         )
 
 
+class IdPair(NamedTuple):
+    """匹配对象ID（match.json中的{"a": 类型, "b": id}），可直接解包为(type, id)"""
+    a: Optional[int]  # 类型：1=plane, 2=ground
+    b: Optional[int]  # id
+
+
 @dataclass
 class PointMatch:
     """点匹配数据类"""
@@ -2,14 +2,39 @@
 数据加载模块
 负责读取.ply点云文件和.json元数据文件
 """
-import json
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import open3d as o3d
 import numpy as np
 
 from .config import Config
-from .dynamic_classes import create_class_from_dict, load_json_to_dynamic_class
+from .data_classes import IdPair
+from .dynamic_classes import create_class_from_dict, load_json_file, load_json_to_dynamic_class
+
+
+# debug.txt解析用的正则和前缀
+_DEBUG_T_PATTERN = re.compile(r't\(xyz\)\s*=\s*([-\d.eE+\s]+)')
+_DEBUG_Q_PATTERN = re.compile(r'q\(wxyz\)\s*=\s*([-\d.eE+\s]+)')
+_DEBUG_ITER_PATTERN = re.compile(r'^\d+iteration:')
+_DEBUG_COST_PREFIXES = (('axis cost before', 'axis_cost_before'), ('axis cost after', 'axis_cost_after'))
+
+
+def uniform_normals(num_points: int) -> np.ndarray:
+    """
+    创建所有点都朝向+Z的统一法向量数组
+
+    Args:
+        num_points: 点数
+
+    Returns:
+        形状为(num_points, 3)的float64数组，每行都是[0, 0, 1]
+    """
+    normals = np.zeros((num_points, 3))
+    normals[:, 2] = 1.0
+    return normals
 
 
 class DataLoader:
@@ -26,10 +51,19 @@ class DataLoader:
         # 存储ply文件信息的字典，key为id（int或str），value为文件信息字典
         # 格式: {id: {'file_path': Path, 'point_cloud': PointCloud, 'metadata': Any, 'name': str, 'type': str, 'frame_id': int, 'frame_type': str}}
         self.ply_file_map: Dict[Any, Dict[str, Any]] = {}
+        # ply_file_map的反向索引 {(name, type): id}，与ply_file_map同时更新
+        self.ply_file_map_by_name: Dict[Tuple[str, str], Any] = {}
+        # dense_pt_match映射缓存 {frame_id: (match.json修改时间, {cur_id: other_id})}
+        self._dense_pt_match_cache: Dict[int, Tuple[int, Dict[int, int]]] = {}
+        # 并行读取ply文件的线程池（Open3D读取文件时释放GIL）
+        self._io_executor = ThreadPoolExecutor(max_workers=Config.PLY_LOAD_WORKERS,
+                                               thread_name_prefix="ply-io")
     
-    def _extract_file_id(self, file_name: str) -> Optional[Any]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _extract_file_id(file_name: str) -> Optional[Any]:
         """
-        从文件名中提取id
+        从文件名中提取id（结果按文件名缓存，重复刷新面板时不再重复解析）
         
         Args:
             file_name: 文件名（不含扩展名），例如 'ground_0', 'plane_1', 'dense_cloud'
@@ -76,6 +110,20 @@ class DataLoader:
             print(f"加载点云文件失败 {file_path}: {e}")
             return None
     
+    def load_point_clouds(self, file_paths: List[Path]) -> Iterator[Optional[o3d.geometry.PointCloud]]:
+        """
+        在线程池中并行加载多个点云文件
+        
+        结果按file_paths的顺序逐个返回，调用方处理前面的文件时后面的文件仍在后台读取
+        
+        Args:
+            file_paths: .ply文件路径列表
+            
+        Returns:
+            与file_paths一一对应的PointCloud对象迭代器（加载失败的为None）
+        """
+        return self._io_executor.map(self.load_point_cloud, file_paths)
+    
     def load_json_metadata(self, file_path: Path, use_dynamic_class: bool = True) -> Optional[Any]:
         """
         加载JSON元数据文件
@@ -96,8 +144,7 @@ class DataLoader:
                 return load_json_to_dynamic_class(str(file_path))
             else:
                 # 返回普通字典
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_json_file(str(file_path))
         except Exception as e:
             print(f"加载JSON文件失败 {file_path}: {e}")
             return None
@@ -167,12 +214,17 @@ class DataLoader:
             'metadata': {}
         }
         
+        # 在线程池中并行读取本帧的所有ply文件，下面按原顺序处理
+        ply_files = files.get('dense_cloud', [])[:1] + files.get('ground', []) + files.get('plane', [])
+        point_clouds = dict(zip(ply_files, self.load_point_clouds(ply_files)))
+        # 本帧ply文件的修改时间，用于判断基于这些文件计算的缓存是否仍然有效
+        result['source_mtimes'] = tuple(ply_file.stat().st_mtime_ns for ply_file in ply_files)
+        
         # 加载dense_cloud
         if files['dense_cloud']:
             dense_file = files['dense_cloud'][0]
-            pcd = self.load_point_cloud(dense_file)
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(pcd.points), 1))
+            pcd = point_clouds[dense_file]
+            normals = uniform_normals(len(pcd.points))
             pcd.normals = o3d.utility.Vector3dVector(normals)
             if pcd:
                 result['dense_cloud'] = pcd
@@ -190,12 +242,12 @@ class DataLoader:
                         'frame_id': frame_id,
                         'frame_type': frame_type
                     }
+                    self.ply_file_map_by_name[(dense_file.stem, 'dense_cloud')] = file_id
         
         # 加载ground点云
         for ground_file in files['ground']:
-            pcd = self.load_point_cloud(ground_file)
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(pcd.points), 1))
+            pcd = point_clouds[ground_file]
+            normals = uniform_normals(len(pcd.points))
             pcd.normals = o3d.utility.Vector3dVector(normals)
             if pcd:
                 # 尝试加载对应的JSON元数据（使用动态类）
@@ -218,12 +270,12 @@ class DataLoader:
                         'frame_id': frame_id,
                         'frame_type': frame_type
                     }
+                    self.ply_file_map_by_name[(ground_file.stem, 'ground')] = file_id
 
         # 加载plane点云
         for plane_file in files['plane']:
-            pcd = self.load_point_cloud(plane_file)
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(pcd.points), 1))
+            pcd = point_clouds[plane_file]
+            normals = uniform_normals(len(pcd.points))
             pcd.normals = o3d.utility.Vector3dVector(normals)
             if pcd:
                 # 尝试加载对应的JSON元数据（使用动态类）
@@ -246,6 +298,7 @@ class DataLoader:
                         'frame_id': frame_id,
                         'frame_type': frame_type
                     }
+                    self.ply_file_map_by_name[(plane_file.stem, 'plane')] = file_id
         
         return result
     
@@ -285,8 +338,6 @@ class DataLoader:
         axis cost before 1.26962 0.52992 1.44890
         axis cost after 1.26748 0.53076 1.44804
         """
-        import re
-        
         result = {
             'T_init_w_b': None,
             'T_opt_w_b': None,
@@ -298,6 +349,9 @@ class DataLoader:
                 lines = f.readlines()
             
             current_iter = None
+            # axis cost行先只收集数值字符串，最后一次性转换为float64数组
+            cost_targets = []  # [(iter_dict, 'axis_cost_before' / 'axis_cost_after')]
+            cost_tokens = []   # [[a, b, c]]
             
             for line in lines:
                 line = line.strip()
@@ -314,8 +368,8 @@ class DataLoader:
                     
                     # 提取t(xyz)和q(wxyz)
                     # 格式: t(xyz) = x y z, q(wxyz) = w x y z
-                    t_match = re.search(r't\(xyz\)\s*=\s*([-\d.eE+\s]+)', line)
-                    q_match = re.search(r'q\(wxyz\)\s*=\s*([-\d.eE+\s]+)', line)
+                    t_match = _DEBUG_T_PATTERN.search(line)
+                    q_match = _DEBUG_Q_PATTERN.search(line)
                     
                     if t_match and q_match:
                         t_values = [float(x) for x in t_match.group(1).split()]
@@ -338,8 +392,7 @@ class DataLoader:
                             result[transform_name] = transform_dict
                 
                 # 解析iteration行
-                elif re.match(r'^\d+iteration:', line):
-                    iter_num = int(re.match(r'^(\d+)iteration:', line).group(1))
+                elif _DEBUG_ITER_PATTERN.match(line):
                     current_iter = {
                         'axis_cost_before': None,
                         'axis_cost_after': None
@@ -347,25 +400,20 @@ class DataLoader:
                     result['iter_infos'].append(current_iter)
                 
                 # 解析axis cost before/after
-                elif 'axis cost before' in line:
-                    if current_iter is not None:
-                        values = [float(x) for x in line.replace('axis cost before', '').strip().split()]
-                        if len(values) == 3:
-                            current_iter['axis_cost_before'] = {
-                                'a': values[0],
-                                'b': values[1],
-                                'c': values[2]
-                            }
-                
-                elif 'axis cost after' in line:
-                    if current_iter is not None:
-                        values = [float(x) for x in line.replace('axis cost after', '').strip().split()]
-                        if len(values) == 3:
-                            current_iter['axis_cost_after'] = {
-                                'a': values[0],
-                                'b': values[1],
-                                'c': values[2]
-                            }
+                elif current_iter is not None and line.startswith('axis cost '):
+                    for prefix, key in _DEBUG_COST_PREFIXES:
+                        if line.startswith(prefix):
+                            tokens = line[len(prefix):].split()
+                            if len(tokens) == 3:
+                                cost_targets.append((current_iter, key))
+                                cost_tokens.append(tokens)
+                            break
+            
+            # 一次性转换所有axis cost数值
+            if cost_tokens:
+                cost_values = np.asarray(cost_tokens, dtype=np.float64).tolist()
+                for (iter_dict, key), (a, b, c) in zip(cost_targets, cost_values):
+                    iter_dict[key] = {'a': a, 'b': b, 'c': c}
             
             # 检查是否成功解析
             if result['T_init_w_b'] is None or result['T_opt_w_b'] is None:
@@ -379,9 +427,97 @@ class DataLoader:
             return None
     
     def load_match_info(self, frame_id: int, use_dynamic_class: bool = True) -> Optional[Any]:
-        """加载match.json文件"""
+        """
+        加载match.json文件
+        
+        以字典形式加载时，plane_match_infos的cur_id/other_id和pt_match_infos的other_id
+        会被统一转换为IdPair，使用方可以直接解包为(type, id)
+        """
         match_path = Config.get_data_frame_path(frame_id) / "match.json"
-        return self.load_json_metadata(match_path, use_dynamic_class=use_dynamic_class)
+        match_info = self.load_json_metadata(match_path, use_dynamic_class=use_dynamic_class)
+        if not use_dynamic_class and isinstance(match_info, dict):
+            self._normalize_match_ids(match_info)
+        return match_info
+    
+    @staticmethod
+    def _normalize_match_ids(match_info: Dict[str, Any]):
+        """
+        将match信息中{"a": 类型, "b": id}形式的匹配对象ID原地转换为IdPair
+        
+        Args:
+            match_info: match.json加载得到的字典
+        """
+        for list_name, id_fields in (('plane_match_infos', ('cur_id', 'other_id')),
+                                     ('pt_match_infos', ('other_id',))):
+            for match in match_info.get(list_name) or []:
+                if type(match) is not dict:
+                    continue
+                for field in id_fields:
+                    id_obj = match.get(field)
+                    if type(id_obj) is dict:
+                        match[field] = IdPair(id_obj.get('a'), id_obj.get('b'))
+    
+    def get_dense_pt_match_mapping(self, frame_id: int, match_info: Any = None) -> Dict[int, int]:
+        """
+        获取当前帧稠密点与地图稠密点的匹配映射，按帧缓存，match.json修改后重新计算
+        
+        Args:
+            frame_id: 帧ID
+            match_info: 已加载的match信息（字典或动态类），为None时从match.json加载
+            
+        Returns:
+            {cur_id (frame): other_id (map)}，只包含other_id >= 0的匹配
+        """
+        match_path = Config.get_data_frame_path(frame_id) / "match.json"
+        try:
+            mtime = match_path.stat().st_mtime_ns
+        except OSError:
+            return {}
+        
+        cached = self._dense_pt_match_cache.get(frame_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        if match_info is None:
+            match_info = self.load_match_info(frame_id, use_dynamic_class=False)
+        if isinstance(match_info, dict):
+            infos = match_info.get('dense_pt_match_infos') or []
+        else:
+            infos = getattr(match_info, 'dense_pt_match_infos', None) or []
+        
+        mapping = self._build_dense_pt_match_mapping(infos)
+        self._dense_pt_match_cache[frame_id] = (mtime, mapping)
+        return mapping
+    
+    @staticmethod
+    def _build_dense_pt_match_mapping(infos: List[Any]) -> Dict[int, int]:
+        """
+        将dense_pt_match_infos转换为{cur_id: other_id}映射
+        
+        Args:
+            infos: 匹配列表，元素为字典或动态类对象
+            
+        Returns:
+            {cur_id: other_id}，跳过id不是整数或other_id < 0的匹配
+        """
+        if not infos:
+            return {}
+        cur_ids = [m.get('cur_id') if type(m) is dict else getattr(m, 'cur_id', None) for m in infos]
+        other_ids = [m.get('other_id') if type(m) is dict else getattr(m, 'other_id', None) for m in infos]
+        
+        cur_array = np.array(cur_ids)
+        other_array = np.array(other_ids)
+        if cur_array.dtype.kind == 'i' and other_array.dtype.kind == 'i':
+            # 全部是整数id，直接用数组筛选
+            valid = other_array >= 0
+            return dict(zip(cur_array[valid].tolist(), other_array[valid].tolist()))
+        
+        # 存在缺失或非整数id，逐个检查
+        return {
+            cur_id: other_id
+            for cur_id, other_id in zip(cur_ids, other_ids)
+            if type(cur_id) is int and type(other_id) is int and other_id >= 0
+        }
     
     def quaternion_to_rotation_matrix(self, q: Dict[str, float]) -> np.ndarray:
         """
@@ -464,4 +600,21 @@ class DataLoader:
         清空ply文件信息map（切换帧时调用）
         """
         self.ply_file_map.clear()
+        self.ply_file_map_by_name.clear()
+
+    def find_ply_file_id(self, name: str, cloud_type: str) -> Optional[Any]:
+        """
+        根据点云名称和类型查找ply_file_map中的id，找不到时从文件名中提取
+
+        Args:
+            name: 点云名称，例如 'ground_0'
+            cloud_type: 点云类型 ('ground', 'plane', 'dense_cloud')
+
+        Returns:
+            id值，无法提取时返回None
+        """
+        file_id = self.ply_file_map_by_name.get((name, cloud_type))
+        if file_id is None:
+            file_id = self._extract_file_id(name)
+        return file_id
 
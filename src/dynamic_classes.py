@@ -6,6 +6,11 @@
 import json
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
 
 
 
@@ -82,6 +87,23 @@ def create_class_from_dict(data_dict: Dict[str, Any], class_name: str = "Dynamic
     return instance
 
 
+def load_json_file(file_path: str) -> Any:
+    """
+    读取JSON文件为字典，安装了orjson时使用orjson解析（比标准库json快数倍）
+    
+    Args:
+        file_path: JSON文件路径
+        
+    Returns:
+        解析后的数据
+    """
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def load_json_to_dynamic_class(file_path: str, class_name: Optional[str] = None) -> Any:
     """
     从JSON文件加载数据并创建动态类实例
@@ -93,8 +115,7 @@ def load_json_to_dynamic_class(file_path: str, class_name: Optional[str] = None)
     Returns:
         动态创建的类实例
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data_dict = json.load(f)
+    data_dict = load_json_file(file_path)
     
     if class_name is None:
         # 从文件名生成类名
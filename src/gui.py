@@ -2,14 +2,33 @@
 GUI界面模块
 提供图形用户界面，用于切换帧和控制可视化
 """
+import mmap
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
+from pathlib import Path
 from typing import Optional, Callable
 import open3d as o3d
 from .config import Config
+from .data_classes import IdPair
 from .visualizer import PointCloudVisualizer
 
 
+# 悬浮点坐标的显示格式
+_POINT_COORD_FORMAT = "坐标: (%.4f, %.4f, %.4f)"
+
+# 过滤dense_cloud点云没有颜色时各类点使用的默认颜色
+_DENSE_POINT_DEFAULT_COLORS = {
+    'matched_to_plane': [0.0, 1.0, 0.0],  # 绿色
+    'matched_to_dense': [0.0, 0.0, 1.0],  # 蓝色
+    'unmatched': [1.0, 0.0, 0.0],  # 红色
+}
+
+# 匹配对象类型编码/名称 -> 点云类型名称（match.json中a字段: 1=plane, 2=ground）
+_TYPE_NAMES = {1: "plane", 2: "ground", "plane": "plane", "ground": "ground"}
+
+
 class PointCloudGUI:
     """点云可视化GUI类"""
     
@@ -32,10 +51,39 @@ class PointCloudGUI:
         self.running = False
         
         # 匹配关系复选框存储
-        self.match_checkboxes = {}  # {match_index: (var, match_data)}
+        self.match_checkboxes = {}  # {match_index: match_data}
         # 未匹配项复选框存储
-        self.unmatched_frame_checkboxes = {}  # {(type, id): (var, item_data)}
-        self.unmatched_map_checkboxes = {}    # {(type, id): (var, item_data)}
+        self.unmatched_frame_checkboxes = {}  # {(type, id): item_data}
+        self.unmatched_map_checkboxes = {}    # {(type, id): item_data}
+        # 复选框列表的选中状态，每列一个bytearray，按行号存放0/1（行顺序与列表显示顺序一致）
+        self.checkbox_states = {'match': bytearray(), 'unmatched_frame': bytearray(), 'unmatched_map': bytearray()}
+        # 复选框样式图片 (未选中, 选中)，首次使用时生成
+        self._check_images = None
+        # Treeview样式是否已配置
+        self._tree_styles_configured = False
+        # 是否创建稠密点控制复选框（用户第一次点击"显示稠密点控制"后为True）
+        self._show_dense_controls = False
+        # Match信息标签页中常驻的三列Treeview {'panes': PanedWindow, 'match'/'unmatched_frame'/'unmatched_map': set_rows}
+        self._match_view = None
+        
+        # 最近一次加载使用的(x偏移, y偏移, z偏移, 帧ID)，用于跳过无变化的重新加载
+        self._last_offset_key = None
+        
+        # 当前Debug面板显示的debug.txt内存映射
+        self._debug_mmap: Optional[mmap.mmap] = None
+        
+        # 后台线程池，用于与界面构建并行执行的只读数据准备（不创建控件）
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="gui-data")
+        
+        # 变换点云名称缓存 {(frame_id, type_name, id): (各变换下的点云名称, ...)}
+        self._transformed_name_cache = {}
+        
+        # 是否已安排空闲时刷新视图（合并连续复选框切换产生的多次刷新）
+        self._update_pending = False
+        
+        # 悬浮标签上次显示的内容，内容不变时跳过config以避免Tk重绘
+        self._last_hover_key = None
+        self._last_point_key = None
     
     def create_control_panel(self):
         """创建控制面板"""
@@ -142,75 +190,56 @@ class PointCloudGUI:
             if self.visualizer.vis is not None and self.available_frames:
                 if self.current_frame_index < len(self.available_frames):
                     frame_id = self.available_frames[self.current_frame_index]
+                    # 偏移值没有实际变化（如Spinbox焦点/校验引起的写入）时不重新加载
+                    offset_key = self._get_offset_key(frame_id)
+                    if offset_key == self._last_offset_key:
+                        return
+                    # 同一帧只改变了偏移，直接平移已加载的变换点云
+                    if (offset_key is not None and self._last_offset_key is not None and
+                            self._last_offset_key[3] == frame_id and
+                            self.visualizer.translate_transformed_clouds(
+                                frame_id, self.x_offset_var.get(),
+                                self.y_offset_var.get(), self.z_offset_var.get())):
+                        self._last_offset_key = offset_key
+                        return
                     # 重新加载当前帧（会使用新的偏移量）
                     self.load_frame(frame_id)
         
-        # X轴偏移
-        x_offset_frame = ttk.Frame(transform_frame)
-        x_offset_frame.grid(row=0, column=0, columnspan=2, padx=5, pady=2, sticky=(tk.W, tk.E))
-        ttk.Label(x_offset_frame, text="X轴偏移:").pack(side=tk.LEFT, padx=5)
-        self.x_offset_var = tk.DoubleVar(value=0.0)
-        x_offset_spinbox = tk.Spinbox(
-            x_offset_frame,
-            from_=-1000.0,
-            to=1000.0,
-            increment=0.1,
-            textvariable=self.x_offset_var,
-            width=10,
-            format="%.1f"
-        )
-        x_offset_spinbox.pack(side=tk.LEFT, padx=5)
         # 绑定鼠标滚轮事件（支持鼠标悬停时滚动）
         def bind_wheel_events(widget, var):
             """为控件绑定滚轮事件"""
             widget.bind("<MouseWheel>", lambda e: self._on_spinbox_wheel(e, var, 0.1))
             widget.bind("<Button-4>", lambda e: self._on_spinbox_wheel_linux(e, var, 0.1))
             widget.bind("<Button-5>", lambda e: self._on_spinbox_wheel_linux(e, var, 0.1))
-            # 当鼠标进入控件时，绑定滚轮事件到父窗口（这样即使没有焦点也能滚动）
-            def on_enter(e):
-                widget.focus_set()
-            def on_leave(e):
-                pass
-            widget.bind("<Enter>", on_enter)
-        
-        bind_wheel_events(x_offset_spinbox, self.x_offset_var)
-        self.x_offset_var.trace_add('write', on_offset_change)
-        
-        # Y轴偏移
-        y_offset_frame = ttk.Frame(transform_frame)
-        y_offset_frame.grid(row=1, column=0, columnspan=2, padx=5, pady=2, sticky=(tk.W, tk.E))
-        ttk.Label(y_offset_frame, text="Y轴偏移:").pack(side=tk.LEFT, padx=5)
-        self.y_offset_var = tk.DoubleVar(value=0.0)
-        y_offset_spinbox = tk.Spinbox(
-            y_offset_frame,
-            from_=-1000.0,
-            to=1000.0,
-            increment=0.1,
-            textvariable=self.y_offset_var,
-            width=10,
-            format="%.1f"
-        )
-        y_offset_spinbox.pack(side=tk.LEFT, padx=5)
-        bind_wheel_events(y_offset_spinbox, self.y_offset_var)
-        self.y_offset_var.trace_add('write', on_offset_change)
-        
-        # Z轴偏移
-        z_offset_frame = ttk.Frame(transform_frame)
-        z_offset_frame.grid(row=2, column=0, columnspan=2, padx=5, pady=2, sticky=(tk.W, tk.E))
-        ttk.Label(z_offset_frame, text="Z轴偏移:").pack(side=tk.LEFT, padx=5)
-        self.z_offset_var = tk.DoubleVar(value=10.0)
-        z_offset_spinbox = tk.Spinbox(
-            z_offset_frame,
-            from_=-1000.0,
-            to=1000.0,
-            increment=0.1,
-            textvariable=self.z_offset_var,
-            width=10,
-            format="%.1f"
+            # 当鼠标进入控件时获取焦点（这样即使没有点击也能滚动）
+            widget.bind("<Enter>", lambda e: widget.focus_set())
+        
+        # X/Y/Z轴偏移输入框布局表: (行, 标签, 默认值)
+        offset_layout = (
+            (0, "X轴偏移:", 0.0),
+            (1, "Y轴偏移:", 0.0),
+            (2, "Z轴偏移:", 10.0),
         )
-        z_offset_spinbox.pack(side=tk.LEFT, padx=5)
-        bind_wheel_events(z_offset_spinbox, self.z_offset_var)
-        self.z_offset_var.trace_add('write', on_offset_change)
+        offset_vars = []
+        for row, label_text, default_value in offset_layout:
+            offset_row_frame = ttk.Frame(transform_frame)
+            offset_row_frame.grid(row=row, column=0, columnspan=2, padx=5, pady=2, sticky=(tk.W, tk.E))
+            ttk.Label(offset_row_frame, text=label_text).pack(side=tk.LEFT, padx=5)
+            offset_var = tk.DoubleVar(value=default_value)
+            offset_spinbox = tk.Spinbox(
+                offset_row_frame,
+                from_=-1000.0,
+                to=1000.0,
+                increment=0.1,
+                textvariable=offset_var,
+                width=10,
+                format="%.1f"
+            )
+            offset_spinbox.pack(side=tk.LEFT, padx=5)
+            bind_wheel_events(offset_spinbox, offset_var)
+            offset_var.trace_add('write', on_offset_change)
+            offset_vars.append(offset_var)
+        self.x_offset_var, self.y_offset_var, self.z_offset_var = offset_vars
         
         # 配置列权重
         transform_frame.columnconfigure(0, weight=1)
@@ -313,6 +342,7 @@ class PointCloudGUI:
     def on_closing(self):
         """窗口关闭事件"""
         self.running = False
+        self._executor.shutdown(wait=False)
         if self.visualizer is not None:
             self.visualizer.running = False
             self.visualizer.destroy()
@@ -333,8 +363,7 @@ class PointCloudGUI:
                 if not self.visualizer.vis.poll_events():
                     # 窗口已关闭，需要重新创建
                     print("检测到窗口已关闭，正在重新打开...")
-                    self.visualizer.vis = None
-                    self.visualizer.geometries.clear()
+                    self.visualizer.reset_window()
                     # 重新启动更新循环
                     if not self.running:
                         self.running = True
@@ -342,8 +371,7 @@ class PointCloudGUI:
             except:
                 # 窗口可能已经销毁，重新创建
                 print("检测到窗口异常，正在重新打开...")
-                self.visualizer.vis = None
-                self.visualizer.geometries.clear()
+                self.visualizer.reset_window()
                 if not self.running:
                     self.running = True
                     self.update_visualizer()
@@ -355,6 +383,7 @@ class PointCloudGUI:
         x_offset = self.x_offset_var.get()
         y_offset = self.y_offset_var.get()
         z_offset = self.z_offset_var.get()
+        self._last_offset_key = self._get_offset_key(frame_id)
         
         # 加载帧（传递偏移量参数，内部会处理变换点云的加载和显示）
         self.visualizer.load_and_display_frame(
@@ -386,42 +415,57 @@ class PointCloudGUI:
         
         print(f"已加载帧 {frame_id} (frame类型)")
     
+    def _get_offset_key(self, frame_id: int) -> Optional[tuple]:
+        """
+        获取当前偏移值和帧ID组成的键（保留3位小数），输入框内容无效时返回None
+        
+        Args:
+            frame_id: 帧ID
+        """
+        try:
+            return (round(self.x_offset_var.get(), 3), round(self.y_offset_var.get(), 3),
+                    round(self.z_offset_var.get(), 3), frame_id)
+        except tk.TclError:
+            return None
+    
     def update_visualizer(self):
         """定期更新可视化窗口（在主线程中调用）"""
-        if not self.running or self.root is None:
+        # 每帧都会访问的属性缓存到局部变量（约60fps调用）
+        root = self.root
+        if not self.running or root is None:
             return
-            
-        if self.visualizer.vis is not None:
+        
+        visualizer = self.visualizer
+        vis = visualizer.vis
+        if vis is not None:
             try:
                 # 处理Open3D窗口事件并更新渲染
                 # poll_events()返回False时表示窗口已关闭
-                if not self.visualizer.vis.poll_events():
+                if not vis.poll_events():
                     # 窗口已关闭，但不停止更新循环
                     # 这样当用户切换帧时可以重新打开窗口
-                    self.visualizer.vis = None
-                    self.visualizer.geometries.clear()
+                    visualizer.reset_window()
                     print("可视化窗口已关闭，切换帧时会自动重新打开")
                 else:
                     # 检查鼠标悬浮（使用Open3D的GUI系统）
                     self._check_mouse_hover()
-                    self.visualizer.vis.update_renderer()
+                    vis.update_renderer()
             except Exception as e:
                 # 如果出现错误，重置窗口状态但不停止更新
                 print(f"更新可视化窗口时出错: {e}")
-                self.visualizer.vis = None
-                self.visualizer.geometries.clear()
+                visualizer.reset_window()
         
         # 确保控制面板始终在Open3D窗口之上
         try:
-            if self.root and self.root.winfo_exists():
-                self.root.attributes('-topmost', True)
-                self.root.lift()
+            if root.winfo_exists():
+                root.attributes('-topmost', True)
+                root.lift()
         except:
             pass
         
         # 每16ms更新一次（约60fps）
         if self.running:
-            self.root.after(16, self.update_visualizer)
+            root.after(16, self.update_visualizer)
     
     def _check_mouse_hover(self):
         """检查鼠标是否悬浮在点云上"""
@@ -522,40 +566,39 @@ class PointCloudGUI:
         for widget in self.debug_info_frame.winfo_children():
             widget.destroy()
         
+        # 保留已创建的匹配列表Treeview，只销毁其余控件
+        match_panes = self._match_view['panes'] if self._match_view is not None else None
         for widget in self.match_frame.winfo_children():
-            widget.destroy()
+            if widget is not match_panes:
+                widget.destroy()
+        
+        if self._debug_mmap is not None:
+            self._debug_mmap.close()
+            self._debug_mmap = None
         
         # 清空匹配关系复选框存储
         self.match_checkboxes.clear()
         # 清空未匹配项复选框存储
-        if hasattr(self, 'unmatched_frame_checkboxes'):
-            self.unmatched_frame_checkboxes.clear()
-        if hasattr(self, 'unmatched_map_checkboxes'):
-            self.unmatched_map_checkboxes.clear()
+        self.unmatched_frame_checkboxes.clear()
+        self.unmatched_map_checkboxes.clear()
+        
+        self._transformed_name_cache.clear()
         
         # 清除之前创建的过滤dense_cloud点云
         if hasattr(self, 'dense_cloud_point_indices'):
             delattr(self, 'dense_cloud_point_indices')
+            self.dense_cloud_source_info = None
         
             # 清除之前帧的过滤dense_cloud点云
             # 注意：不恢复原始的transformed dense_cloud显示，因为稠密点的显示应该完全由复选框控制
-            if self.visualizer.vis is not None:
-                filtered_names = [
-                    name for name in list(self.visualizer.geometries.keys()) + list(self.visualizer.hidden_geometries.keys())
-                    if name.startswith('filtered_dense_cloud_')
-                ]
-                for name in filtered_names:
-                    if name in self.visualizer.geometries:
-                        self.visualizer.remove_geometry(name)
-                    elif name in self.visualizer.hidden_geometries:
-                        del self.visualizer.hidden_geometries[name]
-            
-            # 确保原始的transformed dense_cloud被隐藏（由复选框控制显示）
-            if self.available_frames and self.current_frame_index < len(self.available_frames):
-                current_frame_id = self.available_frames[self.current_frame_index]
-                transformed_dense_name = f"transformed_cloud_{current_frame_id}_T_opt_w_b_dense_cloud"
-                if transformed_dense_name in self.visualizer.geometries:
-                    self.visualizer.hide_geometry(transformed_dense_name)
+            visualizer = self.visualizer
+            geometries = visualizer.geometries
+            hidden_geometries = visualizer.hidden_geometries
+            if visualizer.vis is not None:
+                for geometry_dict, remover in ((geometries, visualizer.remove_geometry),
+                                               (hidden_geometries, hidden_geometries.pop)):
+                    for name in [k for k in geometry_dict if k.startswith('filtered_dense_cloud_')]:
+                        remover(name)
         
         # 直接读取debug.txt文件内容
         debug_path = Config.get_data_frame_path(frame_id) / "debug.txt"
@@ -564,44 +607,7 @@ class PointCloudGUI:
         # 更新Debug信息标签页 - 直接显示原始文件内容
         if debug_path.exists():
             try:
-                with open(debug_path, 'r', encoding='utf-8') as f:
-                    debug_content = f.read()
-                
-                # 创建文本框显示原始内容
-                debug_text = tk.Text(
-                    self.debug_info_frame,
-                    wrap=tk.NONE,  # 不自动换行，保持原始格式
-                    font=("Courier", 10),
-                    bg="white",
-                    fg="black"
-                )
-                debug_text.insert(tk.END, debug_content)
-                debug_text.config(state=tk.DISABLED)  # 设置为只读
-                
-                # 添加垂直滚动条
-                debug_vscrollbar = ttk.Scrollbar(
-                    self.debug_info_frame,
-                    orient=tk.VERTICAL,
-                    command=debug_text.yview
-                )
-                debug_text.configure(yscrollcommand=debug_vscrollbar.set)
-                
-                # 添加水平滚动条
-                debug_hscrollbar = ttk.Scrollbar(
-                    self.debug_info_frame,
-                    orient=tk.HORIZONTAL,
-                    command=debug_text.xview
-                )
-                debug_text.configure(xscrollcommand=debug_hscrollbar.set)
-                
-                # 布局
-                debug_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-                debug_vscrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-                debug_hscrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
-                
-                # 配置网格权重
-                self.debug_info_frame.columnconfigure(0, weight=1)
-                self.debug_info_frame.rowconfigure(0, weight=1)
+                self._create_debug_file_view(debug_path)
             except Exception as e:
                 ttk.Label(
                     self.debug_info_frame,
@@ -620,416 +626,435 @@ class PointCloudGUI:
         if match_info:
             self._format_match_info(self.match_frame, match_info)
         else:
+            if match_panes is not None:
+                match_panes.destroy()
+                self._match_view = None
             ttk.Label(self.match_frame, text="match.json 文件不存在或无法加载", 
                      font=("Arial", 10)).pack(pady=20)
     
 
     
-    def _format_match_info(self, parent, match_info):
-        """格式化显示plane_match_infos匹配信息，每个匹配关系可以选中/取消选中"""
-        import json
+    def _create_debug_file_view(self, debug_path: Path):
+        """
+        在Debug信息标签页中按需显示debug.txt原始内容
         
-        # 创建主容器，使用水平布局
-        main_container = ttk.Frame(parent)
-        main_container.pack(fill=tk.BOTH, expand=True)
-        main_container.columnconfigure(0, weight=1)
-        main_container.columnconfigure(1, weight=1)
-        main_container.columnconfigure(2, weight=1)
+        文件通过mmap读取并只建立行起始位置索引，Treeview中只插入已滚动到的行，
+        滚动接近底部时再追加下一批行，显示开销与已浏览的行数成正比而不是与文件大小成正比；
+        小文件直接用等宽字体的Label显示
         
-        # 获取当前帧ID
-        if not self.available_frames or self.current_frame_index >= len(self.available_frames):
-            ttk.Label(parent, text="无法获取当前帧信息", font=("Arial", 10)).pack(pady=20)
+        Args:
+            debug_path: debug.txt文件路径
+        """
+        size = debug_path.stat().st_size
+        if size <= Config.DEBUG_SMALL_FILE_BYTES:
+            text = debug_path.read_text(encoding='utf-8', errors='replace').replace('\t', '    ')
+            debug_label = ttk.Label(
+                self.debug_info_frame,
+                text=text,
+                font=("Courier", 10),
+                justify=tk.LEFT,
+                anchor=tk.NW,
+                relief=tk.SOLID,
+                borderwidth=1,
+                padding=5,
+                background="white"
+            )
+            debug_label.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
             return
         
-        frame_id = self.available_frames[self.current_frame_index]
-        
-        # 加载当前帧和地图的数据
-        frame_data = self.visualizer.data_loader.load_frame_data(frame_id, Config.FRAME_TYPE_FRAME)
-        map_data = self.visualizer.data_loader.load_frame_data(frame_id, Config.FRAME_TYPE_MAP)
-        
-        # 提取plane_match_infos
-        plane_match_infos = []
-        if match_info:
-            if hasattr(match_info, 'plane_match_infos'):
-                plane_match_infos = match_info.plane_match_infos
-            elif isinstance(match_info, dict) and 'plane_match_infos' in match_info:
-                plane_match_infos = match_info['plane_match_infos']
-        
-        # 提取已匹配的ID集合
-        matched_frame_ids = set()  # {(type, id)}
-        matched_map_ids = set()    # {(type, id)}
-        
-        for match in plane_match_infos:
-            # 提取匹配信息
-            if hasattr(match, 'cur_id'):
-                cur_id_obj = match.cur_id
-                other_id_obj = match.other_id
-            elif isinstance(match, dict):
-                cur_id_obj = match.get('cur_id')
-                other_id_obj = match.get('other_id')
-            else:
-                continue
-            
-            # 提取cur_id和other_id的类型和id
-            cur_type = None
-            cur_id = None
-            other_type = None
-            other_id = None
-            
-            if isinstance(cur_id_obj, dict):
-                cur_type = cur_id_obj.get('a')  # 1=plane, 2=ground
-                cur_id = cur_id_obj.get('b')
-            elif hasattr(cur_id_obj, 'a'):
-                cur_type = cur_id_obj.a
-                cur_id = cur_id_obj.b
-            
-            if isinstance(other_id_obj, dict):
-                other_type = other_id_obj.get('a')
-                other_id = other_id_obj.get('b')
-            elif hasattr(other_id_obj, 'a'):
-                other_type = other_id_obj.a
-                other_id = other_id_obj.b
-            
-            if cur_type is not None and cur_id is not None:
-                matched_frame_ids.add((cur_type, cur_id))
-            if other_type is not None and other_id is not None:
-                matched_map_ids.add((other_type, other_id))
-        
-        # 找出未匹配的frame项目
-        unmatched_frame_items = []
-        for ground in frame_data['grounds']:
-            ground_name = ground.get('name', '')
-            file_id = self.visualizer.data_loader._extract_file_id(ground_name)
-            if file_id is not None and isinstance(file_id, int):
-                if (2, file_id) not in matched_frame_ids:  # 2=ground
-                    unmatched_frame_items.append(('ground', file_id, ground_name))
-        
-        for plane in frame_data['planes']:
-            plane_name = plane.get('name', '')
-            file_id = self.visualizer.data_loader._extract_file_id(plane_name)
-            if file_id is not None and isinstance(file_id, int):
-                if (1, file_id) not in matched_frame_ids:  # 1=plane
-                    unmatched_frame_items.append(('plane', file_id, plane_name))
-        
-        # 找出未匹配的map项目
-        unmatched_map_items = []
-        for ground in map_data['grounds']:
-            ground_name = ground.get('name', '')
-            file_id = self.visualizer.data_loader._extract_file_id(ground_name)
-            if file_id is not None and isinstance(file_id, int):
-                if (2, file_id) not in matched_map_ids:  # 2=ground
-                    unmatched_map_items.append(('ground', file_id, ground_name))
-        
-        for plane in map_data['planes']:
-            plane_name = plane.get('name', '')
-            file_id = self.visualizer.data_loader._extract_file_id(plane_name)
-            if file_id is not None and isinstance(file_id, int):
-                if (1, file_id) not in matched_map_ids:  # 1=plane
-                    unmatched_map_items.append(('plane', file_id, plane_name))
-        
-        # 第一列：匹配关系列表
-        match_column = ttk.Frame(main_container)
-        match_column.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
-        match_column.columnconfigure(0, weight=1)
-        match_column.rowconfigure(0, weight=1)
-        
-        # 创建滚动框架
-        match_canvas = tk.Canvas(match_column, height=700)
-        match_scrollbar = ttk.Scrollbar(match_column, orient=tk.VERTICAL, command=match_canvas.yview)
-        match_scrollable_frame = ttk.Frame(match_canvas)
-        
-        match_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: match_canvas.configure(scrollregion=match_canvas.bbox("all"))
+        line_starts = []
+        if size > 0:
+            with open(debug_path, 'rb') as f:
+                self._debug_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mm = self._debug_mmap
+            # 建立行起始位置索引
+            pos = 0
+            while pos < size:
+                line_starts.append(pos)
+                newline = mm.find(b'\n', pos)
+                if newline < 0:
+                    break
+                pos = newline + 1
+        line_starts.append(size)
+        total_lines = len(line_starts) - 1
+        
+        self._configure_tree_styles()
+        debug_tree = ttk.Treeview(self.debug_info_frame, show='tree', selectmode='none', style="Debug.Treeview")
+        # 固定列宽，超出部分通过水平滚动条查看
+        debug_tree.column('#0', width=1200, minwidth=1200, stretch=False)
+        
+        # 添加垂直滚动条
+        debug_vscrollbar = ttk.Scrollbar(
+            self.debug_info_frame,
+            orient=tk.VERTICAL,
+            command=debug_tree.yview
         )
         
-        match_canvas.create_window((0, 0), window=match_scrollable_frame, anchor="nw")
-        match_canvas.configure(yscrollcommand=match_scrollbar.set)
-        
-        match_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        match_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        match_column.columnconfigure(0, weight=1)
-        match_column.rowconfigure(0, weight=1)
-        
-        # 标题
-        title_label = ttk.Label(match_scrollable_frame, text="匹配关系列表", font=("Arial", 12, "bold"))
-        title_label.pack(pady=(0, 10))
-        
-        if not plane_match_infos:
-            ttk.Label(match_scrollable_frame, text="未找到匹配数据", 
-                     font=("Arial", 10)).pack(pady=20)
-        else:
-            # 统计信息
-            stats_frame = ttk.LabelFrame(match_scrollable_frame, text="统计信息", padding="5")
-            stats_frame.pack(fill=tk.X, pady=5)
-            
-            total_count = len(plane_match_infos)
-            ttk.Label(stats_frame, text=f"总匹配数: {total_count}", font=("Arial", 9, "bold")).pack(anchor=tk.W)
-            
-            # 匹配列表框架
-            list_frame = ttk.LabelFrame(match_scrollable_frame, text="匹配项", padding="5")
-            list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-            
-            # 存储复选框变量，用于后续控制
-            self.match_checkboxes = {}  # {match_index: (var, match_data)}
-            
-            # 为每个匹配关系创建复选框
-            for idx, match in enumerate(plane_match_infos):
-                # 提取匹配信息
-                if hasattr(match, 'cur_id'):
-                    cur_id_obj = match.cur_id
-                    other_id_obj = match.other_id
-                    axis = match.axis if hasattr(match, 'axis') else None
-                elif isinstance(match, dict):
-                    cur_id_obj = match.get('cur_id')
-                    other_id_obj = match.get('other_id')
-                    axis = match.get('axis')
-                else:
-                    continue
-                
-                # 提取cur_id和other_id的类型和id
-                cur_type = None
-                cur_id = None
-                other_type = None
-                other_id = None
-                
-                if isinstance(cur_id_obj, dict):
-                    cur_type = cur_id_obj.get('a')  # 1=plane, 2=ground
-                    cur_id = cur_id_obj.get('b')
-                elif hasattr(cur_id_obj, 'a'):
-                    cur_type = cur_id_obj.a
-                    cur_id = cur_id_obj.b
-                
-                if isinstance(other_id_obj, dict):
-                    other_type = other_id_obj.get('a')
-                    other_id = other_id_obj.get('b')
-                elif hasattr(other_id_obj, 'a'):
-                    other_type = other_id_obj.a
-                    other_id = other_id_obj.b
-                
-                if cur_type is None or cur_id is None or other_type is None or other_id is None:
-                    continue
-                
-                # 创建匹配项框架
-                match_item_frame = ttk.Frame(list_frame)
-                match_item_frame.pack(fill=tk.X, pady=2, padx=5)
-                
-                # 创建复选框变量（默认选中）
-                var = tk.BooleanVar(value=True)
-                self.match_checkboxes[idx] = (var, {
-                    'cur_type': cur_type,
-                    'cur_id': cur_id,
-                    'other_type': other_type,
-                    'other_id': other_id,
-                    'axis': axis
-                })
-                
-                # 类型名称
-                cur_type_name = "plane" if cur_type == 1 else "ground" if cur_type == 2 else "unknown"
-                other_type_name = "plane" if other_type == 1 else "ground" if other_type == 2 else "unknown"
-                
-                # 创建复选框
-                checkbox = ttk.Checkbutton(
-                    match_item_frame,
-                    text=f"轴{axis}: Frame {cur_type_name}_{cur_id} <-> Map {other_type_name}_{other_id}",
-                    variable=var,
-                    command=lambda idx=idx, var=var: self._on_match_checkbox_toggle(idx, var)
-                )
-                checkbox.pack(side=tk.LEFT, padx=5)
-            
-            # 全选/全不选按钮
-            button_frame = ttk.Frame(match_scrollable_frame)
-            button_frame.pack(fill=tk.X, pady=5)
-            
-            def select_all():
-                for idx, (var, _) in self.match_checkboxes.items():
-                    var.set(True)
-                    self._on_match_checkbox_toggle(idx, var)
-            
-            def deselect_all():
-                for idx, (var, _) in self.match_checkboxes.items():
-                    var.set(False)
-                    self._on_match_checkbox_toggle(idx, var)
-            
-            ttk.Button(button_frame, text="全选", command=select_all).pack(side=tk.LEFT, padx=5)
-            ttk.Button(button_frame, text="全不选", command=deselect_all).pack(side=tk.LEFT, padx=5)
-        
-        # 第二列：当前帧未匹配列表
-        unmatched_frame_column = ttk.Frame(main_container)
-        unmatched_frame_column.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
-        unmatched_frame_column.columnconfigure(0, weight=1)
-        unmatched_frame_column.rowconfigure(0, weight=1)
-        
-        # 创建滚动框架
-        frame_canvas = tk.Canvas(unmatched_frame_column, height=700)
-        frame_scrollbar = ttk.Scrollbar(unmatched_frame_column, orient=tk.VERTICAL, command=frame_canvas.yview)
-        frame_scrollable_frame = ttk.Frame(frame_canvas)
-        
-        frame_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: frame_canvas.configure(scrollregion=frame_canvas.bbox("all"))
+        # 添加水平滚动条
+        debug_hscrollbar = ttk.Scrollbar(
+            self.debug_info_frame,
+            orient=tk.HORIZONTAL,
+            command=debug_tree.xview
         )
+        debug_tree.configure(xscrollcommand=debug_hscrollbar.set)
         
-        frame_canvas.create_window((0, 0), window=frame_scrollable_frame, anchor="nw")
-        frame_canvas.configure(yscrollcommand=frame_scrollbar.set)
+        def insert_lines(start, end):
+            """插入[start, end)范围内的行"""
+            mm = self._debug_mmap
+            if mm is None or mm.closed:
+                return
+            for i in range(start, end):
+                line = mm[line_starts[i]:line_starts[i + 1]].decode('utf-8', errors='replace')
+                debug_tree.insert('', tk.END, text=line.rstrip('\r\n').replace('\t', '    '))
         
-        frame_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        frame_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        unmatched_frame_column.columnconfigure(0, weight=1)
-        unmatched_frame_column.rowconfigure(0, weight=1)
+        self._bind_lazy_rows(debug_tree, debug_vscrollbar, total_lines, insert_lines)
         
-        # 标题
-        frame_title_label = ttk.Label(frame_scrollable_frame, text="当前帧未匹配", font=("Arial", 12, "bold"))
-        frame_title_label.pack(pady=(0, 10))
+        # 布局
+        debug_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        debug_vscrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        debug_hscrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
-        # 统计信息
-        frame_stats_frame = ttk.LabelFrame(frame_scrollable_frame, text="统计信息", padding="5")
-        frame_stats_frame.pack(fill=tk.X, pady=5)
+        # 配置网格权重
+        self.debug_info_frame.columnconfigure(0, weight=1)
+        self.debug_info_frame.rowconfigure(0, weight=1)
+    
+    def _bind_lazy_rows(self, tree: ttk.Treeview, vscrollbar: ttk.Scrollbar, total_rows: int,
+                        insert_rows: Callable[[int, int], None]) -> Callable[[int], None]:
+        """
+        为Treeview按需插入行：先插入第一批，滚动接近底部时再追加下一批
         
-        frame_total_count = len(unmatched_frame_items)
-        ttk.Label(frame_stats_frame, text=f"未匹配数: {frame_total_count}", font=("Arial", 9, "bold")).pack(anchor=tk.W)
+        Args:
+            tree: Treeview控件
+            vscrollbar: 垂直滚动条
+            total_rows: 总行数
+            insert_rows: 插入[start, end)范围内行的函数
+            
+        Returns:
+            行内容被替换（已清空Treeview）后重新开始按需插入的函数 reset(total_rows)
+        """
+        loaded = {'count': 0, 'total': total_rows, 'pending': False}
         
-        # 未匹配列表框架
-        frame_list_frame = ttk.LabelFrame(frame_scrollable_frame, text="未匹配项", padding="5")
-        frame_list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        def load_more_rows():
+            """追加下一批行"""
+            loaded['pending'] = False
+            if not tree.winfo_exists():
+                return
+            start = loaded['count']
+            end = min(start + Config.TREE_VIEW_CHUNK_ROWS, loaded['total'])
+            insert_rows(start, end)
+            loaded['count'] = end
+        
+        def on_yscroll(first, last):
+            """同步滚动条，滚动接近底部时追加行"""
+            vscrollbar.set(first, last)
+            if float(last) >= 0.9 and loaded['count'] < loaded['total'] and not loaded['pending']:
+                loaded['pending'] = True
+                tree.after_idle(load_more_rows)
+        
+        def reset(new_total_rows: int):
+            """从第一行开始重新按需插入"""
+            loaded['count'] = 0
+            loaded['total'] = new_total_rows
+            load_more_rows()
+        
+        tree.configure(yscrollcommand=on_yscroll)
+        load_more_rows()
+        return reset
+    
+    def _configure_tree_styles(self):
+        """配置Debug面板Treeview使用的等宽字体样式（固定行高，只配置一次）"""
+        if self._tree_styles_configured:
+            return
+        style = ttk.Style()
+        style.configure("Debug.Treeview", font=("Courier", 10), rowheight=18,
+                        background="white", foreground="black")
+        style.configure("Check.Treeview", font=("Courier", 9), rowheight=18)
+        style.configure("Check.Treeview.Heading", font=("Arial", 9, "bold"))
+        self._tree_styles_configured = True
+    
+    def _get_check_images(self):
+        """获取复选框样式的图片 (未选中, 选中)，只生成一次"""
+        if self._check_images is None:
+            size = 13
+            unchecked = tk.PhotoImage(width=size, height=size)
+            checked = tk.PhotoImage(width=size, height=size)
+            for image in (unchecked, checked):
+                image.put("#ffffff", to=(0, 0, size, size))
+                # 边框
+                image.put("#555555", to=(0, 0, size, 1))
+                image.put("#555555", to=(0, size - 1, size, size))
+                image.put("#555555", to=(0, 0, 1, size))
+                image.put("#555555", to=(size - 1, 0, size, size))
+            checked.put("#2a7ae2", to=(3, 3, size - 3, size - 3))
+            self._check_images = (unchecked, checked)
+        return self._check_images
+    
+    def _create_checkbox_tree(self, parent, kind: str):
+        """
+        创建复选框样式的Treeview，行按需插入，选中状态按行号保存在bytearray中（不为每行创建控件或Tcl变量）
         
-        # 存储未匹配frame复选框变量
-        self.unmatched_frame_checkboxes = {}  # {(type, id): (var, item_data)}
+        Treeview只创建一次，切换帧时通过set_rows替换行内容
         
-        # 为每个未匹配项创建复选框
-        for item_type, item_id, item_name in unmatched_frame_items:
-            item_frame = ttk.Frame(frame_list_frame)
-            item_frame.pack(fill=tk.X, pady=2, padx=5)
-            
-            # 创建复选框变量（默认选中）
-            var = tk.BooleanVar(value=True)
-            self.unmatched_frame_checkboxes[(item_type, item_id)] = (var, {
-                'type': item_type,
-                'id': item_id,
-                'name': item_name
-            })
-            
-            # 类型名称
-            type_name = "plane" if item_type == 'plane' else "ground"
+        Args:
+            parent: 父控件
+            kind: 列表类型（'match', 'unmatched_frame', 'unmatched_map'），
+                  即选中状态在self.checkbox_states中的键，切换时通过_on_checkbox_toggle分发
             
-            # 创建复选框
-            checkbox = ttk.Checkbutton(
-                item_frame,
-                text=f"Frame {type_name}_{item_id}",
-                variable=var,
-                command=lambda item_type=item_type, item_id=item_id, var=var: self._on_unmatched_frame_checkbox_toggle(item_type, item_id, var)
-            )
-            checkbox.pack(side=tk.LEFT, padx=5)
+        Returns:
+            (set_rows, set_all)：替换行内容的函数 set_rows(rows, heading)，rows为[(key, 显示文本)]列表；
+            设置所有行选中状态的函数 set_all(is_selected)
+        """
+        unchecked_image, checked_image = self._get_check_images()
+        current = {'rows': []}
+        
+        tree_frame = ttk.Frame(parent)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self._configure_tree_styles()
+        tree = ttk.Treeview(tree_frame, show=('tree', 'headings'), selectmode='none', height=30,
+                            style="Check.Treeview")
+        tree.column('#0', width=320, minwidth=200, stretch=True)
+        vscrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        vscrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(0, weight=1)
+        
+        def insert_rows(start, end):
+            """插入[start, end)范围内的行（iid为行号）"""
+            rows = current['rows']
+            states = self.checkbox_states[kind]
+            for i in range(start, end):
+                image = checked_image if states[i] else unchecked_image
+                tree.insert('', tk.END, iid=str(i), text=rows[i][1], image=image)
+        
+        reset_rows = self._bind_lazy_rows(tree, vscrollbar, 0, insert_rows)
+        
+        def set_rows(rows: list, heading: str):
+            """替换所有行（默认全部选中）并更新表头"""
+            current['rows'] = rows
+            self.checkbox_states[kind] = bytearray(b'\x01') * len(rows)
+            tree.heading('#0', text=heading, anchor=tk.W)
+            tree.delete(*tree.get_children())
+            tree.yview_moveto(0)
+            reset_rows(len(rows))
+        
+        def on_click(event):
+            """点击行时切换选中状态"""
+            iid = tree.identify_row(event.y)
+            if iid:
+                row = int(iid)
+                states = self.checkbox_states[kind]
+                states[row] ^= 1
+                tree.item(iid, image=checked_image if states[row] else unchecked_image)
+                self._on_checkbox_toggle(kind, current['rows'][row][0], bool(states[row]))
+            return "break"
+        
+        tree.bind('<Button-1>', on_click)
+        
+        def set_all(is_selected: bool):
+            """设置所有行的选中状态，3D视图只在最后刷新一次"""
+            rows = current['rows']
+            states = self.checkbox_states[kind]
+            # 只有状态发生变化的行需要回调
+            changed = [i for i, state in enumerate(states) if state != is_selected]
+            states[:] = (b'\x01' if is_selected else b'\x00') * len(states)
+            image = checked_image if is_selected else unchecked_image
+            for iid in tree.get_children():
+                tree.item(iid, image=image)
+            self.visualizer.begin_batch_update()
+            try:
+                for i in changed:
+                    self._on_checkbox_toggle(kind, rows[i][0], is_selected)
+            finally:
+                self.visualizer.end_batch_update()
         
-        if not unmatched_frame_items:
-            ttk.Label(frame_list_frame, text="无未匹配项", font=("Arial", 9), foreground="gray").pack(pady=10)
+        return set_rows, set_all
+    
+    def _create_checkbox_column(self, panes: ttk.PanedWindow, title: str, kind: str) -> Callable[[list, str], None]:
+        """
+        创建匹配信息面板中的一列（标题、复选框列表、全选/全不选按钮），统计信息显示在列表表头
         
-        # 全选/全不选按钮
-        frame_button_frame = ttk.Frame(frame_scrollable_frame)
-        frame_button_frame.pack(fill=tk.X, pady=5)
+        Args:
+            panes: 放置各列的PanedWindow
+            title: 标题
+            kind: 列表类型（'match', 'unmatched_frame', 'unmatched_map'）
+            
+        Returns:
+            替换该列行内容的函数 set_rows(rows, heading)
+        """
+        column_frame = ttk.Frame(panes, padding=(5, 0))
+        panes.add(column_frame, weight=1)
         
-        def frame_select_all():
-            for (item_type, item_id), (var, _) in self.unmatched_frame_checkboxes.items():
-                var.set(True)
-                self._on_unmatched_frame_checkbox_toggle(item_type, item_id, var)
+        # 标题
+        ttk.Label(column_frame, text=title, font=("Arial", 12, "bold")).pack(pady=(0, 10))
         
-        def frame_deselect_all():
-            for (item_type, item_id), (var, _) in self.unmatched_frame_checkboxes.items():
-                var.set(False)
-                self._on_unmatched_frame_checkbox_toggle(item_type, item_id, var)
+        # 复选框列表
+        set_rows, set_all = self._create_checkbox_tree(column_frame, kind)
         
-        ttk.Button(frame_button_frame, text="全选", command=frame_select_all).pack(side=tk.LEFT, padx=5)
-        ttk.Button(frame_button_frame, text="全不选", command=frame_deselect_all).pack(side=tk.LEFT, padx=5)
+        # 全选/全不选按钮
+        button_frame = ttk.Frame(column_frame)
+        button_frame.pack(fill=tk.X, pady=5)
+        ttk.Button(button_frame, text="全选", command=lambda: set_all(True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="全不选", command=lambda: set_all(False)).pack(side=tk.LEFT, padx=5)
         
-        # 第三列：地图未匹配列表
-        unmatched_map_column = ttk.Frame(main_container)
-        unmatched_map_column.grid(row=0, column=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5)
-        unmatched_map_column.columnconfigure(0, weight=1)
-        unmatched_map_column.rowconfigure(0, weight=1)
-        
-        # 创建滚动框架
-        map_canvas = tk.Canvas(unmatched_map_column, height=700)
-        map_scrollbar = ttk.Scrollbar(unmatched_map_column, orient=tk.VERTICAL, command=map_canvas.yview)
-        map_scrollable_frame = ttk.Frame(map_canvas)
-        
-        map_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: map_canvas.configure(scrollregion=map_canvas.bbox("all"))
-        )
+        return set_rows
+    
+    @staticmethod
+    def _normalize_match(match) -> Optional[tuple]:
+        """
+        将一条plane_match_info统一解析为元组
         
-        map_canvas.create_window((0, 0), window=map_scrollable_frame, anchor="nw")
-        map_canvas.configure(yscrollcommand=map_scrollbar.set)
+        Args:
+            match: 匹配信息字典（cur_id/other_id已由DataLoader.load_match_info转换为IdPair）
+            
+        Returns:
+            (cur, other, axis)，cur/other为(type, id)，对应一侧字段不完整时为None；
+            match不是字典时返回None
+        """
+        if not isinstance(match, dict):
+            return None
+        cur_id_pair = match.get('cur_id')
+        other_id_pair = match.get('other_id')
+        if not isinstance(cur_id_pair, IdPair) or None in cur_id_pair:
+            cur_id_pair = None
+        if not isinstance(other_id_pair, IdPair) or None in other_id_pair:
+            other_id_pair = None
+        return cur_id_pair, other_id_pair, match.get('axis')
+    
+    def _format_match_info(self, parent, match_info):
+        """
+        格式化显示plane_match_infos匹配信息，每个匹配关系可以选中/取消选中
         
-        map_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        map_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        unmatched_map_column.columnconfigure(0, weight=1)
-        unmatched_map_column.rowconfigure(0, weight=1)
+        三列Treeview只在第一次调用时创建，之后切换帧只替换其中的行
+        """
+        # 获取当前帧ID
+        if not self.available_frames or self.current_frame_index >= len(self.available_frames):
+            ttk.Label(parent, text="无法获取当前帧信息", font=("Arial", 10)).pack(pady=20)
+            return
         
-        # 标题
-        map_title_label = ttk.Label(map_scrollable_frame, text="地图未匹配", font=("Arial", 12, "bold"))
-        map_title_label.pack(pady=(0, 10))
+        frame_id = self.available_frames[self.current_frame_index]
         
-        # 统计信息
-        map_stats_frame = ttk.LabelFrame(map_scrollable_frame, text="统计信息", padding="5")
-        map_stats_frame.pack(fill=tk.X, pady=5)
+        if self._match_view is None:
+            # 创建主容器，三列放在可拖动分隔条的PanedWindow中
+            panes = ttk.PanedWindow(parent, orient=tk.HORIZONTAL)
+            panes.pack(fill=tk.BOTH, expand=True)
+            self._match_view = {
+                'panes': panes,
+                'match': self._create_checkbox_column(panes, "匹配关系列表", 'match'),
+                'unmatched_frame': self._create_checkbox_column(panes, "当前帧未匹配", 'unmatched_frame'),
+                'unmatched_map': self._create_checkbox_column(panes, "地图未匹配", 'unmatched_map'),
+            }
+        match_view = self._match_view
+        
+        # 在后台线程中并行列出当前帧和地图的点云文件（只需要文件名，不重新读取点云），
+        # 同时在主线程解析匹配关系
+        data_loader = self.visualizer.data_loader
+        frame_files_future = self._executor.submit(data_loader.get_frame_files, frame_id, Config.FRAME_TYPE_FRAME)
+        map_files_future = self._executor.submit(data_loader.get_frame_files, frame_id, Config.FRAME_TYPE_MAP)
         
-        map_total_count = len(unmatched_map_items)
-        ttk.Label(map_stats_frame, text=f"未匹配数: {map_total_count}", font=("Arial", 9, "bold")).pack(anchor=tk.W)
+        # 提取plane_match_infos
+        plane_match_infos = match_info.get('plane_match_infos') or []
+        
+        # 只解析一次匹配关系，得到[(match_index, (cur, other, axis))]
+        parsed_matches = [
+            (idx, parsed)
+            for idx, parsed in enumerate(map(self._normalize_match, plane_match_infos))
+            if parsed is not None
+        ]
+        
+        # 提取已匹配的ID集合 {(type, id)}：frame和map分别统计，只要本侧id完整就算已匹配
+        matched_frame_ids = {cur for _, (cur, _, _) in parsed_matches if cur is not None}
+        matched_map_ids = {other for _, (_, other, _) in parsed_matches if other is not None}
+        
+        # 匹配关系列表只显示两侧id都完整的匹配，得到[(match_index, (cur_type, cur_id, other_type, other_id, axis))]
+        normalized_matches = [
+            (idx, (*cur, *other, axis))
+            for idx, (cur, other, axis) in parsed_matches
+            if cur is not None and other is not None
+        ]
+        
+        # 提取frame和map中所有平面/地面的(type, id, name)，type编码: 1=plane, 2=ground
+        extract_file_id = data_loader._extract_file_id
+        
+        def collect_items(files):
+            """按地面、平面的顺序提取(type, id, name)，只保留数字id"""
+            return [
+                (type_code, file_id, name)
+                for type_code, paths in ((2, files.get('ground', ())), (1, files.get('plane', ())))
+                for path in paths
+                for name in (path.stem,)
+                for file_id in (extract_file_id(name),)
+                if isinstance(file_id, int)
+            ]
+        
+        # 找出未匹配的frame/map项目
+        unmatched_frame_items = [(_TYPE_NAMES[t], fid, name) for t, fid, name in collect_items(frame_files_future.result())
+                                 if (t, fid) not in matched_frame_ids]
+        unmatched_map_items = [(_TYPE_NAMES[t], fid, name) for t, fid, name in collect_items(map_files_future.result())
+                               if (t, fid) not in matched_map_ids]
         
-        # 未匹配列表框架
-        map_list_frame = ttk.LabelFrame(map_scrollable_frame, text="未匹配项", padding="5")
-        map_list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        # 第一列：匹配关系列表
+        match_rows = []
+        self.match_checkboxes = {}  # {match_index: match_data}
+        for idx, (cur_type, cur_id, other_type, other_id, axis) in normalized_matches:
+            self.match_checkboxes[idx] = {
+                'cur_type': cur_type,
+                'cur_id': cur_id,
+                'other_type': other_type,
+                'other_id': other_id,
+                'axis': axis
+            }
+            # 类型名称
+            cur_type_name = _TYPE_NAMES.get(cur_type, "unknown")
+            other_type_name = _TYPE_NAMES.get(other_type, "unknown")
+            match_rows.append((idx, f"轴{axis}: Frame {cur_type_name}_{cur_id} <-> Map {other_type_name}_{other_id}"))
         
-        # 存储未匹配map复选框变量
-        self.unmatched_map_checkboxes = {}  # {(type, id): (var, item_data)}
+        match_view['match'](match_rows, f"总匹配数: {len(plane_match_infos)}" if plane_match_infos else "未找到匹配数据")
         
-        # 为每个未匹配项创建复选框
-        for item_type, item_id, item_name in unmatched_map_items:
-            item_frame = ttk.Frame(map_list_frame)
-            item_frame.pack(fill=tk.X, pady=2, padx=5)
-            
-            # 创建复选框变量（默认选中）
-            var = tk.BooleanVar(value=True)
-            self.unmatched_map_checkboxes[(item_type, item_id)] = (var, {
+        # 第二列：当前帧未匹配列表
+        frame_rows = []
+        self.unmatched_frame_checkboxes = {}  # {(type, id): item_data}
+        for item_type, item_id, item_name in unmatched_frame_items:
+            self.unmatched_frame_checkboxes[(item_type, item_id)] = {
                 'type': item_type,
                 'id': item_id,
                 'name': item_name
-            })
-            
-            # 类型名称
-            type_name = "plane" if item_type == 'plane' else "ground"
-            
-            # 创建复选框
-            checkbox = ttk.Checkbutton(
-                item_frame,
-                text=f"Map {type_name}_{item_id}",
-                variable=var,
-                command=lambda item_type=item_type, item_id=item_id, var=var: self._on_unmatched_map_checkbox_toggle(item_type, item_id, var)
-            )
-            checkbox.pack(side=tk.LEFT, padx=5)
+            }
+            type_name = _TYPE_NAMES.get(item_type, "ground")
+            frame_rows.append(((item_type, item_id), f"Frame {type_name}_{item_id}"))
         
-        if not unmatched_map_items:
-            ttk.Label(map_list_frame, text="无未匹配项", font=("Arial", 9), foreground="gray").pack(pady=10)
+        match_view['unmatched_frame'](frame_rows, f"未匹配数: {len(unmatched_frame_items)}")
         
-        # 全选/全不选按钮
-        map_button_frame = ttk.Frame(map_scrollable_frame)
-        map_button_frame.pack(fill=tk.X, pady=5)
-        
-        def map_select_all():
-            for (item_type, item_id), (var, _) in self.unmatched_map_checkboxes.items():
-                var.set(True)
-                self._on_unmatched_map_checkbox_toggle(item_type, item_id, var)
-        
-        def map_deselect_all():
-            for (item_type, item_id), (var, _) in self.unmatched_map_checkboxes.items():
-                var.set(False)
-                self._on_unmatched_map_checkbox_toggle(item_type, item_id, var)
+        # 第三列：地图未匹配列表
+        map_rows = []
+        self.unmatched_map_checkboxes = {}  # {(type, id): item_data}
+        for item_type, item_id, item_name in unmatched_map_items:
+            self.unmatched_map_checkboxes[(item_type, item_id)] = {
+                'type': item_type,
+                'id': item_id,
+                'name': item_name
+            }
+            type_name = _TYPE_NAMES.get(item_type, "ground")
+            map_rows.append(((item_type, item_id), f"Map {type_name}_{item_id}"))
         
-        ttk.Button(map_button_frame, text="全选", command=map_select_all).pack(side=tk.LEFT, padx=5)
-        ttk.Button(map_button_frame, text="全不选", command=map_deselect_all).pack(side=tk.LEFT, padx=5)
+        match_view['unmatched_map'](map_rows, f"未匹配数: {len(unmatched_map_items)}")
         
         # 在match信息面板下方添加dense_cloud点控制复选框
-        self._add_dense_cloud_point_controls(parent, frame_id, match_info, plane_match_infos)
+        # 用户第一次点击按钮后才创建（需要拆分稠密点云），之后切换帧时直接创建
+        if self._show_dense_controls:
+            self._add_dense_cloud_point_controls(parent, frame_id, match_info, plane_match_infos)
+        else:
+            placeholder = ttk.Frame(parent)
+            placeholder.pack(fill=tk.X, pady=10, padx=5)
+            
+            def build_dense_controls():
+                """创建稠密点控制复选框"""
+                self._show_dense_controls = True
+                placeholder.destroy()
+                self._add_dense_cloud_point_controls(parent, frame_id, match_info, plane_match_infos)
+                self._schedule_update()
+            
+            ttk.Button(placeholder, text="显示稠密点控制", command=build_dense_controls).pack(anchor=tk.W)
     
     def _add_dense_cloud_point_controls(self, parent, frame_id: int, match_info, plane_match_infos):
         """在match信息面板下方添加dense_cloud点控制复选框"""
@@ -1042,12 +1067,7 @@ class PointCloudGUI:
         
         # 检查是否有transformed dense_cloud
         transformed_dense_name = f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud"
-        transformed_dense_pcd = None
-        
-        if transformed_dense_name in self.visualizer.geometries:
-            transformed_dense_pcd = self.visualizer.geometries[transformed_dense_name]
-        elif transformed_dense_name in self.visualizer.hidden_geometries:
-            transformed_dense_pcd = self.visualizer.hidden_geometries[transformed_dense_name]['geometry']
+        transformed_dense_pcd = self.visualizer.get_geometry(transformed_dense_name)
         
         if transformed_dense_pcd is None or not isinstance(transformed_dense_pcd, o3d.geometry.PointCloud):
             ttk.Label(dense_control_frame, text="当前帧没有transformed dense_cloud点云", 
@@ -1057,83 +1077,54 @@ class PointCloudGUI:
         num_total_points = len(transformed_dense_pcd.points)
         
         # 提取dense_pt_match_infos（和地图稠密点匹配）
-        dense_pt_match_mapping = {}  # {cur_id (frame): other_id (map)}
-        if match_info:
-            if hasattr(match_info, 'dense_pt_match_infos'):
-                for match in match_info.dense_pt_match_infos:
-                    if hasattr(match, 'cur_id') and hasattr(match, 'other_id'):
-                        cur_id = match.cur_id
-                        other_id = match.other_id
-                        if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                            dense_pt_match_mapping[cur_id] = other_id
-                    elif isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                        cur_id = match['cur_id']
-                        other_id = match['other_id']
-                        if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                            dense_pt_match_mapping[cur_id] = other_id
-            elif isinstance(match_info, dict) and 'dense_pt_match_infos' in match_info:
-                for match in match_info['dense_pt_match_infos']:
-                    if isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                        cur_id = match['cur_id']
-                        other_id = match['other_id']
-                        if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                            dense_pt_match_mapping[cur_id] = other_id
-        
-        # 提取pt_match_infos（和map平面匹配）
-        # cur_id是当前帧稠密点id，other_id是对象{a: 类型(1=plane, 2=ground), b: id}
-        pt_match_mapping = {}  # {cur_id (frame): other_id_info}
-        if match_info:
-            if hasattr(match_info, 'pt_match_infos'):
-                for match in match_info.pt_match_infos:
-                    if hasattr(match, 'cur_id') and hasattr(match, 'other_id'):
-                        cur_id = match.cur_id
-                        other_id = match.other_id
-                        if isinstance(cur_id, int):
-                            # other_id可能是对象或字典
-                            if isinstance(other_id, dict):
-                                pt_match_mapping[cur_id] = other_id
-                            elif hasattr(other_id, 'a') and hasattr(other_id, 'b'):
-                                pt_match_mapping[cur_id] = {'a': other_id.a, 'b': other_id.b}
-                    elif isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                        cur_id = match['cur_id']
-                        other_id = match['other_id']
-                        if isinstance(cur_id, int):
-                            if isinstance(other_id, dict):
-                                pt_match_mapping[cur_id] = other_id
-                            elif hasattr(other_id, 'a') and hasattr(other_id, 'b'):
-                                pt_match_mapping[cur_id] = {'a': other_id.a, 'b': other_id.b}
-            elif isinstance(match_info, dict) and 'pt_match_infos' in match_info:
-                for match in match_info['pt_match_infos']:
-                    if isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                        cur_id = match['cur_id']
-                        other_id = match['other_id']
-                        if isinstance(cur_id, int):
-                            if isinstance(other_id, dict):
-                                pt_match_mapping[cur_id] = other_id
-                            elif hasattr(other_id, 'a') and hasattr(other_id, 'b'):
-                                pt_match_mapping[cur_id] = {'a': other_id.a, 'b': other_id.b}
+        dense_pt_match_mapping = self.visualizer.data_loader.get_dense_pt_match_mapping(frame_id, match_info)
+        
+        # 提取pt_match_infos（和map平面匹配）中的当前帧稠密点id
+        # cur_id是当前帧稠密点id，other_id是对象{a: 类型(1=plane, 2=ground), b: id}，分类只需要cur_id
+        plane_matched_ids = [
+            match['cur_id']
+            for match in (match_info.get('pt_match_infos') or [])
+            if isinstance(match, dict) and isinstance(match.get('cur_id'), int)
+            and isinstance(match.get('other_id'), IdPair)
+        ]
         
         # 计算三种类型的点的数量
         # 注意：cur_id是dense_cloud点的索引（0, 1, 2, ...）
         
+        # 每类点保存为长度为点数的布尔掩码，后续用np.flatnonzero转成索引后通过select_by_index取出对应的点
+        def ids_to_mask(ids):
+            """将点id集合转换为布尔掩码（忽略超出点云范围的id）"""
+            id_array = np.fromiter(ids, dtype=np.int64, count=len(ids))
+            mask = np.zeros(num_total_points, dtype=bool)
+            mask[id_array[(id_array >= 0) & (id_array < num_total_points)]] = True
+            return mask
+        
         # 1. 和地图稠密点匹配上的当前帧稠密点（在dense_pt_match_mapping中）
-        points_matched_to_dense = list(dense_pt_match_mapping.keys())
-        count_matched_to_dense = len(points_matched_to_dense)
+        mask_matched_to_dense = ids_to_mask(dense_pt_match_mapping.keys())
+        count_matched_to_dense = int(np.count_nonzero(mask_matched_to_dense))
         
-        # 2. 和map平面匹配上的当前帧稠密点（在pt_match_mapping中）
-        points_matched_to_plane = list(pt_match_mapping.keys())
-        count_matched_to_plane = len(points_matched_to_plane)
+        # 2. 和map平面匹配上的当前帧稠密点（在pt_match_infos中）
+        mask_matched_to_plane = ids_to_mask(plane_matched_ids)
+        count_matched_to_plane = int(np.count_nonzero(mask_matched_to_plane))
         
-        # 3. 当前帧完全没有任何匹配的稠密点（既不在dense_pt_match_mapping中，也不在pt_match_mapping中）
-        all_matched_ids = set(dense_pt_match_mapping.keys()) | set(pt_match_mapping.keys())
-        points_unmatched = [i for i in range(num_total_points) if i not in all_matched_ids]
-        count_unmatched = len(points_unmatched)
+        # 3. 当前帧完全没有任何匹配的稠密点（既不在dense_pt_match_mapping中，也不在pt_match_infos中）
+        mask_unmatched = ~(mask_matched_to_dense | mask_matched_to_plane)
+        count_unmatched = int(np.count_nonzero(mask_unmatched))
         
-        # 存储点索引信息，用于后续显示/隐藏
+        # 存储点掩码信息，用于后续显示/隐藏
         self.dense_cloud_point_indices = {
-            'matched_to_plane': points_matched_to_plane,
-            'matched_to_dense': points_matched_to_dense,
-            'unmatched': points_unmatched
+            'matched_to_plane': mask_matched_to_plane,
+            'matched_to_dense': mask_matched_to_dense,
+            'unmatched': mask_unmatched
+        }
+        # 创建掩码时记录源点云的属性和各类点数，切换复选框时不再查询Open3D
+        self.dense_cloud_source_info = {
+            'has_colors': transformed_dense_pcd.has_colors(),
+            'type_counts': {
+                'matched_to_plane': count_matched_to_plane,
+                'matched_to_dense': count_matched_to_dense,
+                'unmatched': count_unmatched
+            }
         }
         
         # 创建三个复选框
@@ -1192,7 +1183,6 @@ class PointCloudGUI:
     
     def _on_dense_cloud_checkbox_toggle(self, point_type: str, var: tk.BooleanVar, frame_id: int, original_pcd):
         """当dense_cloud复选框切换时调用，显示/隐藏对应的点云和连接线"""
-        import open3d as o3d
         import numpy as np
         
         is_selected = var.get()
@@ -1201,47 +1191,32 @@ class PointCloudGUI:
         
         transformed_dense_name = f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud"
         
+        set_visible = self.visualizer.set_geometry_visible
         if is_selected:
-            # 显示点云
-            if geometry_name in self.visualizer.hidden_geometries:
+            # 显示点云：已创建的过滤点云在隐藏时保留在hidden_geometries中，
+            # 重复切换直接复用同一个PointCloud对象，只有本帧首次选中时才创建
+            visibility = self.visualizer.geometry_visibility(geometry_name)
+            if visibility is False:
                 self.visualizer.show_geometry(geometry_name)
-            elif geometry_name not in self.visualizer.geometries:
+            elif visibility is None:
                 # 如果点云不存在，创建它
                 if not hasattr(self, 'dense_cloud_point_indices') or point_type not in self.dense_cloud_point_indices:
                     return
                 
-                indices = self.dense_cloud_point_indices[point_type]
-                if len(indices) == 0:
+                mask = self.dense_cloud_point_indices[point_type]
+                source_info = self.dense_cloud_source_info
+                point_count = source_info['type_counts'][point_type]
+                if point_count == 0:
                     return
                 
-                points = np.asarray(original_pcd.points)
-                colors = np.asarray(original_pcd.colors) if original_pcd.has_colors() else None
-                
-                # 创建新的点云对象
-                filtered_pcd = o3d.geometry.PointCloud()
-                filtered_points = points[indices]
-                filtered_pcd.points = o3d.utility.Vector3dVector(filtered_points)
+                # 由Open3D在C++中一次提取点、颜色（使用原始颜色）和法向量的子集
+                filtered_pcd = original_pcd.select_by_index(np.flatnonzero(mask).tolist())
                 
-                # 设置颜色（使用原始颜色）
-                if colors is not None and len(colors) == len(points):
-                    filtered_colors = colors[indices]
-                    filtered_pcd.colors = o3d.utility.Vector3dVector(filtered_colors)
-                else:
+                if not source_info['has_colors']:
                     # 如果没有颜色，使用默认颜色
-                    if point_type == 'matched_to_plane':
-                        default_color = [0.0, 1.0, 0.0]  # 绿色
-                    elif point_type == 'matched_to_dense':
-                        default_color = [0.0, 0.0, 1.0]  # 蓝色
-                    else:  # unmatched
-                        default_color = [1.0, 0.0, 0.0]  # 红色
-                    filtered_colors = np.tile(np.array(default_color), (len(filtered_points), 1))
-                    filtered_pcd.colors = o3d.utility.Vector3dVector(filtered_colors)
-                
-                # 设置法向量
-                if original_pcd.has_normals():
-                    normals = np.asarray(original_pcd.normals)
-                    filtered_normals = normals[indices]
-                    filtered_pcd.normals = o3d.utility.Vector3dVector(filtered_normals)
+                    # 由Open3D直接填充颜色，不在numpy中生成(N, 3)的临时数组
+                    filtered_pcd.paint_uniform_color(
+                        _DENSE_POINT_DEFAULT_COLORS.get(point_type, _DENSE_POINT_DEFAULT_COLORS['unmatched']))
                 
                 # 添加到可视化器
                 self.visualizer.add_geometry(filtered_pcd, geometry_name, None)
@@ -1251,55 +1226,87 @@ class PointCloudGUI:
                     'type': 'filtered_dense_cloud',
                     'frame_id': frame_id,
                     'point_type': point_type,
-                    'point_count': len(indices)
+                    'point_count': point_count
                 }
             
             # 显示对应的连接线（如果存在）
-            if line_geometry_name in self.visualizer.hidden_geometries:
-                self.visualizer.show_geometry(line_geometry_name)
+            set_visible(line_geometry_name, True)
         else:
-            # 隐藏点云
-            if geometry_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(geometry_name)
-            
-            # 隐藏对应的连接线（如果存在）
-            if line_geometry_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(line_geometry_name)
-        
-        # 根据所有复选框的状态来决定是否显示原始的transformed dense_cloud
-        # 只有当至少有一个复选框选中时，才隐藏原始的transformed dense_cloud
-        # 如果所有复选框都未选中，也隐藏原始的transformed dense_cloud（避免残余显示）
-        any_selected = False
-        if hasattr(self, 'dense_cloud_checkboxes') and frame_id in self.dense_cloud_checkboxes:
-            checkboxes = self.dense_cloud_checkboxes[frame_id]
-            for pt_type in ['matched_to_plane', 'matched_to_dense', 'unmatched']:
-                if pt_type in checkboxes:
-                    var = checkboxes[pt_type]
-                    if var.get():
-                        any_selected = True
-                        break
+            # 隐藏点云和对应的连接线（如果存在）
+            set_visible(geometry_name, False)
+            set_visible(line_geometry_name, False)
         
         # 无论是否有复选框选中，都隐藏原始的transformed dense_cloud
         # 因为用户通过复选框来控制显示哪些稠密点，原始的transformed dense_cloud不应该单独显示
-        if transformed_dense_name in self.visualizer.geometries:
-            self.visualizer.hide_geometry(transformed_dense_name)
+        set_visible(transformed_dense_name, False)
         
         # 更新视图
+        self._schedule_update()
+    
+    def _on_checkbox_toggle(self, kind: str, key, is_selected: bool):
+        """
+        匹配信息面板中复选框切换的统一入口，按列表类型分发
+        
+        Args:
+            kind: 列表类型（'match', 'unmatched_frame', 'unmatched_map'）
+            key: 行键，match为匹配索引，未匹配项为(type, id)
+            is_selected: 是否选中
+        """
+        if kind == 'match':
+            self._on_match_checkbox_toggle(key, is_selected)
+        elif kind == 'unmatched_frame':
+            self._on_unmatched_frame_checkbox_toggle(key[0], key[1], is_selected)
+        elif kind == 'unmatched_map':
+            self._on_unmatched_map_checkbox_toggle(key[0], key[1], is_selected)
+    
+    def _schedule_update(self):
+        """安排在Tk空闲时刷新一次3D视图，连续多次调用只刷新一次"""
+        if self.root is None:
+            self.visualizer.update_view()
+            return
+        if not self._update_pending:
+            self._update_pending = True
+            self.root.after_idle(self._do_update)
+    
+    def _do_update(self):
+        """执行被合并的视图刷新"""
+        self._update_pending = False
         self.visualizer.update_view()
     
-    def _on_match_checkbox_toggle(self, match_index: int, var: tk.BooleanVar):
+    def _get_transformed_names(self, frame_id: int, type_name: str, item_id: int) -> tuple:
+        """
+        获取某个plane/ground在各变换下的变换点云名称（按键缓存，避免批量切换时重复格式化字符串）
+        
+        变换点云名称: transformed_cloud_{frame_id}_{transform_name}_{type}_{id}
+        
+        Args:
+            frame_id: 帧ID
+            type_name: 类型名称 ('plane' 或 'ground')
+            item_id: 点云ID
+            
+        Returns:
+            变换点云名称元组（T_opt_w_b, T_init_w_b）
+        """
+        key = (frame_id, type_name, item_id)
+        names = self._transformed_name_cache.get(key)
+        if names is None:
+            names = tuple(sys.intern(f"transformed_cloud_{frame_id}_{transform_name}_{type_name}_{item_id}")
+                          for transform_name in ('T_opt_w_b', 'T_init_w_b'))
+            self._transformed_name_cache[key] = names
+        return names
+    
+    def _on_match_checkbox_toggle(self, match_index: int, is_selected: bool):
         """
         当匹配关系复选框切换时调用，显示/隐藏对应的点云
         
         Args:
             match_index: 匹配关系的索引
-            var: 复选框变量
+            is_selected: 是否选中
         """
         if match_index not in self.match_checkboxes:
             return
         
-        _, match_data = self.match_checkboxes[match_index]
-        is_selected = var.get()
+        match_data = self.match_checkboxes[match_index]
         
         cur_type = match_data['cur_type']
         cur_id = match_data['cur_id']
@@ -1307,8 +1314,8 @@ class PointCloudGUI:
         other_id = match_data['other_id']
         
         # 确定类型名称
-        cur_type_name = "plane" if cur_type == 1 else "ground" if cur_type == 2 else None
-        other_type_name = "plane" if other_type == 1 else "ground" if other_type == 2 else None
+        cur_type_name = _TYPE_NAMES.get(cur_type)
+        other_type_name = _TYPE_NAMES.get(other_type)
         
         if cur_type_name is None or other_type_name is None:
             return
@@ -1324,48 +1331,26 @@ class PointCloudGUI:
             return
         frame_id = self.available_frames[self.current_frame_index]
         
-        # 变换点云名称: transformed_cloud_{frame_id}_{transform_name}_{type}_{id}
-        # 需要检查所有可能的变换名称（T_opt_w_b, T_init_w_b等）
-        transform_names = ['T_opt_w_b', 'T_init_w_b']
+        # 显示/隐藏点云和变换点云（需要处理所有变换名称：T_opt_w_b, T_init_w_b）
+        set_visible = self.visualizer.set_geometry_visible
+        changed = set_visible(frame_cloud_name, is_selected)
+        changed |= set_visible(map_cloud_name, is_selected)
+        for transformed_name in self._get_transformed_names(frame_id, cur_type_name, cur_id):
+            changed |= set_visible(transformed_name, is_selected)
         
-        if is_selected:
-            # 显示点云
-            if frame_cloud_name in self.visualizer.hidden_geometries:
-                self.visualizer.show_geometry(frame_cloud_name)
-            if map_cloud_name in self.visualizer.hidden_geometries:
-                self.visualizer.show_geometry(map_cloud_name)
-            
-            # 显示变换点云
-            for transform_name in transform_names:
-                transformed_frame_name = f"transformed_cloud_{frame_id}_{transform_name}_{cur_type_name}_{cur_id}"
-                if transformed_frame_name in self.visualizer.hidden_geometries:
-                    self.visualizer.show_geometry(transformed_frame_name)
-        else:
-            # 隐藏点云
-            if frame_cloud_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(frame_cloud_name)
-            if map_cloud_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(map_cloud_name)
-            
-            # 隐藏变换点云
-            for transform_name in transform_names:
-                transformed_frame_name = f"transformed_cloud_{frame_id}_{transform_name}_{cur_type_name}_{cur_id}"
-                if transformed_frame_name in self.visualizer.geometries:
-                    self.visualizer.hide_geometry(transformed_frame_name)
-        
-        # 更新视图
-        self.visualizer.update_view()
+        # 显示状态有变化时才更新视图
+        if changed:
+            self._schedule_update()
     
-    def _on_unmatched_frame_checkbox_toggle(self, item_type: str, item_id: int, var: tk.BooleanVar):
+    def _on_unmatched_frame_checkbox_toggle(self, item_type: str, item_id: int, is_selected: bool):
         """
         当当前帧未匹配项复选框切换时调用，显示/隐藏对应的点云
         
         Args:
             item_type: 项目类型 ('plane' 或 'ground')
             item_id: 项目ID
-            var: 复选框变量
+            is_selected: 是否选中
         """
-        is_selected = var.get()
         
         # Frame点云名称: {type}_{id}
         frame_cloud_name = f"{item_type}_{item_id}"
@@ -1375,58 +1360,32 @@ class PointCloudGUI:
             return
         frame_id = self.available_frames[self.current_frame_index]
         
-        # 变换点云名称: transformed_cloud_{frame_id}_{transform_name}_{type}_{id}
-        transform_names = ['T_opt_w_b', 'T_init_w_b']
-        
-        if is_selected:
-            # 显示点云
-            if frame_cloud_name in self.visualizer.hidden_geometries:
-                self.visualizer.show_geometry(frame_cloud_name)
-            
-            # 显示变换点云
-            for transform_name in transform_names:
-                transformed_frame_name = f"transformed_cloud_{frame_id}_{transform_name}_{item_type}_{item_id}"
-                if transformed_frame_name in self.visualizer.hidden_geometries:
-                    self.visualizer.show_geometry(transformed_frame_name)
-        else:
-            # 隐藏点云
-            if frame_cloud_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(frame_cloud_name)
-            
-            # 隐藏变换点云
-            for transform_name in transform_names:
-                transformed_frame_name = f"transformed_cloud_{frame_id}_{transform_name}_{item_type}_{item_id}"
-                if transformed_frame_name in self.visualizer.geometries:
-                    self.visualizer.hide_geometry(transformed_frame_name)
+        # 显示/隐藏点云和变换点云
+        set_visible = self.visualizer.set_geometry_visible
+        changed = set_visible(frame_cloud_name, is_selected)
+        for transformed_name in self._get_transformed_names(frame_id, item_type, item_id):
+            changed |= set_visible(transformed_name, is_selected)
         
-        # 更新视图
-        self.visualizer.update_view()
+        # 显示状态有变化时才更新视图
+        if changed:
+            self._schedule_update()
     
-    def _on_unmatched_map_checkbox_toggle(self, item_type: str, item_id: int, var: tk.BooleanVar):
+    def _on_unmatched_map_checkbox_toggle(self, item_type: str, item_id: int, is_selected: bool):
         """
         当地图未匹配项复选框切换时调用，显示/隐藏对应的点云
         
         Args:
             item_type: 项目类型 ('plane' 或 'ground')
             item_id: 项目ID
-            var: 复选框变量
+            is_selected: 是否选中
         """
-        is_selected = var.get()
         
         # Map点云名称: map_{type}_{id}
         map_cloud_name = f"map_{item_type}_{item_id}"
         
-        if is_selected:
-            # 显示点云
-            if map_cloud_name in self.visualizer.hidden_geometries:
-                self.visualizer.show_geometry(map_cloud_name)
-        else:
-            # 隐藏点云
-            if map_cloud_name in self.visualizer.geometries:
-                self.visualizer.hide_geometry(map_cloud_name)
-        
-        # 更新视图
-        self.visualizer.update_view()
+        # 显示/隐藏点云，显示状态有变化时才更新视图
+        if self.visualizer.set_geometry_visible(map_cloud_name, is_selected):
+            self._schedule_update()
     
     def on_cloud_hover(self, cloud_name: Optional[str], cloud_info: Optional[dict]):
         """
@@ -1439,7 +1398,13 @@ class PointCloudGUI:
         if self.hover_info_label is None:
             return
         
-        if cloud_name is None or cloud_info is None:
+        # 悬浮在同一个点云上时内容不变，跳过重新格式化
+        hover_key = None if cloud_name is None or cloud_info is None else (cloud_name, cloud_info.get('point_count', 0))
+        if hover_key == self._last_hover_key:
+            return
+        self._last_hover_key = hover_key
+        
+        if hover_key is None:
             # 没有悬浮在任何点云上
             self.hover_info_label.config(
                 text="将鼠标移动到点云上查看信息",
@@ -1475,6 +1440,18 @@ class PointCloudGUI:
         Args:
             point_info: 点信息字典，包含点的坐标等信息，如果为None则表示没有悬浮在任何点上
         """
+        # 坐标按显示精度取整后比较，显示内容不变时跳过config
+        point = point_info.get('point', None) if point_info is not None else None
+        if point is not None:
+            # numpy数组一次性转为Python float，避免逐个元素经过numpy标量
+            x, y, z = point.tolist() if hasattr(point, 'tolist') else point[:3]
+            point_key = (round(x, 4), round(y, 4), round(z, 4))
+        else:
+            point_key = None
+        if point_key == self._last_point_key:
+            return
+        self._last_point_key = point_key
+        
         if point_info is None:
             # 没有悬浮在任何点上
             if self.point_coord_label:
@@ -1484,9 +1461,8 @@ class PointCloudGUI:
                 )
         else:
             # 显示点的三维坐标
-            point = point_info.get('point', None)
             if point is not None:
-                coord_text = f"坐标: ({point[0]:.4f}, {point[1]:.4f}, {point[2]:.4f})"
+                coord_text = _POINT_COORD_FORMAT % point_key
                 self.point_coord_label.config(
                     text=coord_text,
                     foreground="blue"
@@ -5,11 +5,121 @@
 import open3d as o3d
 import numpy as np
 from typing import Dict, List, Optional
+from collections import Counter
 from pathlib import Path
-import colorsys
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from .config import Config
-from .data_loader import DataLoader
+from .data_classes import IdPair
+from .data_loader import DataLoader, uniform_normals
+
+
+def _hsv_to_rgb(h: np.ndarray, s: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    批量HSV转RGB（与标准库colorsys.hsv_to_rgb的公式一致）
+
+    Args:
+        h: 色相数组，范围0.0-1.0
+        s: 饱和度数组，范围0.0-1.0
+        v: 亮度数组，范围0.0-1.0
+
+    Returns:
+        numpy数组，形状为(N, 3)
+    """
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=1)
+
+
+def _generate_id_colors(num_colors: int) -> List[List[float]]:
+    """
+    生成指定数量的不同颜色，排除红色（红色保留给未匹配的点云）
+
+    Args:
+        num_colors: 需要生成的颜色数量
+
+    Returns:
+        颜色列表，每个颜色是RGB格式的列表
+    """
+    # 红色范围：hue在0-20度和340-360度之间，我们跳过这个范围
+    red_range_start = 0  # 红色开始
+    red_range_end = 20   # 红色结束（约20度）
+    red_range_start2 = 340  # 红色开始（另一端）
+    red_range_end2 = 360   # 红色结束
+
+    # 计算可用色相范围（排除红色）
+    available_range = 360 - (red_range_end - red_range_start) - (red_range_end2 - red_range_start2)
+
+    # 在可用范围内均匀分布，跳过红色区域（从红色结束处开始），并确保hue在0-360范围内
+    hue = (red_range_end + np.arange(num_colors) / num_colors * available_range) % 360.0
+    saturation = np.full(num_colors, 0.8)  # 饱和度
+    value = np.full(num_colors, 0.9)  # 亮度
+
+    # 转换为RGB
+    return _hsv_to_rgb(hue / 360.0, saturation, value).tolist()
+
+
+# 坐标系几何体名称：坐标轴线和文字标记合并为一个LineSet，三个箭头为三角网格，三个平面的网格合并为一个LineSet
+_AXIS_NAMES = ('coordinate_axis_lines', 'coordinate_arrow_x', 'coordinate_arrow_y', 'coordinate_arrow_z')
+_GRID_NAMES = ('coordinate_grid',)
+_COORDINATE_NAMES = _AXIS_NAMES + _GRID_NAMES
+
+# ground/plane文件名中的id，例如 'ground_3' -> 3、'plane_12' -> 12
+_CLOUD_FILE_ID_RE = re.compile(r'(?:ground|plane)_(-?\d+)(?:_|$)')
+
+def _coerce_id(value, default: Optional[int] = 0) -> Optional[int]:
+    """
+    把文件id转换为整数（大多数id已经是int，直接返回）
+
+    Args:
+        value: find_ply_file_id返回的id（int、str或None）
+        default: 无法转换为整数时的返回值
+
+    Returns:
+        整数id，无法转换时返回default
+    """
+    if type(value) is int:
+        return value
+    if value is None:
+        return default
+    if isinstance(value, str):
+        digits = value[1:] if value.startswith('-') else value
+        return int(value) if digits.isdecimal() else default
+    return int(value)
+
+
+# generate_distinct_colors最多缓存的颜色数组数量（每个数组与点云点数一样大）
+_DISTINCT_COLORS_CACHE_SIZE = 4
+
+# 坐标轴文字标记的字形模板 {文字: (单位大小的端点坐标, 线段索引)}，每两个端点组成一条线段
+_TEXT_GLYPHS = {
+    # X字母：两条交叉线（左上到右下、左下到右上）
+    "X": (np.array([[-1.0, 1.0, 0.0], [1.0, -1.0, 0.0],
+                    [-1.0, -1.0, 0.0], [1.0, 1.0, 0.0]]),
+          np.array([[0, 1], [2, 3]], dtype=np.int32)),
+    # Y字母：一个倒V形（两个分支从顶部到中间汇聚点）加一条从中间点到底部的竖线
+    "Y": (np.array([[-0.5, 1.0, 0.0], [0.0, 0.3, 0.0],
+                    [0.5, 1.0, 0.0], [0.0, 0.3, 0.0],
+                    [0.0, 0.3, 0.0], [0.0, -1.0, 0.0]]),
+          np.array([[0, 1], [2, 3], [4, 5]], dtype=np.int32)),
+    # Z字母：三条线（上横、斜线、下横）
+    "Z": (np.array([[-1.0, 1.0, 0.0], [1.0, 1.0, 0.0],
+                    [1.0, 1.0, 0.0], [-1.0, -1.0, 0.0],
+                    [-1.0, -1.0, 0.0], [1.0, -1.0, 0.0]]),
+          np.array([[0, 1], [2, 3], [4, 5]], dtype=np.int32)),
+}
+
+# 按照id分配的18种颜色（固定调色板，导入时生成一次，所有实例共享）
+_ID_COLORS = _generate_id_colors(18)
 
 
 class PointCloudVisualizer:
@@ -25,21 +135,48 @@ class PointCloudVisualizer:
         self.hidden_geometries = {}  # 存储被隐藏的几何体（用于重新显示）
         self.running = False  # 运行标志
         self.axis_points = {}  # 存储坐标轴上的可点击点信息
+        # 坐标轴/网格几何体缓存 {('axes'或'grid', 长度): 几何体列表}，坐标轴还缓存对应的标记点信息
+        self._coordinate_cache = {}
+        # 在后台准备大点云颜色数组的线程池（numpy计算时释放GIL，与位姿变换并行）
+        self._color_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="color-stage")
+        # generate_distinct_colors的结果缓存 {(点数, 饱和度, 亮度): 只读颜色数组}
+        self._distinct_colors_cache: Dict[tuple, np.ndarray] = {}
+        # 根据点云范围计算出的坐标轴长度缓存，点云添加/移除/隐藏/显示时失效
+        self._axis_length_cache: Optional[float] = None
+        # 最近一次加载的变换点坐标缓存 (缓存键, {点云名称: 变换后的点坐标})
+        # 同一帧在ply文件、位姿和偏移都不变时重复加载，直接复用变换结果
+        self._transformed_points_cache: tuple = (None, {})
         self.on_axis_click = None  # 坐标轴点击回调函数
         self.on_point_click = None  # 点云点击回调函数
         self.picked_points = []  # 存储选中的点
         self.point_cloud_info = {}  # 存储点云信息（名称、类型等）
-        self.original_colors = {}  # 存储点云的原始颜色
+        self.original_colors = {}  # 存储点云的原始颜色（统一颜色为RGB列表，每个点颜色不同时为(N, 3)数组）
         self.original_point_sizes = {}  # 存储点云的原始大小
+        # 最近点查询使用的KD树缓存 {name: (PointCloud, KDTreeFlann)}，点云被替换或平移时失效
+        self._kdtrees: Dict[str, tuple] = {}
         self.on_hover = None  # 鼠标悬浮回调函数
         self.hovered_point = None  # 当前鼠标悬浮的点坐标
         self.on_point_hover = None  # 点悬浮回调函数
         self.mouse_x = None  # 鼠标X坐标
         self.mouse_y = None  # 鼠标Y坐标
-        
+
+        # 每个图层常驻一个PointCloud对象（跨帧复用，切换帧时只替换缓冲区并update_geometry）
+        # 格式: {layer_key: PointCloud}
+        self.persistent_pcds: Dict[str, o3d.geometry.PointCloud] = {}
+        self._layer_names: Dict[str, str] = {}  # 图层当前使用的几何体名称 {layer_key: name}
+        self._pending_layers = set()  # 切换帧期间仍在窗口中、等待新帧数据复用的图层
+        self.applied_offset = np.zeros(3)  # 当前帧变换点云已应用的x、y、z轴偏移
+        self._batch_depth = 0  # 批量更新嵌套层数，大于0时update_view只记录需要刷新
+        self._redraw_pending = False  # 批量更新期间是否有被合并的刷新请求
+        # 按类型索引的frame/map点云名称（可能包含已删除的名称，查询时清理）
+        # 格式: {'ground': {name, ...}, 'plane': {...}, 'dense_cloud': {...}}
+        self._type_index: Dict[str, set] = {'ground': set(), 'plane': set(), 'dense_cloud': set()}
+        # 各类型当前在窗口中显示的点云数量，添加/显示时加1，隐藏/移除时减1
+        self._visible_count: Counter = Counter()
+
         # 存储transformed dense_cloud的颜色映射
-        # 格式: {frame_id: {cur_id: [r, g, b]}}
-        self.transformed_dense_cloud_colors: Dict[int, Dict[int, List[float]]] = {}
+        # 格式: {frame_id: float32数组(N, 3)}，第cur_id行是cur_id点的颜色
+        self.transformed_dense_cloud_colors: Dict[int, np.ndarray] = {}
         
         # 颜色配置（注意：红色[1.0, 0.0, 0.0]保留给未匹配的点云，不在默认颜色中使用）
         self.colors = {
@@ -53,49 +190,76 @@ class PointCloudVisualizer:
             'grid': Config.COORDINATE_GRID_COLOR,  # 网格颜色
         }
         
-        # 生成18种不同的颜色，按照id分配
-        self.id_colors = self._generate_id_colors(18)
+        # 18种不同的颜色，按照id分配
+        self.id_colors = _ID_COLORS
     
-    def _generate_id_colors(self, num_colors: int) -> List[List[float]]:
+    @staticmethod
+    def _split_transform(T: np.ndarray, offset: List[float]):
         """
-        生成指定数量的不同颜色，排除红色（红色保留给未匹配的点云）
+        把位姿变换和偏移拆成float32的旋转矩阵（已转置）和平移向量，同一帧的所有点云共用
         
         Args:
-            num_colors: 需要生成的颜色数量
+            T: 4x4变换矩阵
+            offset: x、y、z轴偏移量
             
         Returns:
-            颜色列表，每个颜色是RGB格式的列表
+            (rotation, translation)，用于_transform_points
+        """
+        rotation = np.ascontiguousarray(T[:3, :3].T, dtype=np.float32)
+        translation = (T[:3, 3] + np.asarray(offset, dtype=np.float64)).astype(np.float32)
+        return rotation, translation
+    
+    @staticmethod
+    def _transform_points(points: np.ndarray, rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
         """
-        colors = []
-        # 红色范围：hue在0-20度和340-360度之间，我们跳过这个范围
-        red_range_start = 0  # 红色开始
-        red_range_end = 20   # 红色结束（约20度）
-        red_range_start2 = 340  # 红色开始（另一端）
-        red_range_end2 = 360   # 红色结束
+        对点应用位姿变换和偏移：points @ R^T + (t + offset)
         
-        # 计算可用色相范围（排除红色）
-        available_range = 360 - (red_range_end - red_range_start) - (red_range_end2 - red_range_start2)
+        不构造齐次坐标，旋转部分为一次矩阵乘法，平移与偏移合并为一次广播加法。
+        结果只用于显示，中间计算使用float32，只在最后转换为float64
         
-        for i in range(num_colors):
-            # 在可用范围内均匀分布，跳过红色区域
-            hue_ratio = i / num_colors  # 0到1之间的比例
-            hue = red_range_end + hue_ratio * available_range  # 从红色结束处开始
-            
-            # 确保hue在0-360范围内
-            hue = hue % 360.0
+        Args:
+            points: 原始点坐标，形状为(N, 3)
+            rotation: _split_transform返回的旋转矩阵
+            translation: _split_transform返回的平移向量
             
-            saturation = 0.8  # 饱和度
-            value = 0.9  # 亮度
-
-            # 转换为RGB
-            rgb = colorsys.hsv_to_rgb(hue / 360.0, saturation, value)
-            colors.append(list(rgb))
-        return colors
+        Returns:
+            变换后的点坐标（float64，可直接用于Vector3dVector）
+        """
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        transformed_points = points @ rotation
+        transformed_points += translation
+        return transformed_points.astype(np.float64)
     
     def generate_distinct_colors(self, num_colors: int, 
                                  saturation: float = 0.8, 
                                  value: float = 0.9) -> np.ndarray:
         """
+        获取指定数量的不同颜色（按参数缓存，重复加载同一点数的点云时不再重新计算）
+        
+        返回的数组是只读的，多个点云共享同一个数组
+        
+        Args:
+            num_colors: 需要生成的颜色数量
+            saturation: 饱和度，范围0.0-1.0，默认0.8
+            value: 亮度，范围0.0-1.0，默认0.9
+            
+        Returns:
+            numpy数组，形状为(num_colors, 3)，每行是一个RGB颜色值（范围0.0-1.0）
+        """
+        key = (num_colors, saturation, value)
+        colors = self._distinct_colors_cache.get(key)
+        if colors is None:
+            colors = self._build_distinct_colors(num_colors, saturation, value)
+            colors.setflags(write=False)
+            if len(self._distinct_colors_cache) >= _DISTINCT_COLORS_CACHE_SIZE:
+                # 移除最早缓存的颜色数组
+                del self._distinct_colors_cache[next(iter(self._distinct_colors_cache))]
+            self._distinct_colors_cache[key] = colors
+        return colors
+    
+    @staticmethod
+    def _build_distinct_colors(num_colors: int, saturation: float, value: float) -> np.ndarray:
+        """
         生成指定数量的不同颜色，确保每个颜色都不同，排除红色（红色保留给未匹配的点云）
         
         使用HSV色彩空间生成均匀分布的颜色，通过调整色相(H)、饱和度(S)和亮度(V)
@@ -112,8 +276,6 @@ class PointCloudVisualizer:
         if num_colors <= 0:
             return np.array([]).reshape(0, 3)
         
-        colors = []
-        
         # 红色范围：hue在0-20度和340-360度之间（HSV中hue范围0-1对应0-360度）
         # 红色范围：约0-0.056和0.944-1.0
         red_range_start = 0.0
@@ -126,45 +288,42 @@ class PointCloudVisualizer:
         
         if num_colors == 1:
             # 只有一个颜色时，返回一个非红色的鲜艳颜色（使用绿色）
-            rgb = colorsys.hsv_to_rgb(120.0 / 360.0, saturation, value)  # 绿色
-            colors.append(list(rgb))
+            rgb = _hsv_to_rgb(np.array([120.0 / 360.0]), np.array([saturation]), np.array([value]))  # 绿色
+            return rgb.astype(np.float32)
+        
+        # 使用黄金角度（约137.5度）来生成均匀分布的颜色
+        # 这样可以确保颜色在色相环上均匀分布
+        golden_angle = 0.618033988749895  # 黄金比例 - 1
+        index = np.arange(num_colors)
+        hue_raw = (index * golden_angle) % 1.0
+        
+        # 使用黄金角度确保颜色分布均匀，但跳过红色范围：
+        # 落在红色范围开头的映射到红色范围之后，落在结尾的映射到红色范围之前，
+        # 其余在可用范围内的重新映射到整个可用范围
+        hue = np.where(
+            hue_raw < red_range_end,
+            red_range_end + (hue_raw / red_range_end) * (available_range / 2),
+            np.where(
+                hue_raw > red_range_start2,
+                red_range_start2 - available_range / 2 + ((hue_raw - red_range_start2) / (red_range_end2 - red_range_start2)) * (available_range / 2),
+                red_range_end + ((hue_raw - red_range_end) / (red_range_start2 - red_range_end)) * available_range
+            )
+        )
+        
+        # 确保hue在0-1范围内
+        hue = hue % 1.0
+        
+        # 对于大量颜色，可以稍微调整饱和度和亮度以增加变化
+        if num_colors > 100:
+            # 在饱和度和亮度上添加小的变化
+            s = saturation * (0.7 + 0.3 * (index % 3) / 2.0)
+            v = value * (0.8 + 0.2 * (index % 5) / 4.0)
         else:
-            # 使用黄金角度（约137.5度）来生成均匀分布的颜色
-            # 这样可以确保颜色在色相环上均匀分布
-            golden_angle = 0.618033988749895  # 黄金比例 - 1
-            
-            for i in range(num_colors):
-                # 使用黄金角度确保颜色分布均匀，但跳过红色范围
-                hue_raw = (i * golden_angle) % 1.0
-                
-                # 如果落在红色范围内，调整到可用范围
-                if hue_raw < red_range_end:
-                    # 映射到红色范围之后
-                    hue = red_range_end + (hue_raw / red_range_end) * (available_range / 2)
-                elif hue_raw > red_range_start2:
-                    # 映射到红色范围之前
-                    hue = red_range_start2 - available_range / 2 + ((hue_raw - red_range_start2) / (red_range_end2 - red_range_start2)) * (available_range / 2)
-                else:
-                    # 在可用范围内，需要重新映射到整个可用范围
-                    hue = red_range_end + ((hue_raw - red_range_end) / (red_range_start2 - red_range_end)) * available_range
-                
-                # 确保hue在0-1范围内
-                hue = hue % 1.0
-                
-                # 对于大量颜色，可以稍微调整饱和度和亮度以增加变化
-                if num_colors > 100:
-                    # 在饱和度和亮度上添加小的变化
-                    s = saturation * (0.7 + 0.3 * (i % 3) / 2.0)
-                    v = value * (0.8 + 0.2 * (i % 5) / 4.0)
-                else:
-                    s = saturation
-                    v = value
-                
-                # 转换为RGB
-                rgb = colorsys.hsv_to_rgb(hue, s, v)
-                colors.append(list(rgb))
+            s = np.full(num_colors, saturation)
+            v = np.full(num_colors, value)
         
-        return np.array(colors, dtype=np.float32)
+        # 转换为RGB
+        return _hsv_to_rgb(hue, s, v).astype(np.float32)
     
     def get_color_by_id(self, id: int) -> List[float]:
         """
@@ -178,10 +337,12 @@ class PointCloudVisualizer:
         """
         if id < 0:
             color = [0.5, 0.5, 0.5]  # 默认灰色
-            print(f"[DEBUG] get_color_by_id: id={id} (负数), 返回默认灰色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+            if Config.VERBOSE_DEBUG:
+                print(f"[DEBUG] get_color_by_id: id={id} (负数), 返回默认灰色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
             return color
         color = self.id_colors[id % len(self.id_colors)]
-        print(f"[DEBUG] get_color_by_id: id={id}, 返回颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+        if Config.VERBOSE_DEBUG:
+            print(f"[DEBUG] get_color_by_id: id={id}, 返回颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
         return color
     
     def create_visualizer(self) -> o3d.visualization.Visualizer:
@@ -205,23 +366,14 @@ class PointCloudVisualizer:
         # 立即添加坐标系（使用默认长度）
         if Config.COORDINATE_AXIS_ENABLED:
             geometries = self.create_coordinate_axes(Config.COORDINATE_AXIS_LENGTH)
-            axis_names = [
-                'coordinate_axis_x', 'coordinate_arrow_x',
-                'coordinate_axis_y', 'coordinate_arrow_y',
-                'coordinate_axis_z', 'coordinate_arrow_z',
-                'coordinate_label_x', 'coordinate_label_y', 'coordinate_label_z'
-            ]
-            for geometry, name in zip(geometries, axis_names):
-                vis.add_geometry(geometry, reset_bounding_box=False)
-                self.geometries[name] = geometry
+            for geometry, name in zip(geometries, _AXIS_NAMES):
+                self._place_coordinate_geometry(vis, name, geometry)
             
             # 添加网格
             if Config.COORDINATE_GRID_ENABLED:
                 grid_geometries = self.create_coordinate_grid(Config.COORDINATE_AXIS_LENGTH)
-                grid_names = ['coordinate_grid_xy', 'coordinate_grid_xz', 'coordinate_grid_yz']
-                for geometry, name in zip(grid_geometries, grid_names):
-                    vis.add_geometry(geometry, reset_bounding_box=False)
-                    self.geometries[name] = geometry
+                for geometry, name in zip(grid_geometries, _GRID_NAMES):
+                    self._place_coordinate_geometry(vis, name, geometry)
             
             # 设置鼠标和键盘回调
             self._setup_mouse_callbacks(vis)
@@ -242,11 +394,22 @@ class PointCloudVisualizer:
         """
         if self.vis is None:
             return
-        
+
+        # 名称驻留后作为字典键，使用同一驻留名称的查找可直接按对象标识比较
+        name = sys.intern(name)
+        self._kdtrees.pop(name, None)
+        if isinstance(geometry, o3d.geometry.PointCloud):
+            self._axis_length_cache = None
+
+        # 点云复用图层常驻对象，已在窗口中时只需update_geometry
+        reuse = False
+        if isinstance(geometry, o3d.geometry.PointCloud):
+            geometry, reuse = self._acquire_layer_pcd(name, geometry)
+
         # 如果同名几何体已存在，先移除它（避免重复绘制）
-        if name in self.geometries:
+        if not reuse and name in self.geometries:
             self.remove_geometry(name)
-        
+
         # 如果几何体是点云，设置颜色（数据文件不包含颜色信息，完全由代码设置）
         if isinstance(geometry, o3d.geometry.PointCloud):
             num_points = len(geometry.points)
@@ -256,31 +419,94 @@ class PointCloudVisualizer:
             self.original_point_sizes[name] = render_option.point_size
             
             # 设置颜色：如果提供了color参数则使用，否则检查点云是否已有颜色
+            # 存储原始颜色（用于后续恢复）：统一颜色只保存单一颜色，
+            # 每个点颜色不同时用float32保存（颜色值在[0,1]内，float32精度足够，内存减半）
             if color is not None:
-                # 使用提供的颜色
-                color_array = np.tile(np.array(color), (num_points, 1))
-                color_array = np.clip(color_array, 0.0, 1.0)
-                geometry.colors = o3d.utility.Vector3dVector(color_array)
-                # 存储原始颜色（用于后续恢复）
-                self.original_colors[name] = color_array.copy()
+                # 使用提供的颜色（统一颜色直接填充，不创建中间数组）
+                # 只有3个分量，直接在Python中截断到[0,1]，不创建numpy数组
+                uniform_color = [min(max(float(c), 0.0), 1.0) for c in color]
+                geometry.paint_uniform_color(uniform_color)
+                self.original_colors[name] = uniform_color
+            elif geometry.has_colors() and len(geometry.colors) == num_points:
+                # 点云已有颜色，保留并使用它
+                self.original_colors[name] = np.asarray(geometry.colors, dtype=np.float32)
             else:
-                # color为None时，检查点云是否已经有颜色
-                if geometry.has_colors() and len(geometry.colors) == num_points:
-                    # 点云已有颜色，保留并使用它
-                    color_array = np.asarray(geometry.colors)
-                    # 存储原始颜色
-                    self.original_colors[name] = color_array.copy()
-                else:
-                    # 点云没有颜色，使用默认灰色
-                    default_color = [0.5, 0.5, 0.5]
-                    color_array = np.tile(np.array(default_color), (num_points, 1))
-                    geometry.colors = o3d.utility.Vector3dVector(color_array)
-                    # 存储原始颜色
-                    self.original_colors[name] = color_array.copy()
-        
-        self.vis.add_geometry(geometry, reset_bounding_box=False)
+                # 点云没有颜色，使用默认灰色
+                uniform_color = [0.5, 0.5, 0.5]
+                geometry.paint_uniform_color(uniform_color)
+                self.original_colors[name] = uniform_color
+
+        if reuse:
+            self.vis.update_geometry(geometry)
+        else:
+            self.vis.add_geometry(geometry, reset_bounding_box=False)
+        was_visible = name in self.geometries
         self.geometries[name] = geometry
-    
+        cloud_type = self._cloud_type_of(name)
+        if cloud_type is not None:
+            self._type_index[cloud_type].add(name)
+            if not was_visible:
+                self._visible_count[cloud_type] += 1
+
+    @staticmethod
+    def _layer_key(name: str) -> str:
+        """
+        获取几何体所属的图层标识（带帧ID的名称在不同帧之间共享同一图层）
+
+        Args:
+            name: 几何体名称，例如 'map_ground_0', 'transformed_cloud_3_T_opt_w_b_dense_cloud'
+
+        Returns:
+            图层标识，例如 'map_ground_0', 'transformed_cloud_T_opt_w_b_dense_cloud'
+        """
+        for prefix in ('transformed_cloud_', 'filtered_dense_cloud_'):
+            if name.startswith(prefix):
+                _, _, rest = name[len(prefix):].partition('_')
+                return prefix + rest if rest else name
+        return name
+
+    def _acquire_layer_pcd(self, name: str, source: o3d.geometry.PointCloud):
+        """
+        获取图层常驻的PointCloud，并把source的点、法向量和颜色写入其中
+
+        Args:
+            name: 几何体名称
+            source: 新加载的点云
+
+        Returns:
+            (点云对象, 是否已在窗口中可直接update_geometry)
+        """
+        layer = self._layer_key(name)
+        pcd = self.persistent_pcds.get(layer)
+        if pcd is None:
+            self.persistent_pcds[layer] = source
+            self._layer_names[layer] = name
+            return source, False
+
+        # 图层对象正以其他名称显示或隐藏时不能覆盖其数据
+        owner = self._layer_names.get(layer)
+        if owner != name and (self.geometries.get(owner) is pcd or owner in self.hidden_geometries):
+            return source, False
+
+        if pcd is not source:
+            pcd.points = source.points
+            pcd.normals = source.normals
+            pcd.colors = source.colors
+
+        reuse = layer in self._pending_layers or self.geometries.get(name) is pcd
+        self._pending_layers.discard(layer)
+        self._layer_names[layer] = name
+        return pcd, reuse
+
+    def _release_pending_layers(self):
+        """移除切换帧后没有被新帧数据复用的图层，并释放图层常驻的点云"""
+        for layer in self._pending_layers:
+            pcd = self.persistent_pcds.pop(layer, None)
+            self._layer_names.pop(layer, None)
+            if self.vis is not None and pcd is not None:
+                self.vis.remove_geometry(pcd, reset_bounding_box=False)
+        self._pending_layers.clear()
+
     def remove_geometry(self, name: str):
         """从可视化窗口移除几何体"""
         if self.vis is None or name not in self.geometries:
@@ -288,11 +514,33 @@ class PointCloudVisualizer:
         
         self.vis.remove_geometry(self.geometries[name], reset_bounding_box=False)
         del self.geometries[name]
+        self._kdtrees.pop(name, None)
+        self._axis_length_cache = None
+        cloud_type = self._cloud_type_of(name)
+        if cloud_type is not None:
+            self._type_index[cloud_type].discard(name)
+            self._visible_count[cloud_type] -= 1
+    
+    def remove_geometries_with_prefix(self, prefix: str):
+        """
+        移除名称以prefix开头的所有几何体（包括可见和隐藏的）
+        
+        移除时不重置视角，也不刷新窗口，由调用方在全部修改完成后统一调用update_view
+        
+        Args:
+            prefix: 几何体名称前缀
+        """
+        for name in [name for name in self.geometries if name.startswith(prefix)]:
+            self.remove_geometry(name)
+        for name in [name for name in self.hidden_geometries if name.startswith(prefix)]:
+            del self.hidden_geometries[name]
+            self.point_cloud_info.pop(name, None)
     
     def hide_geometry(self, name: str):
         """隐藏几何体（保留以便重新显示）"""
         if self.vis is None or name not in self.geometries:
             return
+        name = sys.intern(name)
         
         geometry = self.geometries[name]
         # 保存点云信息以便重新显示
@@ -302,23 +550,17 @@ class PointCloudVisualizer:
         color_array = None
         color = None
         
-        # 首先尝试从点云对象本身获取颜色
-        if isinstance(geometry, o3d.geometry.PointCloud) and geometry.has_colors():
-            # 保存完整的颜色数组
-            color_array = np.asarray(geometry.colors).copy()
-        
-        # 如果点云没有颜色，尝试从原始颜色中获取
-        if color_array is None and name in self.original_colors:
-            orig_colors = self.original_colors[name]
-            if isinstance(orig_colors, np.ndarray) and len(orig_colors.shape) == 2 and len(orig_colors) > 0:
-                # 检查是否所有点颜色相同
-                first_color = orig_colors[0]
-                if np.allclose(orig_colors, first_color, atol=1e-6):
-                    # 所有点颜色相同，只保存单一颜色
-                    color = first_color.tolist()
-                else:
-                    # 每个点颜色不同，保存完整数组
-                    color_array = orig_colors.copy()
+        # 点云添加后颜色不再被修改，直接使用add_geometry时记录的原始颜色，不再逐点比较
+        orig_colors = self.original_colors.get(name)
+        if isinstance(orig_colors, list):
+            # 添加时使用的是统一颜色，只保存单一颜色
+            color = list(orig_colors)
+        elif isinstance(orig_colors, np.ndarray) and len(orig_colors.shape) == 2 and len(orig_colors) > 0:
+            # 每个点颜色不同，保存完整数组（添加时保存的float32数组，显示时再转换回float64）
+            color_array = orig_colors
+        elif isinstance(geometry, o3d.geometry.PointCloud) and geometry.has_colors():
+            # 没有原始颜色记录时从点云对象本身获取颜色
+            color_array = np.asarray(geometry.colors, dtype=np.float32)
         
         # 如果都没有找到颜色，尝试根据类型获取默认颜色
         if color is None and color_array is None:
@@ -356,6 +598,10 @@ class PointCloudVisualizer:
         
         self.vis.remove_geometry(geometry, reset_bounding_box=False)
         del self.geometries[name]
+        self._axis_length_cache = None
+        cloud_type = self._cloud_type_of(name)
+        if cloud_type is not None:
+            self._visible_count[cloud_type] -= 1
         if name in self.point_cloud_info:
             del self.point_cloud_info[name]
     
@@ -370,11 +616,21 @@ class PointCloudVisualizer:
         color = hidden_data.get('color')  # 单一颜色
         color_array = hidden_data.get('color_array')  # 完整颜色数组
         
+        if (isinstance(geometry, o3d.geometry.PointCloud) and name in self.original_colors and
+                geometry.has_colors() and len(geometry.colors) == len(geometry.points)):
+            # 隐藏期间点云颜色没有改变（只可能被平移），直接重新加入窗口，不再重写颜色数组
+            self.vis.add_geometry(geometry, reset_bounding_box=False)
+            self.geometries[name] = geometry
+            self._axis_length_cache = None
+            cloud_type = self._cloud_type_of(name)
+            if cloud_type is not None:
+                self._type_index[cloud_type].add(name)
+                self._visible_count[cloud_type] += 1
         # 如果有完整的颜色数组，直接设置到点云对象上
-        if color_array is not None and isinstance(geometry, o3d.geometry.PointCloud):
+        elif color_array is not None and isinstance(geometry, o3d.geometry.PointCloud):
             # 确保颜色数组的形状正确
             if isinstance(color_array, np.ndarray) and len(color_array.shape) == 2:
-                geometry.colors = o3d.utility.Vector3dVector(color_array)
+                geometry.colors = o3d.utility.Vector3dVector(color_array.astype(np.float64))
                 # 重新添加到可视化器，传递None以使用点云对象上已设置的颜色
                 self.add_geometry(geometry, name, None)
             else:
@@ -389,6 +645,117 @@ class PointCloudVisualizer:
         # 从隐藏列表中移除
         del self.hidden_geometries[name]
     
+    def get_geometry(self, name: str):
+        """
+        获取几何体对象（无论当前显示还是隐藏）
+
+        Args:
+            name: 几何体名称
+
+        Returns:
+            几何体对象，不存在时返回None
+        """
+        geometry = self.geometries.get(name)
+        if geometry is None:
+            hidden_data = self.hidden_geometries.get(name)
+            if hidden_data is not None:
+                geometry = hidden_data['geometry']
+        return geometry
+
+    def geometry_visibility(self, name: str) -> Optional[bool]:
+        """
+        获取几何体的显示状态
+
+        Args:
+            name: 几何体名称
+
+        Returns:
+            True表示显示，False表示隐藏，None表示不存在
+        """
+        if name in self.geometries:
+            return True
+        if name in self.hidden_geometries:
+            return False
+        return None
+
+    def set_geometry_visible(self, name: str, visible: bool) -> bool:
+        """
+        显示或隐藏几何体，几何体不存在或已处于目标状态时不做任何操作
+
+        Args:
+            name: 几何体名称
+            visible: 是否显示
+
+        Returns:
+            是否实际改变了显示状态
+        """
+        if self.vis is None:
+            return False
+        if visible:
+            if name not in self.hidden_geometries:
+                return False
+            self.show_geometry(name)
+        else:
+            if name not in self.geometries:
+                return False
+            self.hide_geometry(name)
+        return True
+
+    @staticmethod
+    def _cloud_type_of(name: str) -> Optional[str]:
+        """
+        获取frame/map点云名称对应的类型
+
+        Args:
+            name: 几何体名称，例如 'ground_0', 'map_plane_3', 'map_dense_cloud'
+
+        Returns:
+            'ground'、'plane'、'dense_cloud'，其他几何体返回None
+        """
+        if name.startswith('map_'):
+            name = name[4:]
+        if name == 'dense_cloud':
+            return 'dense_cloud'
+        if name.startswith('ground_'):
+            return 'ground'
+        if name.startswith('plane_'):
+            return 'plane'
+        return None
+
+    def _names_of_type(self, cloud_type: str):
+        """
+        从类型索引中获取指定类型的可见和隐藏点云名称，并清理已不存在的名称
+
+        Args:
+            cloud_type: 点云类型 ('ground', 'plane', 'dense_cloud')
+
+        Returns:
+            (visible_names, hidden_names)
+        """
+        names = self._type_index.get(cloud_type)
+        if not names:
+            return [], []
+        visible_names = [name for name in names if name in self.geometries]
+        hidden_names = [name for name in names if name in self.hidden_geometries]
+        if len(visible_names) + len(hidden_names) < len(names):
+            self._type_index[cloud_type] = set(visible_names).union(hidden_names)
+        return visible_names, hidden_names
+
+    def _frame_type_visibility(self) -> Dict[str, bool]:
+        """
+        计算各类型原始点云（不含map_前缀）的可见状态
+
+        Returns:
+            {类型: 是否有可见点云}，只包含存在点云（可见或隐藏）的类型
+        """
+        visibility = {}
+        for cloud_type in ('ground', 'plane', 'dense_cloud'):
+            visible_names, hidden_names = self._names_of_type(cloud_type)
+            visible = any(not name.startswith('map_') for name in visible_names)
+            if visible or any(not name.startswith('map_') for name in hidden_names):
+                visibility[cloud_type] = visible
+        return visibility
+
     def toggle_point_cloud_type(self, cloud_type: str) -> bool:
         """
         切换指定类型点云的显示/隐藏状态
@@ -404,27 +771,8 @@ class PointCloudVisualizer:
         if self.vis is None:
             return False
         
-        # 查找该类型的所有点云（包括map和frame）
-        visible_names = []
-        hidden_names = []
-        
-        if cloud_type == 'dense_cloud':
-            # 查找dense_cloud（可能没有前缀，也可能有map_前缀）
-            for name in list(self.geometries.keys()):
-                if name == 'dense_cloud' or name == 'map_dense_cloud':
-                    visible_names.append(name)
-            for name in list(self.hidden_geometries.keys()):
-                if name == 'dense_cloud' or name == 'map_dense_cloud':
-                    hidden_names.append(name)
-        else:
-            # ground或plane可能有多个（ground_0, ground_1, ... 或 map_ground_0, map_ground_1, ...）
-            # 匹配所有以ground_或map_ground_开头的名称
-            for name in list(self.geometries.keys()):
-                if name.startswith(cloud_type + '_') or name.startswith('map_' + cloud_type + '_'):
-                    visible_names.append(name)
-            for name in list(self.hidden_geometries.keys()):
-                if name.startswith(cloud_type + '_') or name.startswith('map_' + cloud_type + '_'):
-                    hidden_names.append(name)
+        # 查找该类型的所有点云（包括map和frame，例如ground_0和map_ground_0）
+        visible_names, hidden_names = self._names_of_type(cloud_type)
         
         # 如果有可见的，则隐藏它们
         if visible_names:
@@ -451,34 +799,43 @@ class PointCloudVisualizer:
         Returns:
             True表示可见，False表示隐藏或不存在
         """
-        if cloud_type == 'dense_cloud':
-            return 'dense_cloud' in self.geometries or 'map_dense_cloud' in self.geometries
-        else:
-            # 检查是否有该类型的点云可见（包括map和frame）
-            for name in self.geometries.keys():
-                if name.startswith(cloud_type + '_') or name.startswith('map_' + cloud_type + '_'):
-                    return True
-            return False
+        return self._visible_count[cloud_type] > 0
     
-    def clear_all_geometries(self):
-        """清除所有几何体（保留坐标系和网格）"""
+    def clear_all_geometries(self, keep_layers: bool = False):
+        """
+        清除所有几何体（保留坐标系和网格）
+
+        Args:
+            keep_layers: 为True时图层常驻点云暂不从窗口移除，等待新帧数据复用，
+                         加载完成后由_release_pending_layers移除未被复用的图层
+        """
         if self.vis is None:
             return
-        
+
+        self._release_pending_layers()
+
         # 保留坐标系和网格，清除其他几何体
-        coordinate_names = [
-            'coordinate_axis_x', 'coordinate_arrow_x',
-            'coordinate_axis_y', 'coordinate_arrow_y',
-            'coordinate_axis_z', 'coordinate_arrow_z',
-            'coordinate_label_x', 'coordinate_label_y', 'coordinate_label_z',
-            'coordinate_grid_xy', 'coordinate_grid_xz', 'coordinate_grid_yz'
-        ]
         for name in list(self.geometries.keys()):
-            if name not in coordinate_names:
+            if name in _COORDINATE_NAMES:
+                continue
+            layer = self._layer_key(name)
+            if keep_layers and self.persistent_pcds.get(layer) is self.geometries[name]:
+                del self.geometries[name]
+                self._kdtrees.pop(name, None)
+                self._axis_length_cache = None
+                self._pending_layers.add(layer)
+                cloud_type = self._cloud_type_of(name)
+                if cloud_type is not None:
+                    self._visible_count[cloud_type] -= 1
+            else:
                 self.remove_geometry(name)
-        
+
         # 清除隐藏的几何体（切换帧时需要清除）
         self.hidden_geometries.clear()
+        
+        # 类型索引中的点云都已被清除，清空索引避免名称在会话中累积
+        for names in self._type_index.values():
+            names.clear()
     
     def create_coordinate_axes(self, length: float = None) -> List[o3d.geometry.Geometry]:
         """
@@ -488,11 +845,32 @@ class PointCloudVisualizer:
             length: 坐标轴长度，如果为None则使用Config中的默认值
             
         Returns:
-            包含三个坐标轴几何体的列表 [X轴, Y轴, Z轴, X箭头, Y箭头, Z箭头]
+            几何体列表 [坐标轴线和文字标记LineSet, X箭头, Y箭头, Z箭头]
         """
         if length is None:
             length = Config.COORDINATE_AXIS_LENGTH
         
+        # 同一长度的坐标轴几何体创建后不再修改，直接复用
+        cached = self._coordinate_cache.get(('axes', length))
+        if cached is not None:
+            geometries, axis_points = cached
+            self.axis_points = dict(axis_points)
+            return list(geometries)
+        
+        geometries = self._build_coordinate_axes(length)
+        self._coordinate_cache[('axes', length)] = (geometries, dict(self.axis_points))
+        return list(geometries)
+    
+    def _build_coordinate_axes(self, length: float) -> List[o3d.geometry.Geometry]:
+        """
+        创建坐标轴、箭头和文字标记几何体，并记录坐标轴上的标记点
+        
+        Args:
+            length: 坐标轴长度
+            
+        Returns:
+            几何体列表
+        """
         geometries = []
         origin = np.array([0.0, 0.0, 0.0])
         arrow_length = length * 0.15  # 箭头长度为轴长度的15%
@@ -626,7 +1004,15 @@ class PointCloudVisualizer:
         z_label = self._create_text_lineset("Z", z_label_pos, label_size, self.colors['axis_z'])
         geometries.append(z_label)
         
-        return geometries
+        # 坐标轴线和文字标记合并为一个LineSet（保留每条线的颜色），减少窗口中的几何体数量
+        axis_lines = o3d.geometry.LineSet()
+        meshes = []
+        for geometry in geometries:
+            if isinstance(geometry, o3d.geometry.LineSet):
+                axis_lines += geometry
+            else:
+                meshes.append(geometry)
+        return [axis_lines] + meshes
     
     def _create_text_lineset(self, text: str, position: np.ndarray, size: float, color: List[float]) -> o3d.geometry.LineSet:
         """
@@ -641,62 +1027,15 @@ class PointCloudVisualizer:
         Returns:
             LineSet对象
         """
-        points = []
-        lines = []
-        line_idx = 0
-        
-        if text == "X":
-            # X字母：两条交叉线
-            # 左上到右下
-            points.append(position + np.array([-size, size, 0]))
-            points.append(position + np.array([size, -size, 0]))
-            lines.append([line_idx, line_idx + 1])
-            line_idx += 2
-            # 左下到右上
-            points.append(position + np.array([-size, -size, 0]))
-            points.append(position + np.array([size, size, 0]))
-            lines.append([line_idx, line_idx + 1])
-            
-        elif text == "Y":
-            # Y字母：一个倒V形加一条竖线
-            # 倒V的左上分支：从顶部到中间点
-            points.append(position + np.array([-size * 0.5, size, 0]))
-            points.append(position + np.array([0, size * 0.3, 0]))  # 中间汇聚点
-            lines.append([line_idx, line_idx + 1])
-            line_idx += 2
-            # 倒V的右上分支：从顶部到中间点
-            points.append(position + np.array([size * 0.5, size, 0]))
-            points.append(position + np.array([0, size * 0.3, 0]))  # 中间汇聚点
-            lines.append([line_idx, line_idx + 1])
-            line_idx += 2
-            # 竖线：从中间点到底部
-            points.append(position + np.array([0, size * 0.3, 0]))  # 中间汇聚点
-            points.append(position + np.array([0, -size, 0]))
-            lines.append([line_idx, line_idx + 1])
-            
-        elif text == "Z":
-            # Z字母：三条线（上横、斜线、下横）
-            # 上横线
-            points.append(position + np.array([-size, size, 0]))
-            points.append(position + np.array([size, size, 0]))
-            lines.append([line_idx, line_idx + 1])
-            line_idx += 2
-            # 斜线
-            points.append(position + np.array([size, size, 0]))
-            points.append(position + np.array([-size, -size, 0]))
-            lines.append([line_idx, line_idx + 1])
-            line_idx += 2
-            # 下横线
-            points.append(position + np.array([-size, -size, 0]))
-            points.append(position + np.array([size, -size, 0]))
-            lines.append([line_idx, line_idx + 1])
+        glyph = _TEXT_GLYPHS.get(text)
         
-        # 创建LineSet
+        # 创建LineSet（按文字大小缩放字形模板并平移到文字位置）
         lineset = o3d.geometry.LineSet()
-        if len(points) > 0:
-            lineset.points = o3d.utility.Vector3dVector(np.array(points))
-            lineset.lines = o3d.utility.Vector2iVector(np.array(lines))
-            lineset.colors = o3d.utility.Vector3dVector([color] * len(lines))
+        if glyph is not None:
+            template, lines = glyph
+            lineset.points = o3d.utility.Vector3dVector(template * size + position)
+            lineset.lines = o3d.utility.Vector2iVector(lines)
+            lineset.paint_uniform_color(color)
         
         return lineset
     
@@ -708,7 +1047,7 @@ class PointCloudVisualizer:
             length: 网格范围，如果为None则使用坐标轴长度
             
         Returns:
-            包含网格线的LineSet列表
+            包含网格线的LineSet列表（三个平面合并为一个LineSet）
         """
         if not Config.COORDINATE_GRID_ENABLED:
             return []
@@ -716,6 +1055,25 @@ class PointCloudVisualizer:
         if length is None:
             length = Config.COORDINATE_AXIS_LENGTH
         
+        # 同一长度的网格几何体创建后不再修改，直接复用
+        cached = self._coordinate_cache.get(('grid', length))
+        if cached is not None:
+            return list(cached)
+        
+        grid_lines = self._build_coordinate_grid(length)
+        self._coordinate_cache[('grid', length)] = grid_lines
+        return list(grid_lines)
+    
+    def _build_coordinate_grid(self, length: float) -> List[o3d.geometry.LineSet]:
+        """
+        创建XY、XZ、YZ平面的网格几何体
+        
+        Args:
+            length: 网格范围
+            
+        Returns:
+            网格LineSet列表
+        """
         grid_size = Config.COORDINATE_GRID_SIZE
         grid_lines = []
         
@@ -723,100 +1081,68 @@ class PointCloudVisualizer:
         grid_range = length
         num_lines = int(grid_range / grid_size) * 2 + 1  # 包括原点
         
-        # XY平面网格（Z=0）
-        xy_grid = o3d.geometry.LineSet()
-        xy_points = []
-        xy_lines = []
-        line_idx = 0
-        
-        # X方向的网格线（平行于Y轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            x = i * grid_size
-            if abs(x) <= grid_range:
-                # 添加一条从-y到+y的线
-                xy_points.append([x, -grid_range, 0.0])
-                xy_points.append([x, grid_range, 0.0])
-                xy_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        # Y方向的网格线（平行于X轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            y = i * grid_size
-            if abs(y) <= grid_range:
-                # 添加一条从-x到+x的线
-                xy_points.append([-grid_range, y, 0.0])
-                xy_points.append([grid_range, y, 0.0])
-                xy_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        if xy_points:
-            xy_grid.points = o3d.utility.Vector3dVector(np.array(xy_points))
-            xy_grid.lines = o3d.utility.Vector2iVector(np.array(xy_lines))
-            xy_grid.colors = o3d.utility.Vector3dVector([self.colors['grid']] * len(xy_lines))
-            grid_lines.append(xy_grid)
-        
-        # XZ平面网格（Y=0）
-        xz_grid = o3d.geometry.LineSet()
-        xz_points = []
-        xz_lines = []
-        line_idx = 0
-        
-        # X方向的网格线（平行于Z轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            x = i * grid_size
-            if abs(x) <= grid_range:
-                xz_points.append([x, 0.0, -grid_range])
-                xz_points.append([x, 0.0, grid_range])
-                xz_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        # Z方向的网格线（平行于X轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            z = i * grid_size
-            if abs(z) <= grid_range:
-                xz_points.append([-grid_range, 0.0, z])
-                xz_points.append([grid_range, 0.0, z])
-                xz_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        if xz_points:
-            xz_grid.points = o3d.utility.Vector3dVector(np.array(xz_points))
-            xz_grid.lines = o3d.utility.Vector2iVector(np.array(xz_lines))
-            xz_grid.colors = o3d.utility.Vector3dVector([self.colors['grid']] * len(xz_lines))
-            grid_lines.append(xz_grid)
-        
-        # YZ平面网格（X=0）
-        yz_grid = o3d.geometry.LineSet()
-        yz_points = []
-        yz_lines = []
-        line_idx = 0
-        
-        # Y方向的网格线（平行于Z轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            y = i * grid_size
-            if abs(y) <= grid_range:
-                yz_points.append([0.0, y, -grid_range])
-                yz_points.append([0.0, y, grid_range])
-                yz_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        # Z方向的网格线（平行于Y轴）
-        for i in range(-num_lines//2, num_lines//2 + 1):
-            z = i * grid_size
-            if abs(z) <= grid_range:
-                yz_points.append([0.0, -grid_range, z])
-                yz_points.append([0.0, grid_range, z])
-                yz_lines.append([line_idx * 2, line_idx * 2 + 1])
-                line_idx += 1
-        
-        if yz_points:
-            yz_grid.points = o3d.utility.Vector3dVector(np.array(yz_points))
-            yz_grid.lines = o3d.utility.Vector2iVector(np.array(yz_lines))
-            yz_grid.colors = o3d.utility.Vector3dVector([self.colors['grid']] * len(yz_lines))
-            grid_lines.append(yz_grid)
+        # 网格线所在位置（所有平面共用）
+        positions = np.arange(-num_lines//2, num_lines//2 + 1) * grid_size
+        positions = positions[np.abs(positions) <= grid_range]
+        num_positions = len(positions)
+        if num_positions == 0:
+            return grid_lines
+        
+        # 三个平面的网格线端点预先分配在同一个连续缓冲区中，每个平面占4 * num_positions行
+        plane_rows = 4 * num_positions
+        points = np.zeros((3 * plane_rows, 3), dtype=np.float64)
+        
+        def fill_plane_grid(plane_points: np.ndarray, axis_a: int, axis_b: int):
+            """填充axis_a、axis_b两轴所在平面的网格端点（另一轴坐标为0）"""
+            half = 2 * num_positions
+            # axis_a方向的网格线（平行于axis_b轴）：从-b到+b
+            plane_points[0:half:2, axis_a] = positions
+            plane_points[0:half:2, axis_b] = -grid_range
+            plane_points[1:half:2, axis_a] = positions
+            plane_points[1:half:2, axis_b] = grid_range
+            # axis_b方向的网格线（平行于axis_a轴）：从-a到+a
+            plane_points[half::2, axis_a] = -grid_range
+            plane_points[half::2, axis_b] = positions
+            plane_points[half + 1::2, axis_a] = grid_range
+            plane_points[half + 1::2, axis_b] = positions
+        
+        # XY平面网格（Z=0）、XZ平面网格（Y=0）、YZ平面网格（X=0）合并为一个LineSet
+        for i, (axis_a, axis_b) in enumerate(((0, 1), (0, 2), (1, 2))):
+            fill_plane_grid(points[i * plane_rows:(i + 1) * plane_rows], axis_a, axis_b)
+        
+        grid = o3d.geometry.LineSet()
+        grid.points = o3d.utility.Vector3dVector(points)
+        grid.lines = o3d.utility.Vector2iVector(np.arange(3 * plane_rows, dtype=np.int32).reshape(-1, 2))
+        grid.paint_uniform_color(self.colors['grid'])
+        grid_lines.append(grid)
         
         return grid_lines
     
+    def _capture_transformed_dense_colors(self, frame_id: int, geometry_name: str) -> int:
+        """
+        从已显示的变换后dense_cloud几何体中取回每个点的颜色，存入transformed_dense_cloud_colors
+        
+        Args:
+            frame_id: 帧ID
+            geometry_name: 变换后dense_cloud的几何体名称
+            
+        Returns:
+            取回颜色的点数，几何体不存在或没有颜色时返回0
+        """
+        pcd = self.geometries.get(geometry_name)
+        if not isinstance(pcd, o3d.geometry.PointCloud) or not pcd.has_colors():
+            return 0
+        colors_array = np.asarray(pcd.colors, dtype=np.float32)
+        self.transformed_dense_cloud_colors[frame_id] = colors_array
+        return len(colors_array)
+    
+    def _ensure_visualizer(self):
+        """创建可视化窗口（如果不存在），已有窗口但坐标系被清除时重新添加坐标系"""
+        if self.vis is None:
+            self.vis = self.create_visualizer()
+        elif _AXIS_NAMES[0] not in self.geometries:
+            self.add_coordinate_axes()
+    
     def add_coordinate_axes(self, length: float = None):
         """添加坐标系到可视化窗口"""
         if not Config.COORDINATE_AXIS_ENABLED:
@@ -836,40 +1162,54 @@ class PointCloudVisualizer:
         min_length = max(length, Config.COORDINATE_AXIS_LENGTH * 1.5)
         
         geometries = self.create_coordinate_axes(min_length)
-        axis_names = [
-            'coordinate_axis_x', 'coordinate_arrow_x',
-            'coordinate_axis_y', 'coordinate_arrow_y',
-            'coordinate_axis_z', 'coordinate_arrow_z',
-            'coordinate_label_x', 'coordinate_label_y', 'coordinate_label_z'
-        ]
-        
-        for geometry, name in zip(geometries, axis_names):
-            # 如果已存在，先移除
-            if name in self.geometries:
-                self.remove_geometry(name)
-            # 添加新的坐标轴、箭头或标记点
-            self.vis.add_geometry(geometry, reset_bounding_box=False)
-            self.geometries[name] = geometry
+        for geometry, name in zip(geometries, _AXIS_NAMES):
+            # 添加或原地更新坐标轴和箭头
+            self._place_coordinate_geometry(self.vis, name, geometry)
         
         # 添加网格
         if Config.COORDINATE_GRID_ENABLED:
             grid_geometries = self.create_coordinate_grid(min_length)
-            grid_names = ['coordinate_grid_xy', 'coordinate_grid_xz', 'coordinate_grid_yz']
-            
-            for geometry, name in zip(grid_geometries, grid_names):
-                # 如果已存在，先移除
-                if name in self.geometries:
-                    self.remove_geometry(name)
-                # 添加网格
-                self.vis.add_geometry(geometry, reset_bounding_box=False)
-                self.geometries[name] = geometry
+            for geometry, name in zip(grid_geometries, _GRID_NAMES):
+                self._place_coordinate_geometry(self.vis, name, geometry)
         
         # 设置鼠标回调函数
         self._setup_mouse_callbacks(self.vis)
         
-        # 添加坐标系后立即更新视图
-        self.vis.poll_events()
-        self.vis.update_renderer()
+        # 添加坐标系后更新视图（批量更新期间合并到最后一次刷新）
+        self.update_view()
+    
+    def _place_coordinate_geometry(self, vis: o3d.visualization.Visualizer, name: str,
+                                   geometry: o3d.geometry.Geometry):
+        """
+        把坐标系几何体放入窗口
+        
+        窗口中的几何体是缓存几何体的副本（缓存内容不能被修改），
+        已存在同类型几何体时只替换它的缓冲区并update_geometry，不再移除后重新添加
+        
+        Args:
+            vis: 可视化窗口
+            name: 几何体名称
+            geometry: create_coordinate_axes/create_coordinate_grid返回的缓存几何体
+        """
+        existing = self.geometries.get(name)
+        if existing is not None and type(existing) is type(geometry):
+            if isinstance(geometry, o3d.geometry.LineSet):
+                existing.points = geometry.points
+                existing.lines = geometry.lines
+                existing.colors = geometry.colors
+            else:
+                existing.vertices = geometry.vertices
+                existing.triangles = geometry.triangles
+                existing.vertex_normals = geometry.vertex_normals
+                existing.vertex_colors = geometry.vertex_colors
+            vis.update_geometry(existing)
+            return
+        
+        if existing is not None:
+            self.remove_geometry(name)
+        placed = type(geometry)(geometry)
+        vis.add_geometry(placed, reset_bounding_box=False)
+        self.geometries[name] = placed
     
     def _setup_mouse_callbacks(self, vis: o3d.visualization.Visualizer):
         """设置鼠标回调函数"""
@@ -886,6 +1226,17 @@ class PointCloudVisualizer:
         self.mouse_x = x
         self.mouse_y = y
     
+    def _visible_point_clouds(self):
+        """
+        遍历窗口中显示的点云（坐标系几何体都是LineSet或TriangleMesh，不需要再按名称排除）
+        
+        Returns:
+            (名称, PointCloud)的迭代器
+        """
+        point_cloud_type = o3d.geometry.PointCloud
+        return ((name, geometry) for name, geometry in self.geometries.items()
+                if type(geometry) is point_cloud_type)
+    
     def _get_cloud_info(self, cloud_name: str) -> Dict:
         """获取点云信息"""
         info = {
@@ -923,17 +1274,22 @@ class PointCloudVisualizer:
             # 默认阈值设为坐标轴长度的10%
             threshold = Config.COORDINATE_AXIS_LENGTH * 0.1
         
-        min_distance = float('inf')
-        nearest_info = None
+        if not self.axis_points:
+            return None
         
-        for name, info in self.axis_points.items():
-            distance = np.linalg.norm(point - info['position'])
-            if distance < threshold and distance < min_distance:
-                min_distance = distance
-                nearest_info = info.copy()
-                nearest_info['name'] = name
-                nearest_info['distance'] = distance
+        # 所有标记点一次性计算距离的平方，只对最近点开方
+        names = list(self.axis_points)
+        positions = np.array([self.axis_points[name]['position'] for name in names])
+        diff = positions - point
+        distances_sq = np.einsum('ij,ij->i', diff, diff)
+        nearest = int(np.argmin(distances_sq))
+        if not distances_sq[nearest] < threshold * threshold:
+            return None
         
+        name = names[nearest]
+        nearest_info = self.axis_points[name].copy()
+        nearest_info['name'] = name
+        nearest_info['distance'] = float(np.sqrt(distances_sq[nearest]))
         return nearest_info
     
     def pick_axis_point(self) -> Optional[Dict]:
@@ -986,16 +1342,12 @@ class PointCloudVisualizer:
             print("请在3D窗口中点击点云上的任意点")
             print("按ESC键取消选择")
             
-            # 获取所有点云
-            all_point_clouds = []
-            point_cloud_names = []
-            
-            for name, geometry in self.geometries.items():
-                if isinstance(geometry, o3d.geometry.PointCloud) and 'coordinate' not in name:
-                    all_point_clouds.append(geometry)
-                    point_cloud_names.append(name)
+            # 获取所有点云，只遍历一次几何体，添加到选择窗口和查找所属点云时共用
+            # 格式: [(名称, 点云, 点数), ...]
+            entries = [(name, geometry, len(geometry.points))
+                       for name, geometry in self._visible_point_clouds()]
             
-            if not all_point_clouds:
+            if not entries:
                 print("没有可选择的点云")
                 return None
             
@@ -1005,7 +1357,7 @@ class PointCloudVisualizer:
             pick_vis.create_window(window_name="选择点云点 (点击后按Q确认)", width=800, height=600)
             
             # 添加所有点云
-            for pcd in all_point_clouds:
+            for _, pcd, _ in entries:
                 pick_vis.add_geometry(pcd)
             
             # 运行选择模式
@@ -1023,40 +1375,36 @@ class PointCloudVisualizer:
             picked_idx = picked_indices[0]
             point_info = None
             
-            # 遍历所有点云，找到包含该点的点云
-            current_idx = 0
-            for i, (name, geometry) in enumerate(self.geometries.items()):
-                if isinstance(geometry, o3d.geometry.PointCloud) and 'coordinate' not in name:
-                    point_count = len(geometry.points)
-                    if current_idx <= picked_idx < current_idx + point_count:
-                        # 找到所属点云
-                        local_idx = picked_idx - current_idx
-                        point = np.asarray(geometry.points)[local_idx]
-                        
-                        point_info = {
-                            'point': point,
-                            'point_index': local_idx,
-                            'global_index': picked_idx,
-                            'cloud_name': name,
-                            'cloud_type': self.point_cloud_info.get(name, {}).get('type', 'unknown'),
-                            'cloud_point_count': point_count,
-                            'has_normals': geometry.has_normals(),
-                            'has_colors': geometry.has_colors()
-                        }
-                        
-                        # 如果有法向量，添加法向量信息
-                        if geometry.has_normals():
-                            normal = np.asarray(geometry.normals)[local_idx]
-                            point_info['normal'] = normal
-                        
-                        # 如果有颜色，添加颜色信息
-                        if geometry.has_colors():
-                            color = np.asarray(geometry.colors)[local_idx]
-                            point_info['color'] = color
-                        
-                        break
-                    
-                    current_idx += point_count
+            # 点云点数的前缀和，二分查找选中点所属的点云
+            cumulative_counts = np.cumsum([point_count for _, _, point_count in entries])
+            cloud_index = int(np.searchsorted(cumulative_counts, picked_idx, side='right'))
+            
+            if cloud_index < len(entries):
+                # 找到所属点云
+                name, geometry, point_count = entries[cloud_index]
+                local_idx = picked_idx - int(cumulative_counts[cloud_index] - point_count)
+                point = np.asarray(geometry.points)[local_idx]
+                
+                point_info = {
+                    'point': point,
+                    'point_index': local_idx,
+                    'global_index': picked_idx,
+                    'cloud_name': name,
+                    'cloud_type': self.point_cloud_info.get(name, {}).get('type', 'unknown'),
+                    'cloud_point_count': point_count,
+                    'has_normals': geometry.has_normals(),
+                    'has_colors': geometry.has_colors()
+                }
+                
+                # 如果有法向量，添加法向量信息
+                if geometry.has_normals():
+                    normal = np.asarray(geometry.normals)[local_idx]
+                    point_info['normal'] = normal
+                
+                # 如果有颜色，添加颜色信息
+                if geometry.has_colors():
+                    color = np.asarray(geometry.colors)[local_idx]
+                    point_info['color'] = color
             
             return point_info
             
@@ -1078,80 +1426,80 @@ class PointCloudVisualizer:
         if self.vis is None:
             return None
         
-        min_distance = float('inf')
+        query_point = np.asarray(query_point, dtype=np.float64)
+        # 比较距离的平方，只对最终结果开方
+        min_distance_sq = max_distance * max_distance
         nearest_info = None
         
-        for name, geometry in self.geometries.items():
-            if isinstance(geometry, o3d.geometry.PointCloud) and 'coordinate' not in name:
-                points = np.asarray(geometry.points)
-                if len(points) == 0:
-                    continue
+        for name, geometry in self._visible_point_clouds():
+            points = np.asarray(geometry.points)
+            if len(points) == 0:
+                continue
+            
+            # 使用缓存的KD树查找该点云中的最近点
+            cached = self._kdtrees.get(name)
+            if cached is None or cached[0] is not geometry:
+                cached = (geometry, o3d.geometry.KDTreeFlann(geometry))
+                self._kdtrees[name] = cached
+            _, indices, distances_sq = cached[1].search_knn_vector_3d(query_point, 1)
+            if not indices:
+                continue
+            min_idx = indices[0]
+            min_dist_sq = distances_sq[0]
+            
+            if min_dist_sq < min_distance_sq:
+                min_distance_sq = min_dist_sq
+                min_dist = float(np.sqrt(min_dist_sq))
+                point = points[min_idx]
                 
-                # 计算所有点到查询点的距离
-                distances = np.linalg.norm(points - query_point, axis=1)
-                min_idx = np.argmin(distances)
-                min_dist = distances[min_idx]
+                nearest_info = {
+                    'point': point,
+                    'point_index': int(min_idx),
+                    'cloud_name': name,
+                    'cloud_type': self.point_cloud_info.get(name, {}).get('type', 'unknown'),
+                    'cloud_point_count': len(points),
+                    'distance': float(min_dist),
+                    'has_normals': geometry.has_normals(),
+                    'has_colors': geometry.has_colors()
+                }
                 
-                if min_dist < max_distance and min_dist < min_distance:
-                    min_distance = min_dist
-                    point = points[min_idx]
-                    
-                    nearest_info = {
-                        'point': point,
-                        'point_index': int(min_idx),
-                        'cloud_name': name,
-                        'cloud_type': self.point_cloud_info.get(name, {}).get('type', 'unknown'),
-                        'cloud_point_count': len(points),
-                        'distance': float(min_dist),
-                        'has_normals': geometry.has_normals(),
-                        'has_colors': geometry.has_colors()
-                    }
-                    
-                    # 如果有法向量，添加法向量信息
-                    if geometry.has_normals():
-                        normals = np.asarray(geometry.normals)
-                        nearest_info['normal'] = normals[min_idx]
-                    
-                    # 如果有颜色，添加颜色信息
-                    if geometry.has_colors():
-                        colors = np.asarray(geometry.colors)
-                        nearest_info['color'] = colors[min_idx]
+                # 如果有法向量，添加法向量信息
+                if geometry.has_normals():
+                    normals = np.asarray(geometry.normals)
+                    nearest_info['normal'] = normals[min_idx]
+                
+                # 如果有颜色，添加颜色信息
+                if geometry.has_colors():
+                    colors = np.asarray(geometry.colors)
+                    nearest_info['color'] = colors[min_idx]
         
         return nearest_info
     
     def _calculate_axis_length(self) -> float:
-        """根据当前点云数据计算合适的坐标轴长度"""
+        """根据当前点云数据计算合适的坐标轴长度（结果缓存到点云集合发生变化为止）"""
         if not self.geometries:
             return Config.COORDINATE_AXIS_LENGTH
+        if self._axis_length_cache is not None:
+            return self._axis_length_cache
         
         # 获取所有点云的边界框
         max_length = 0.0
-        for name, geometry in self.geometries.items():
-            # 跳过坐标系本身
-            if 'coordinate' in name:
-                continue
-            if isinstance(geometry, o3d.geometry.PointCloud):
-                if len(geometry.points) > 0:
-                    bbox = geometry.get_axis_aligned_bounding_box()
-                    extent = bbox.get_extent()
-                    max_length = max(max_length, np.max(extent))
+        for _, geometry in self._visible_point_clouds():
+            if len(geometry.points) > 0:
+                bbox = geometry.get_axis_aligned_bounding_box()
+                extent = bbox.get_extent()
+                max_length = max(max_length, np.max(extent))
         
         # 坐标轴长度设为最大边界的15%（更显眼）
         if max_length > 0:
-            return max(max_length * 0.15, Config.COORDINATE_AXIS_LENGTH)
+            self._axis_length_cache = max(max_length * 0.15, Config.COORDINATE_AXIS_LENGTH)
         else:
-            return Config.COORDINATE_AXIS_LENGTH
+            self._axis_length_cache = Config.COORDINATE_AXIS_LENGTH
+        return self._axis_length_cache
     
     def remove_coordinate_axes(self):
         """移除坐标系和网格"""
-        axis_names = [
-            'coordinate_axis_x', 'coordinate_arrow_x',
-            'coordinate_axis_y', 'coordinate_arrow_y',
-            'coordinate_axis_z', 'coordinate_arrow_z',
-            'coordinate_label_x', 'coordinate_label_y', 'coordinate_label_z',
-            'coordinate_grid_xy', 'coordinate_grid_xz', 'coordinate_grid_yz'
-        ]
-        for name in axis_names:
+        for name in _COORDINATE_NAMES:
             if name in self.geometries:
                 self.remove_geometry(name)
         self.axis_points.clear()
@@ -1178,41 +1526,49 @@ class PointCloudVisualizer:
             print(f"无法从debug.txt读取变换矩阵 T_opt_w_b")
             return
         
+        # 帧、ply文件、位姿或偏移有变化时丢弃上一次的变换结果
+        cache_key = (frame_id, frame_data.get('source_mtimes'), T.tobytes(), x_offset, y_offset, z_offset)
+        if self._transformed_points_cache[0] != cache_key:
+            self._transformed_points_cache = (cache_key, {})
+        cached_points = self._transformed_points_cache[1]
+        
+        # 旋转和平移（含偏移）在本帧所有点云之间共用
+        rotation, translation = self._split_transform(T, [x_offset, y_offset, z_offset])
+        
+        # 各类型已加载的点云数量和点数，全部处理完后输出一行汇总
+        loaded_counts = {'dense_cloud': 0, 'ground': 0, 'plane': 0}
+        loaded_points = {'dense_cloud': 0, 'ground': 0, 'plane': 0}
+        
         # 处理dense_cloud
         if frame_data['dense_cloud'] is not None:
             pcd = frame_data['dense_cloud']
             points = np.asarray(pcd.points)
             
-            # 应用位姿变换
-            points_homogeneous = np.ones((len(points), 4))
-            points_homogeneous[:, :3] = points
-            transformed_points_homogeneous = (T @ points_homogeneous.T).T
-            transformed_points = transformed_points_homogeneous[:, :3]
+            # 每个点的颜色只取决于点数，在后台线程中与位姿变换同时生成
+            colors_future = self._color_executor.submit(self.generate_distinct_colors, len(points))
             
-            # 应用偏移
-            transformed_points[:, 0] += x_offset
-            transformed_points[:, 1] += y_offset
-            transformed_points[:, 2] += z_offset
+            # 上一次加载已计算过相同的变换时直接复用
+            transformed_points = cached_points.get('dense_cloud')
+            if transformed_points is None:
+                # 应用位姿变换和偏移
+                transformed_points = self._transform_points(points, rotation, translation)
+                cached_points['dense_cloud'] = transformed_points
             
             # 创建变换后的点云
             transformed_pcd = o3d.geometry.PointCloud()
             transformed_pcd.points = o3d.utility.Vector3dVector(transformed_points)
             
             # 设置统一的法向量
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(transformed_points), 1))
+            normals = uniform_normals(len(transformed_points))
             transformed_pcd.normals = o3d.utility.Vector3dVector(normals)
             
-            # 为每个点生成不同的颜色
+            # 为每个点生成不同的颜色（取回后台线程生成的颜色）
             num_points = len(transformed_points)
-            distinct_colors = self.generate_distinct_colors(num_points)
+            distinct_colors = colors_future.result()
             transformed_pcd.colors = o3d.utility.Vector3dVector(distinct_colors)
             
-            # 存储颜色映射
-            if frame_id not in self.transformed_dense_cloud_colors:
-                self.transformed_dense_cloud_colors[frame_id] = {}
-            for i, color in enumerate(distinct_colors):
-                self.transformed_dense_cloud_colors[frame_id][i] = color.tolist() if isinstance(color, np.ndarray) else list(color)
+            # 存储颜色映射（float32数组，按cur_id索引）
+            self.transformed_dense_cloud_colors[frame_id] = distinct_colors
             
             # 显示变换后的dense_cloud
             geometry_name = f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud"
@@ -1229,147 +1585,66 @@ class PointCloudVisualizer:
                 'z_offset': z_offset
             }
             
-            print(f"已加载并变换dense_cloud: {geometry_name} (点数: {num_points})")
-        
-        # 处理ground点云
-        for ground in frame_data['grounds']:
-            ground_name = ground.get('name', '')
-            pcd = ground['point_cloud']
-            
-            # 提取file_id
-            file_id = None
-            for pid, info in self.data_loader.ply_file_map.items():
-                if info.get('name') == ground_name and info.get('type') == 'ground':
-                    file_id = pid
-                    break
-            if file_id is None:
-                file_id = self.data_loader._extract_file_id(ground_name)
-            
-            # 确保file_id是整数类型
-            if file_id is None:
-                file_id = 0
-            elif isinstance(file_id, str):
-                try:
-                    file_id = int(file_id)
-                except ValueError:
-                    file_id = 0
-            else:
-                # 如果已经是数字类型，确保是整数
-                file_id = int(file_id)
-            
-            # 应用位姿变换
-            points = np.asarray(pcd.points)
-            points_homogeneous = np.ones((len(points), 4))
-            points_homogeneous[:, :3] = points
-            transformed_points_homogeneous = (T @ points_homogeneous.T).T
-            transformed_points = transformed_points_homogeneous[:, :3]
-            
-            # 应用偏移
-            transformed_points[:, 0] += x_offset
-            transformed_points[:, 1] += y_offset
-            transformed_points[:, 2] += z_offset
-            
-            # 创建变换后的点云
-            transformed_pcd = o3d.geometry.PointCloud()
-            transformed_pcd.points = o3d.utility.Vector3dVector(transformed_points)
-            
-            # 设置统一的法向量
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(transformed_points), 1))
-            transformed_pcd.normals = o3d.utility.Vector3dVector(normals)
-            
-            # 使用ID颜色（确保file_id是整数）
-            file_id_int = int(file_id)
-            color = self.get_color_by_id(file_id_int)
-            transformed_frame_id_to_color_ground[file_id_int] = color
-            
-            # 显示变换后的ground点云
-            geometry_name = f"transformed_cloud_{frame_id}_T_opt_w_b_ground_{file_id_int}"
-            self.add_geometry(transformed_pcd, geometry_name, color)
-            
-            # 存储点云信息
-            self.point_cloud_info[geometry_name] = {
-                'type': 'transformed_cloud',
-                'frame_id': frame_id,
-                'transform_name': 'T_opt_w_b',
-                'file_name': f'ground_{file_id_int}',
-                'x_offset': x_offset,
-                'y_offset': y_offset,
-                'z_offset': z_offset,
-                'id': file_id_int
-            }
-            
-            print(f"已加载并变换ground_{file_id_int}: {geometry_name} (点数: {len(transformed_points)})")
-        
-        # 处理plane点云
-        for plane in frame_data['planes']:
-            plane_name = plane.get('name', '')
-            pcd = plane['point_cloud']
-            
-            # 提取file_id
-            file_id = None
-            for pid, info in self.data_loader.ply_file_map.items():
-                if info.get('name') == plane_name and info.get('type') == 'plane':
-                    file_id = pid
-                    break
-            if file_id is None:
-                file_id = self.data_loader._extract_file_id(plane_name)
-            
-            # 确保file_id是整数类型
-            if file_id is None:
-                file_id = 0
-            elif isinstance(file_id, str):
-                try:
-                    file_id = int(file_id)
-                except ValueError:
-                    file_id = 0
-            else:
-                # 如果已经是数字类型，确保是整数
-                file_id = int(file_id)
-            
-            # 应用位姿变换
-            points = np.asarray(pcd.points)
-            points_homogeneous = np.ones((len(points), 4))
-            points_homogeneous[:, :3] = points
-            transformed_points_homogeneous = (T @ points_homogeneous.T).T
-            transformed_points = transformed_points_homogeneous[:, :3]
-            
-            # 应用偏移
-            transformed_points[:, 0] += x_offset
-            transformed_points[:, 1] += y_offset
-            transformed_points[:, 2] += z_offset
-            
-            # 创建变换后的点云
-            transformed_pcd = o3d.geometry.PointCloud()
-            transformed_pcd.points = o3d.utility.Vector3dVector(transformed_points)
-            
-            # 设置统一的法向量
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(transformed_points), 1))
-            transformed_pcd.normals = o3d.utility.Vector3dVector(normals)
-            
-            # 使用ID颜色（确保file_id是整数）
-            file_id_int = int(file_id)
-            color = self.get_color_by_id(file_id_int)
-            transformed_frame_id_to_color_plane[file_id_int] = color
-            
-            # 显示变换后的plane点云
-            geometry_name = f"transformed_cloud_{frame_id}_T_opt_w_b_plane_{file_id_int}"
-            self.add_geometry(transformed_pcd, geometry_name, color)
-            
-            # 存储点云信息
-            self.point_cloud_info[geometry_name] = {
-                'type': 'transformed_cloud',
-                'frame_id': frame_id,
-                'transform_name': 'T_opt_w_b',
-                'file_name': f'plane_{file_id_int}',
-                'x_offset': x_offset,
-                'y_offset': y_offset,
-                'z_offset': z_offset,
-                'id': file_id_int
-            }
-            
-            print(f"已加载并变换plane_{file_id_int}: {geometry_name} (点数: {len(transformed_points)})")
+            loaded_counts['dense_cloud'] += 1
+            loaded_points['dense_cloud'] += num_points
+            if Config.VERBOSE_DEBUG:
+                print(f"已加载并变换dense_cloud: {geometry_name} (点数: {num_points})")
+        
+        # 处理ground和plane点云（两种类型的处理流程相同，只有名称和颜色映射不同）
+        for cloud_type, clouds, id_to_color in (
+                ('ground', frame_data['grounds'], transformed_frame_id_to_color_ground),
+                ('plane', frame_data['planes'], transformed_frame_id_to_color_plane)):
+            for cloud in clouds:
+                cloud_name = cloud.get('name', '')
+                pcd = cloud['point_cloud']
+                
+                # 提取file_id，确保是整数类型（无法转换时使用0）
+                file_id_int = _coerce_id(self.data_loader.find_ply_file_id(cloud_name, cloud_type))
+                
+                # 应用位姿变换和偏移（上一次加载已计算过时直接复用）
+                transformed_points = cached_points.get(cloud_name)
+                if transformed_points is None:
+                    points = np.asarray(pcd.points)
+                    transformed_points = self._transform_points(points, rotation, translation)
+                    cached_points[cloud_name] = transformed_points
+                
+                # 创建变换后的点云
+                transformed_pcd = o3d.geometry.PointCloud()
+                transformed_pcd.points = o3d.utility.Vector3dVector(transformed_points)
+                
+                # 设置统一的法向量
+                normals = uniform_normals(len(transformed_points))
+                transformed_pcd.normals = o3d.utility.Vector3dVector(normals)
+                
+                # 使用ID颜色
+                color = self.get_color_by_id(file_id_int)
+                id_to_color[file_id_int] = color
+                
+                # 显示变换后的点云
+                file_name = f'{cloud_type}_{file_id_int}'
+                geometry_name = f"transformed_cloud_{frame_id}_T_opt_w_b_{file_name}"
+                self.add_geometry(transformed_pcd, geometry_name, color)
+                
+                # 存储点云信息
+                self.point_cloud_info[geometry_name] = {
+                    'type': 'transformed_cloud',
+                    'frame_id': frame_id,
+                    'transform_name': 'T_opt_w_b',
+                    'file_name': file_name,
+                    'x_offset': x_offset,
+                    'y_offset': y_offset,
+                    'z_offset': z_offset,
+                    'id': file_id_int
+                }
+                
+                loaded_counts[cloud_type] += 1
+                loaded_points[cloud_type] += len(transformed_points)
+                if Config.VERBOSE_DEBUG:
+                    print(f"已加载并变换{file_name}: {geometry_name} (点数: {len(transformed_points)})")
+        
+        print(f"已加载并变换帧 {frame_id}: "
+              + ", ".join(f"{cloud_type} {loaded_counts[cloud_type]}个 ({loaded_points[cloud_type]}点)"
+                          for cloud_type in loaded_counts))
     
     def load_and_display_frame(self, frame_id: int, frame_type: str = Config.FRAME_TYPE_FRAME,
                                x_offset: float = 0.0, y_offset: float = 0.0, z_offset: float = 10.0):
@@ -1387,6 +1662,16 @@ class PointCloudVisualizer:
             y_offset: y轴偏移量（用于位姿变换）
             z_offset: z轴偏移量（用于位姿变换）
         """
+        # 加载过程中的各次视图刷新合并为结束时的一次
+        self.begin_batch_update()
+        try:
+            self._load_and_display_frame(frame_id, frame_type, x_offset, y_offset, z_offset)
+        finally:
+            self.end_batch_update()
+    
+    def _load_and_display_frame(self, frame_id: int, frame_type: str,
+                                x_offset: float, y_offset: float, z_offset: float):
+        """load_and_display_frame的实现，在批量更新中执行"""
         # 检查窗口是否关闭，如果关闭则重新创建
         if self.vis is not None:
             try:
@@ -1394,11 +1679,11 @@ class PointCloudVisualizer:
                 self.vis.poll_events()
             except:
                 # 窗口已关闭或异常，需要重新创建
-                self.vis = None
-                self.geometries.clear()
+                self.reset_window()
         
-        # 清除当前显示（保留坐标系）
-        self.clear_all_geometries()
+        # 清除当前显示（保留坐标系，图层常驻点云留待新帧复用）
+        self.clear_all_geometries(keep_layers=True)
+        self.applied_offset = np.array([x_offset, y_offset, z_offset], dtype=np.float64)
         
         # 清空之前的ply文件map（切换帧时）
         self.data_loader.clear_ply_file_map()
@@ -1409,18 +1694,14 @@ class PointCloudVisualizer:
             map_data = self.data_loader.load_frame_data(frame_id, Config.FRAME_TYPE_MAP)
             
             # 创建窗口（如果不存在）
-            if self.vis is None:
-                self.vis = self.create_visualizer()
-            else:
-                if 'coordinate_axis_x' not in self.geometries:
-                    self.add_coordinate_axes()
+            self._ensure_visualizer()
             
             # 显示map点云（使用ID颜色）
             self._display_point_clouds(map_data, Config.FRAME_TYPE_MAP, None, None)
+            self._release_pending_layers()
             
             # 更新视图
-            self.vis.poll_events()
-            self.vis.update_renderer()
+            self.update_view()
             
             self.current_frame_id = frame_id
             self.current_frame_type = Config.FRAME_TYPE_MAP
@@ -1456,179 +1737,106 @@ class PointCloudVisualizer:
                 # 记录颜色（用于后续匹配）
                 for ground in frame_data['grounds']:
                     ground_name = ground.get('name', '')
-                    file_id = None
-                    for pid, info in self.data_loader.ply_file_map.items():
-                        if info.get('name') == ground_name and info.get('type') == 'ground':
-                            file_id = pid
-                            break
-                    if file_id is None:
-                        file_id = self.data_loader._extract_file_id(ground_name)
+                    file_id = _coerce_id(self.data_loader.find_ply_file_id(ground_name, 'ground'), None)
                     if file_id is not None:
-                        if isinstance(file_id, str):
-                            try:
-                                file_id = int(file_id)
-                            except ValueError:
-                                continue
                         color = self.get_color_by_id(file_id)
                         transformed_frame_id_to_color_ground[file_id] = color
                 
                 for plane in frame_data['planes']:
                     plane_name = plane.get('name', '')
-                    file_id = None
-                    for pid, info in self.data_loader.ply_file_map.items():
-                        if info.get('name') == plane_name and info.get('type') == 'plane':
-                            file_id = pid
-                            break
-                    if file_id is None:
-                        file_id = self.data_loader._extract_file_id(plane_name)
+                    file_id = _coerce_id(self.data_loader.find_ply_file_id(plane_name, 'plane'), None)
                     if file_id is not None:
-                        if isinstance(file_id, str):
-                            try:
-                                file_id = int(file_id)
-                            except ValueError:
-                                continue
                         color = self.get_color_by_id(file_id)
                         transformed_frame_id_to_color_plane[file_id] = color
             
             # 步骤3: 加载match.json，建立匹配关系
             self.data_loader.clear_ply_file_map()
             match_info = self.data_loader.load_match_info(frame_id, use_dynamic_class=False)
-            print(f"[DEBUG] match_info类型: {type(match_info)}, match_info是否为None: {match_info is None}")
+            if Config.VERBOSE_DEBUG:
+                print(f"[DEBUG] match_info类型: {type(match_info)}, match_info是否为None: {match_info is None}")
             if match_info:
-                def extract_id_from_obj(obj):
-                    """从对象中提取id，支持对象格式{"a": 1, "b": 3}和整数格式"""
-                    if isinstance(obj, dict):
-                        # 对象格式: {"a": 1, "b": 3}，返回(a, b)
-                        a = obj.get('a')
-                        b = obj.get('b')
-                        return (a, b) if a is not None and b is not None else None
-                    elif isinstance(obj, int):
-                        # 整数格式，直接返回
-                        return obj
-                    else:
-                        return None
-                
-                # 只支持 plane_match_infos 格式
-                match_list = []
-                if hasattr(match_info, 'plane_match_infos'):
-                    match_list = match_info.plane_match_infos
-                    print(f"[DEBUG] 从动态类属性获取plane_match_infos，数量: {len(match_list) if match_list else 0}")
-                elif isinstance(match_info, dict) and 'plane_match_infos' in match_info:
-                    match_list = match_info['plane_match_infos']
-                    print(f"[DEBUG] 从字典获取plane_match_infos，数量: {len(match_list) if match_list else 0}")
-                else:
-                    print(f"[DEBUG] WARNING: 无法找到plane_match_infos")
-                    if hasattr(match_info, '__dict__'):
-                        print(f"[DEBUG] match_info的属性: {dir(match_info)}")
-                    elif isinstance(match_info, dict):
+                # 只支持 plane_match_infos 格式（cur_id/other_id已由load_match_info转换为IdPair）
+                match_list = match_info.get('plane_match_infos')
+                if match_list is None:
+                    match_list = []
+                    if Config.VERBOSE_DEBUG:
+                        print(f"[DEBUG] WARNING: 无法找到plane_match_infos")
                         print(f"[DEBUG] match_info的keys: {list(match_info.keys())}")
+                elif Config.VERBOSE_DEBUG:
+                    print(f"[DEBUG] 从字典获取plane_match_infos，数量: {len(match_list)}")
                 
-                print(f"[DEBUG] 开始解析 {len(match_list)} 个匹配项")
+                if Config.VERBOSE_DEBUG:
+                    print(f"[DEBUG] 开始解析 {len(match_list)} 个匹配项")
                 for idx, match in enumerate(match_list):
-                    # 处理动态类实例或字典两种情况
-                    if hasattr(match, 'cur_id'):
-                        cur_id_raw = match.cur_id
-                        other_id_raw = match.other_id
-                    elif isinstance(match, dict):
-                        cur_id_raw = match.get('cur_id')
-                        other_id_raw = match.get('other_id')
-                    else:
-                        print(f"[DEBUG] 匹配项 {idx}: 无法获取cur_id和other_id，match类型: {type(match)}")
-                        continue
-                    
-                    # 提取cur_id和other_id
-                    cur_id_info = extract_id_from_obj(cur_id_raw)
-                    other_id_info = extract_id_from_obj(other_id_raw)
-                    
-                    if cur_id_info is None or other_id_info is None:
-                        print(f"[DEBUG] 匹配项 {idx}: cur_id_raw={cur_id_raw}, other_id_raw={other_id_raw}, 提取失败")
+                    if type(match) is not dict:
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 匹配项 {idx}: 无法获取cur_id和other_id，match类型: {type(match)}")
                         continue
+                    cur_id_raw = match.get('cur_id')
+                    other_id_raw = match.get('other_id')
                     
-                    # 处理cur_id为对象格式的情况 {"a": 1, "b": 3}
-                    if isinstance(cur_id_info, tuple):
-                        cur_type, cur_id = cur_id_info  # a=1表示plane, a=2表示ground
-                    else:
-                        # cur_id是整数，无法判断类型，跳过
+                    # cur_id必须是对象格式 {"a": 1, "b": 3}，a=1表示plane, a=2表示ground
+                    if type(cur_id_raw) is not IdPair or None in cur_id_raw:
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 匹配项 {idx}: cur_id_raw={cur_id_raw}, other_id_raw={other_id_raw}, 提取失败")
                         continue
+                    cur_type, cur_id = cur_id_raw
                     
-                    # 处理other_id为对象格式的情况 {"a": 1, "b": 4}
-                    if isinstance(other_id_info, tuple):
-                        other_type, other_id = other_id_info
-                    elif isinstance(other_id_info, int):
-                        other_id = other_id_info
-                        other_type = None
+                    # other_id可以是对象格式 {"a": 1, "b": 4}或整数
+                    if type(other_id_raw) is IdPair:
+                        other_type, other_id = other_id_raw
+                    elif type(other_id_raw) is int:
+                        other_type, other_id = None, other_id_raw
                     else:
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 匹配项 {idx}: cur_id_raw={cur_id_raw}, other_id_raw={other_id_raw}, 提取失败")
                         continue
                     
                     # 检查匹配是否有效（other_id >= 0，允许0作为有效ID）
-                    if not isinstance(other_id, int) or other_id < 0:
+                    if type(other_id) is not int or other_id < 0:
                         continue
                     
-                    # 确保cur_id和other_id都是整数类型
+                    # 确保cur_id是整数类型（other_id已在上面检查）
                     cur_id = int(cur_id)
-                    other_id = int(other_id)
                     
                     # 根据cur_type分别存储到对应的匹配映射中
                     if cur_type == 1:  # plane
                         match_mapping_plane[cur_id] = other_id
-                        print(f"[DEBUG] 解析plane匹配: cur_id={cur_id} (frame_plane_{cur_id}), other_id={other_id} (map_plane_{other_id})")
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 解析plane匹配: cur_id={cur_id} (frame_plane_{cur_id}), other_id={other_id} (map_plane_{other_id})")
                     elif cur_type == 2:  # ground
                         match_mapping_ground[cur_id] = other_id
                 
                 # 根据匹配关系，建立map点云的颜色映射（使用匹配的变换后frame点云颜色）
-                for cur_id, other_id in match_mapping_ground.items():
-                    # 确保cur_id和other_id都是整数类型
-                    cur_id_int = int(cur_id)
-                    other_id_int = int(other_id)
-                    
-                    if cur_id_int in transformed_frame_id_to_color_ground:
-                        map_id_to_color[other_id_int] = transformed_frame_id_to_color_ground[cur_id_int]
-                        print(f"[DEBUG] 建立ground匹配: transformed_frame_ground_{cur_id_int} -> map_ground_{other_id_int}, 颜色: RGB({transformed_frame_id_to_color_ground[cur_id_int][0]:.3f}, {transformed_frame_id_to_color_ground[cur_id_int][1]:.3f}, {transformed_frame_id_to_color_ground[cur_id_int][2]:.3f})")
-                    else:
-                        print(f"[DEBUG] WARNING: transformed_frame_ground_{cur_id_int}不在transformed_frame_id_to_color_ground中，无法建立map_ground_{other_id_int}的颜色映射")
-                
-                for cur_id, other_id in match_mapping_plane.items():
-                    # 确保cur_id和other_id都是整数类型
-                    cur_id_int = int(cur_id)
-                    other_id_int = int(other_id)
-                    
-                    if cur_id_int in transformed_frame_id_to_color_plane:
-                        map_id_to_color[other_id_int] = transformed_frame_id_to_color_plane[cur_id_int]
-                        print(f"[DEBUG] 建立plane匹配: transformed_frame_plane_{cur_id_int} -> map_plane_{other_id_int}, 颜色: RGB({transformed_frame_id_to_color_plane[cur_id_int][0]:.3f}, {transformed_frame_id_to_color_plane[cur_id_int][1]:.3f}, {transformed_frame_id_to_color_plane[cur_id_int][2]:.3f})")
-                    else:
-                        print(f"[DEBUG] WARNING: transformed_frame_plane_{cur_id_int}不在transformed_frame_id_to_color_plane中，无法建立map_plane_{other_id_int}的颜色映射")
-                        print(f"[DEBUG] transformed_frame_id_to_color_plane包含的keys: {list(transformed_frame_id_to_color_plane.keys())}")
+                # 解析时cur_id/other_id已经是整数，可以直接作为key查找
+                for cloud_type, mapping, frame_id_to_color in (
+                    ('ground', match_mapping_ground, transformed_frame_id_to_color_ground),
+                    ('plane', match_mapping_plane, transformed_frame_id_to_color_plane),
+                ):
+                    unmatched_ids = []  # 找不到变换后frame颜色的cur_id，循环结束后统一输出
+                    for cur_id, other_id in mapping.items():
+                        color = frame_id_to_color.get(cur_id)
+                        if color is not None:
+                            map_id_to_color[other_id] = color
+                            if Config.VERBOSE_DEBUG:
+                                print(f"[DEBUG] 建立{cloud_type}匹配: transformed_frame_{cloud_type}_{cur_id} -> map_{cloud_type}_{other_id}, 颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                        else:
+                            unmatched_ids.append(cur_id)
+                    if unmatched_ids and Config.VERBOSE_DEBUG:
+                        print(f"[DEBUG] WARNING: {len(unmatched_ids)} 个{cloud_type}匹配的cur_id不在transformed_frame_id_to_color_{cloud_type}中，无法建立map点云颜色映射: {unmatched_ids}")
+                        print(f"[DEBUG] transformed_frame_id_to_color_{cloud_type}包含的keys: {sorted(frame_id_to_color.keys())}")
                 
-                print(f"\n[DEBUG] 加载match.json: 找到 {len(match_mapping_ground)} 个ground匹配, {len(match_mapping_plane)} 个plane匹配")
-                print(f"[DEBUG] 建立了 {len(map_id_to_color)} 个map点云颜色映射")
-                print(f"[DEBUG] transformed_frame_id_to_color_plane包含的id: {list(transformed_frame_id_to_color_plane.keys())}")
-                print(f"[DEBUG] match_mapping_plane: {match_mapping_plane}")
-                print(f"[DEBUG] map_id_to_color包含的plane id: {[k for k in map_id_to_color.keys() if isinstance(k, int)]}")
+                print(f"加载match.json: 找到 {len(match_mapping_ground)} 个ground匹配, {len(match_mapping_plane)} 个plane匹配，"
+                      f"建立了 {len(map_id_to_color)} 个map点云颜色映射")
+                if Config.VERBOSE_DEBUG:
+                    print(f"[DEBUG] match_mapping_plane: {match_mapping_plane}")
             
             # 处理 dense_pt_match_infos
             dense_pt_match_mapping = {}  # dense_cloud的cur_id (frame) -> other_id (map)的映射
             if match_info:
-                # 处理 dense_pt_match_infos
-                if hasattr(match_info, 'dense_pt_match_infos'):
-                    for match in match_info.dense_pt_match_infos:
-                        if hasattr(match, 'cur_id') and hasattr(match, 'other_id'):
-                            cur_id = match.cur_id
-                            other_id = match.other_id
-                            if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                                dense_pt_match_mapping[cur_id] = other_id
-                        elif isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                            cur_id = match['cur_id']
-                            other_id = match['other_id']
-                            if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                                dense_pt_match_mapping[cur_id] = other_id
-                elif isinstance(match_info, dict) and 'dense_pt_match_infos' in match_info:
-                    for match in match_info['dense_pt_match_infos']:
-                        if isinstance(match, dict) and 'cur_id' in match and 'other_id' in match:
-                            cur_id = match['cur_id']
-                            other_id = match['other_id']
-                            if isinstance(cur_id, int) and isinstance(other_id, int) and other_id >= 0:
-                                dense_pt_match_mapping[cur_id] = other_id
-                print(f"[DEBUG] 加载match.json: 找到 {len(dense_pt_match_mapping)} 个dense_cloud点匹配")
+                dense_pt_match_mapping = self.data_loader.get_dense_pt_match_mapping(frame_id, match_info)
+                if Config.VERBOSE_DEBUG:
+                    print(f"[DEBUG] 加载match.json: 找到 {len(dense_pt_match_mapping)} 个dense_cloud点匹配")
             
             # 如果需要匹配dense_cloud颜色，但transformed颜色还不存在，尝试从已加载的几何体中获取
             if (len(dense_pt_match_mapping) > 0 and 
@@ -1637,40 +1845,30 @@ class PointCloudVisualizer:
                 # 尝试从已加载的transformed dense_cloud几何体中获取颜色
                 transformed_geometry_name = f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud"
                 if transformed_geometry_name in self.geometries:
-                    transformed_pcd = self.geometries[transformed_geometry_name]
-                    if isinstance(transformed_pcd, o3d.geometry.PointCloud) and transformed_pcd.has_colors():
-                        colors_array = np.asarray(transformed_pcd.colors)
-                        num_points = len(colors_array)
-                        # 存储颜色映射
-                        if frame_id not in self.transformed_dense_cloud_colors:
-                            self.transformed_dense_cloud_colors[frame_id] = {}
-                        for i in range(min(num_points, len(colors_array))):
-                            self.transformed_dense_cloud_colors[frame_id][i] = colors_array[i].tolist()
-                        print(f"[DEBUG] 从已加载的transformed dense_cloud几何体中获取了 {num_points} 个点的颜色")
+                    num_points = self._capture_transformed_dense_colors(frame_id, transformed_geometry_name)
+                    if num_points > 0:
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 从已加载的transformed dense_cloud几何体中获取了 {num_points} 个点的颜色")
                 else:
                     # 如果几何体也不存在，尝试加载transformed dense_cloud（使用默认参数）
                     # 检查是否有debug.txt
                     debug_info = self.data_loader.load_debug_info(frame_id, use_dynamic_class=False)
                     if debug_info and 'T_opt_w_b' in debug_info:
-                        print(f"[DEBUG] 尝试自动加载transformed dense_cloud以获取颜色...")
+                        if Config.VERBOSE_DEBUG:
+                            print(f"[DEBUG] 尝试自动加载transformed dense_cloud以获取颜色...")
                         # 使用默认偏移量加载
                         try:
                             self.load_and_transform_point_cloud(frame_id, transform_name='T_opt_w_b', 
                                                                x_offset=0.0, y_offset=0.0, z_offset=10.0)
                             # 再次检查颜色是否已存储
                             if frame_id in self.transformed_dense_cloud_colors and len(self.transformed_dense_cloud_colors[frame_id]) > 0:
-                                print(f"[DEBUG] 已自动加载transformed dense_cloud并获取了 {len(self.transformed_dense_cloud_colors[frame_id])} 个点的颜色")
+                                if Config.VERBOSE_DEBUG:
+                                    print(f"[DEBUG] 已自动加载transformed dense_cloud并获取了 {len(self.transformed_dense_cloud_colors[frame_id])} 个点的颜色")
                             else:
                                 # 如果还是没有，尝试从刚加载的几何体中获取
-                                if transformed_geometry_name in self.geometries:
-                                    transformed_pcd = self.geometries[transformed_geometry_name]
-                                    if isinstance(transformed_pcd, o3d.geometry.PointCloud) and transformed_pcd.has_colors():
-                                        colors_array = np.asarray(transformed_pcd.colors)
-                                        num_points = len(colors_array)
-                                        if frame_id not in self.transformed_dense_cloud_colors:
-                                            self.transformed_dense_cloud_colors[frame_id] = {}
-                                        for i in range(num_points):
-                                            self.transformed_dense_cloud_colors[frame_id][i] = colors_array[i].tolist()
+                                num_points = self._capture_transformed_dense_colors(frame_id, transformed_geometry_name)
+                                if num_points > 0:
+                                    if Config.VERBOSE_DEBUG:
                                         print(f"[DEBUG] 从刚加载的几何体中获取了 {num_points} 个点的颜色")
                         except Exception as e:
                             print(f"[DEBUG] 自动加载transformed dense_cloud失败: {e}")
@@ -1691,28 +1889,22 @@ class PointCloudVisualizer:
             # 绘制dense_cloud匹配点的连接线（按点类型分别创建）
             if len(dense_pt_match_mapping) > 0:
                 self._draw_dense_pt_match_lines(frame_id, dense_pt_match_mapping, x_offset, y_offset, z_offset)
+            
+            # 创建窗口（如果不存在）
+            self._ensure_visualizer()
         else:
             # 如果不是FRAME类型，正常加载
             frame_data = self.data_loader.load_frame_data(frame_id, frame_type)
             
-            if self.vis is None:
-                self.vis = self.create_visualizer()
-            else:
-                if 'coordinate_axis_x' not in self.geometries:
-                    self.add_coordinate_axes()
+            self._ensure_visualizer()
             
             self._display_point_clouds(frame_data, frame_type, None, None)
         
-        # 创建窗口（如果不存在）
-        if self.vis is None:
-            self.vis = self.create_visualizer()
-        else:
-            if 'coordinate_axis_x' not in self.geometries:
-                self.add_coordinate_axes()
+        # 移除新帧中不存在的图层
+        self._release_pending_layers()
         
         # 更新视图
-        self.vis.poll_events()
-        self.vis.update_renderer()
+        self.update_view()
         
         self.current_frame_id = frame_id
         self.current_frame_type = frame_type
@@ -1737,26 +1929,27 @@ class PointCloudVisualizer:
         # 显示dense_cloud
         if frame_data['dense_cloud'] is not None:
             dense_name = f"{prefix}dense_cloud" if prefix else 'dense_cloud'
-            print(f"\n[DEBUG] _display_point_clouds: 加载 dense_cloud")
-            print(f"  - 名称: {dense_name}")
+            if Config.VERBOSE_DEBUG:
+                print(f"\n[DEBUG] _display_point_clouds: 加载 dense_cloud")
+                print(f"  - 名称: {dense_name}")
             
             pcd = frame_data['dense_cloud']
             num_points = len(pcd.points)
             
             # 如果是frame类型，设置统一的法向量
             if frame_type == Config.FRAME_TYPE_FRAME:
-                uniform_normal = np.array([0.0, 0.0, 1.0])
-                normals = np.tile(uniform_normal, (num_points, 1))
+                normals = uniform_normals(num_points)
                 pcd.normals = o3d.utility.Vector3dVector(normals)
             
             # 如果是map类型，且存在匹配关系和transformed颜色，根据匹配关系设置每个点的颜色
-            print(f"[DEBUG] _display_point_clouds dense_cloud条件检查:")
-            print(f"  - prefix: {prefix}")
-            print(f"  - dense_pt_match_mapping is not None: {dense_pt_match_mapping is not None}")
-            print(f"  - frame_id: {frame_id}")
-            print(f"  - frame_id in transformed_dense_cloud_colors: {frame_id in self.transformed_dense_cloud_colors if frame_id is not None else False}")
-            if frame_id is not None and frame_id in self.transformed_dense_cloud_colors:
-                print(f"  - transformed_dense_cloud_colors[{frame_id}] 有 {len(self.transformed_dense_cloud_colors[frame_id])} 个颜色")
+            if Config.VERBOSE_DEBUG:
+                print(f"[DEBUG] _display_point_clouds dense_cloud条件检查:")
+                print(f"  - prefix: {prefix}")
+                print(f"  - dense_pt_match_mapping is not None: {dense_pt_match_mapping is not None}")
+                print(f"  - frame_id: {frame_id}")
+                print(f"  - frame_id in transformed_dense_cloud_colors: {frame_id in self.transformed_dense_cloud_colors if frame_id is not None else False}")
+                if frame_id is not None and frame_id in self.transformed_dense_cloud_colors:
+                    print(f"  - transformed_dense_cloud_colors[{frame_id}] 有 {len(self.transformed_dense_cloud_colors[frame_id])} 个颜色")
             
             if (prefix == "map_" and dense_pt_match_mapping is not None and 
                 frame_id is not None and frame_id in self.transformed_dense_cloud_colors and
@@ -1765,25 +1958,28 @@ class PointCloudVisualizer:
                 transformed_colors = self.transformed_dense_cloud_colors[frame_id]
                 # 创建颜色数组，初始化为红色（未匹配的点显示为红色）
                 red_color = [1.0, 0.0, 0.0]  # 红色
-                colors_array = np.tile(np.array(red_color), (num_points, 1))
+                colors_array = np.full((num_points, 3), red_color, dtype=np.float64)
                 
                 # 根据匹配关系设置颜色（匹配的点使用变换后frame点的颜色）
-                matched_count = 0
-                for cur_id, other_id in dense_pt_match_mapping.items():
-                    if cur_id in transformed_colors and other_id >= 0 and other_id < num_points:
-                        colors_array[other_id] = transformed_colors[cur_id]
-                        matched_count += 1
+                cur_ids = np.fromiter(dense_pt_match_mapping.keys(), dtype=np.int64, count=len(dense_pt_match_mapping))
+                other_ids = np.fromiter(dense_pt_match_mapping.values(), dtype=np.int64, count=len(dense_pt_match_mapping))
+                valid = ((cur_ids >= 0) & (cur_ids < len(transformed_colors)) &
+                         (other_ids >= 0) & (other_ids < num_points))
+                colors_array[other_ids[valid]] = transformed_colors[cur_ids[valid]]
+                matched_count = int(np.count_nonzero(valid))
                 
                 # 将颜色设置到点云对象上
                 pcd.colors = o3d.utility.Vector3dVector(colors_array)
                 unmatched_count = num_points - matched_count
-                print(f"  - 根据匹配关系设置了 {matched_count} 个点的颜色（共 {num_points} 个点），未匹配 {unmatched_count} 个点显示为红色")
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - 根据匹配关系设置了 {matched_count} 个点的颜色（共 {num_points} 个点），未匹配 {unmatched_count} 个点显示为红色")
                 self.add_geometry(pcd, dense_name, None)  # 传递None以使用点云对象上已设置的颜色
             else:
                 # 如果不是map类型或没有匹配关系，使用默认颜色（非红色）
                 dense_color = self.colors['dense_cloud']
-                print(f"  - 使用默认颜色: RGB({dense_color[0]:.3f}, {dense_color[1]:.3f}, {dense_color[2]:.3f})")
-                if prefix == "map_" and dense_pt_match_mapping is not None:
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - 使用默认颜色: RGB({dense_color[0]:.3f}, {dense_color[1]:.3f}, {dense_color[2]:.3f})")
+                if Config.VERBOSE_DEBUG and prefix == "map_" and dense_pt_match_mapping is not None:
                     print(f"  - [WARNING] 无法应用匹配颜色: prefix={prefix}, match_mapping存在={dense_pt_match_mapping is not None}, frame_id={frame_id}, 颜色数据存在={frame_id in self.transformed_dense_cloud_colors if frame_id is not None else False}")
                 self.add_geometry(pcd, dense_name, dense_color)
             
@@ -1797,65 +1993,46 @@ class PointCloudVisualizer:
         # 显示ground点云
         for ground in frame_data['grounds']:
             ground_name = ground.get('name', '')
-            # 从ply_file_map中查找对应的id
-            file_id = None
-            for pid, info in self.data_loader.ply_file_map.items():
-                if info.get('name') == ground_name and info.get('type') == 'ground':
-                    file_id = pid
-                    break
-
-            # 如果找不到，尝试从文件名中提取id
-            if file_id is None:
-                file_id = self.data_loader._extract_file_id(ground_name)
-
-            # 确保file_id是整数
-            if file_id is None:
-                file_id = 0
-            elif isinstance(file_id, str):
-                try:
-                    file_id = int(file_id)
-                except ValueError:
-                    file_id = 0
+            # 从ply_file_map中查找对应的id（找不到时从文件名中提取），并确保是整数
+            file_id = _coerce_id(self.data_loader.find_ply_file_id(ground_name, 'ground'))
 
             name = f"{prefix}ground_{file_id}" if prefix else f"ground_{file_id}"
-            print(f"\n[DEBUG] _display_point_clouds: 加载 ground 点云")
-            print(f"  - 文件名: {ground_name}")
-            print(f"  - 显示名称: {name}")
-            print(f"  - file_id: {file_id}")
+            if Config.VERBOSE_DEBUG:
+                print(f"\n[DEBUG] _display_point_clouds: 加载 ground 点云")
+                print(f"  - 文件名: {ground_name}")
+                print(f"  - 显示名称: {name}")
+                print(f"  - file_id: {file_id}")
             
             # 如果是frame类型，设置统一的法向量
             if frame_type == Config.FRAME_TYPE_FRAME:
-                uniform_normal = np.array([0.0, 0.0, 1.0])
-                normals = np.tile(uniform_normal, (len(ground['point_cloud'].points), 1))
+                normals = uniform_normals(len(ground['point_cloud'].points))
                 ground['point_cloud'].normals = o3d.utility.Vector3dVector(normals)
             
             # 根据match.json设置颜色
             pcd = ground['point_cloud']
             if prefix == "map_" and map_id_to_color is not None:
                 # 显示map点云，使用匹配的frame点云颜色
-                # 确保file_id是整数类型，与map_id_to_color的key类型一致
-                file_id_int = int(file_id) if file_id is not None else 0
-                
-                # 尝试查找匹配的颜色（支持整数key）
-                color = None
-                if file_id_int in map_id_to_color:
-                    color = map_id_to_color[file_id_int]
-                    print(f"  - map点云匹配到frame点云，使用颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                # file_id在查找时已经转换为整数，与map_id_to_color的key类型一致
+                color = map_id_to_color.get(file_id)
+                if color is not None:
+                    if Config.VERBOSE_DEBUG:
+                        print(f"  - map点云匹配到frame点云，使用颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
                 else:
                     # map点云未匹配，使用红色
                     color = [1.0, 0.0, 0.0]  # 红色
-                    print(f"  - map点云未匹配，使用红色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
-                    print(f"  - [DEBUG] map_id_to_color中的keys: {list(map_id_to_color.keys())}, file_id={file_id_int}, file_id类型={type(file_id_int)}")
+                    if Config.VERBOSE_DEBUG:
+                        print(f"  - map点云未匹配，使用红色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                        print(f"  - [DEBUG] map_id_to_color中的keys: {list(map_id_to_color.keys())}, file_id={file_id}, file_id类型={type(file_id)}")
             elif match_mapping is not None and map_id_to_color is not None and frame_type == Config.FRAME_TYPE_FRAME:
                 # 显示frame点云，使用正常id颜色（不再根据匹配关系设置）
                 color = self.get_color_by_id(file_id)
-                color = [max(0.0, min(1.0, c)) for c in color]
-                print(f"  - frame点云颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - frame点云颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
             else:
                 # 使用文件实际id对应的颜色（正常显示）
                 color = self.get_color_by_id(file_id)
-                color = [max(0.0, min(1.0, c)) for c in color]
-                print(f"  - 最终颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - 最终颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
             
             self.add_geometry(pcd, name, color)
             
@@ -1872,66 +2049,47 @@ class PointCloudVisualizer:
         # 显示plane点云
         for plane in frame_data['planes']:
             plane_name = plane.get('name', '')
-            # 从ply_file_map中查找对应的id
-            file_id = None
-            for pid, info in self.data_loader.ply_file_map.items():
-                if info.get('name') == plane_name and info.get('type') == 'plane':
-                    file_id = pid
-                    break
-
-            # 如果找不到，尝试从文件名中提取id
-            if file_id is None:
-                file_id = self.data_loader._extract_file_id(plane_name)
-
-            # 确保file_id是整数
-            if file_id is None:
-                file_id = 0
-            elif isinstance(file_id, str):
-                try:
-                    file_id = int(file_id)
-                except ValueError:
-                    file_id = 0
+            # 从ply_file_map中查找对应的id（找不到时从文件名中提取），并确保是整数
+            file_id = _coerce_id(self.data_loader.find_ply_file_id(plane_name, 'plane'))
 
             name = f"{prefix}plane_{file_id}" if prefix else f"plane_{file_id}"
-            print(f"\n[DEBUG] _display_point_clouds: 加载 plane 点云")
-            print(f"  - 文件名: {plane_name}")
-            print(f"  - 显示名称: {name}")
-            print(f"  - file_id: {file_id}")
+            if Config.VERBOSE_DEBUG:
+                print(f"\n[DEBUG] _display_point_clouds: 加载 plane 点云")
+                print(f"  - 文件名: {plane_name}")
+                print(f"  - 显示名称: {name}")
+                print(f"  - file_id: {file_id}")
             
             # 如果是frame类型，设置统一的法向量
             if frame_type == Config.FRAME_TYPE_FRAME:
-                uniform_normal = np.array([0.0, 0.0, 1.0])
-                normals = np.tile(uniform_normal, (len(plane['point_cloud'].points), 1))
+                normals = uniform_normals(len(plane['point_cloud'].points))
                 plane['point_cloud'].normals = o3d.utility.Vector3dVector(normals)
             
             # 根据match.json设置颜色
             pcd = plane['point_cloud']
             if prefix == "map_" and map_id_to_color is not None:
                 # 显示map点云，使用匹配的frame点云颜色
-                # 确保file_id是整数类型，与map_id_to_color的key类型一致
-                file_id_int = int(file_id) if file_id is not None else 0
-                
-                # 尝试查找匹配的颜色（支持整数key）
-                color = None
-                if file_id_int in map_id_to_color:
-                    color = map_id_to_color[file_id_int]
-                    print(f"  - map点云匹配到frame点云，使用颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                # file_id在查找时已经转换为整数，与map_id_to_color的key类型一致
+                color = map_id_to_color.get(file_id)
+                if color is not None:
+                    if Config.VERBOSE_DEBUG:
+                        print(f"  - map点云匹配到frame点云，使用颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
                 else:
                     # map点云未匹配，使用红色
                     color = [1.0, 0.0, 0.0]  # 红色
-                    print(f"  - map点云未匹配，使用红色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
-                    print(f"  - [DEBUG] map_id_to_color中的keys: {list(map_id_to_color.keys())}, file_id={file_id_int}, file_id类型={type(file_id_int)}")
-                    print(f"  - [DEBUG] 尝试查找的key: {file_id_int}, key是否在map中: {file_id_int in map_id_to_color}")
+                    if Config.VERBOSE_DEBUG:
+                        print(f"  - map点云未匹配，使用红色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                        print(f"  - [DEBUG] map_id_to_color中的keys: {list(map_id_to_color.keys())}, file_id={file_id}, file_id类型={type(file_id)}")
+                        print(f"  - [DEBUG] 尝试查找的key: {file_id}, key是否在map中: {file_id in map_id_to_color}")
             elif match_mapping is not None and map_id_to_color is not None and frame_type == Config.FRAME_TYPE_FRAME:
                 # 显示frame点云，使用正常id颜色（不再根据匹配关系设置）
                 color = self.get_color_by_id(file_id)
-                color = [max(0.0, min(1.0, c)) for c in color]
-                print(f"  - frame点云颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - frame点云颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
             else:
                 # 使用文件实际id对应的颜色（正常显示）
                 color = self.get_color_by_id(file_id)
-                color = [max(0.0, min(1.0, c)) for c in color]
-                print(f"  - 最终颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
+                if Config.VERBOSE_DEBUG:
+                    print(f"  - 最终颜色: RGB({color[0]:.3f}, {color[1]:.3f}, {color[2]:.3f})")
             
             self.add_geometry(pcd, name, color)
             
@@ -1945,12 +2103,86 @@ class PointCloudVisualizer:
                 'id': file_id
             }
     
+    def translate_transformed_clouds(self, frame_id: int, x_offset: float, y_offset: float,
+                                    z_offset: float) -> bool:
+        """
+        将已加载的变换点云平移到新的偏移位置（不重新读取文件和计算位姿变换）
+        
+        会同时处理可见和隐藏的变换点云、过滤后的dense_cloud点云以及匹配连接线的frame端点
+        
+        Args:
+            frame_id: 帧ID
+            x_offset: 新的x轴偏移量
+            y_offset: 新的y轴偏移量
+            z_offset: 新的z轴偏移量
+            
+        Returns:
+            True表示已平移，False表示没有可平移的几何体（需要重新加载帧）
+        """
+        if self.vis is None or self.current_frame_id != frame_id:
+            return False
+        
+        offset = np.array([x_offset, y_offset, z_offset], dtype=np.float64)
+        delta = offset - self.applied_offset
+        
+        cloud_prefixes = (f"transformed_cloud_{frame_id}_", f"filtered_dense_cloud_{frame_id}_")
+        line_prefix = f"dense_pt_match_lines_{frame_id}_"
+        
+        translated = False
+        for geometries, visible in ((self.geometries, True), (self.hidden_geometries, False)):
+            for name, entry in geometries.items():
+                geometry = entry if visible else entry['geometry']
+                if name.startswith(cloud_prefixes):
+                    geometry.translate(delta, relative=True)
+                    self._kdtrees.pop(name, None)
+                    if not visible and entry.get('info'):
+                        # 隐藏时点云信息保存在hidden_geometries中，重新显示时会恢复，需要同步更新偏移量
+                        info = entry['info']
+                        info['x_offset'], info['y_offset'], info['z_offset'] = x_offset, y_offset, z_offset
+                elif name.startswith(line_prefix):
+                    # 连接线的偶数点是frame点（带偏移），奇数点是map点（不带偏移）
+                    line_points = np.asarray(geometry.points).copy()
+                    line_points[0::2] += delta
+                    geometry.points = o3d.utility.Vector3dVector(line_points)
+                else:
+                    continue
+                if visible:
+                    self.vis.update_geometry(geometry)
+                translated = True
+        
+        if not translated:
+            return False
+        
+        for info in self.point_cloud_info.values():
+            if info.get('type') == 'transformed_cloud' and info.get('frame_id') == frame_id:
+                info['x_offset'], info['y_offset'], info['z_offset'] = x_offset, y_offset, z_offset
+        
+        self.applied_offset = offset
+        self.update_view()
+        return True
+    
     def update_view(self):
-        """更新视图显示"""
+        """更新视图显示（批量更新期间只记录需要刷新）"""
+        if self._batch_depth > 0:
+            self._redraw_pending = True
+            return
         if self.vis is not None:
             self.vis.poll_events()
             self.vis.update_renderer()
     
+    def begin_batch_update(self):
+        """开始批量更新：之后的update_view调用会被合并，直到对应的end_batch_update"""
+        self._batch_depth += 1
+    
+    def end_batch_update(self):
+        """结束批量更新，如果期间有update_view请求则只刷新一次"""
+        if self._batch_depth == 0:
+            return
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._redraw_pending:
+            self._redraw_pending = False
+            self.update_view()
+    
     def is_window_open(self) -> bool:
         """检查窗口是否仍然打开"""
         if self.vis is None:
@@ -1961,6 +2193,22 @@ class PointCloudVisualizer:
         except:
             return False
     
+    def reset_window(self):
+        """
+        丢弃（已关闭的）可视化窗口，并重置与窗口中几何体对应的状态
+        
+        窗口关闭后其中的几何体随之失效，可见点云计数、KD树、图层常驻点云等都要一起清空，
+        下次打开窗口时重新添加的几何体才会被正确计数
+        """
+        self.vis = None
+        self.geometries.clear()
+        self._kdtrees.clear()
+        self._visible_count.clear()
+        self._pending_layers.clear()
+        self.persistent_pcds.clear()
+        self._layer_names.clear()
+        self._axis_length_cache = None
+    
     def destroy(self):
         """销毁可视化窗口"""
         self.running = False
@@ -1969,18 +2217,17 @@ class PointCloudVisualizer:
                 self.vis.destroy_window()
             except:
                 pass  # 窗口可能已经关闭
-            self.vis = None
-            self.geometries.clear()
+            self.reset_window()
     
     def get_frame_info(self, frame_id: int) -> Dict:
-        """获取帧的信息"""
-        frame_data = self.data_loader.load_frame_data(frame_id, self.current_frame_type)
+        """获取帧的信息（只统计文件列表，不读取ply文件）"""
+        files = self.data_loader.get_frame_files(frame_id, self.current_frame_type)
         return {
             'frame_id': frame_id,
             'frame_type': self.current_frame_type,
-            'has_dense_cloud': frame_data['dense_cloud'] is not None,
-            'num_grounds': len(frame_data['grounds']),
-            'num_planes': len(frame_data['planes'])
+            'has_dense_cloud': bool(files.get('dense_cloud')),
+            'num_grounds': len(files.get('ground', [])),
+            'num_planes': len(files.get('plane', []))
         }
     
     def load_and_transform_point_cloud(self, frame_id: int, transform_name: str = 'T_opt_w_b', 
@@ -2000,6 +2247,7 @@ class PointCloudVisualizer:
         if T is None:
             print(f"无法从debug.txt读取变换矩阵 {transform_name}")
             return
+        rotation, translation = self._split_transform(T, [x_offset, y_offset, z_offset])
         
         # 2. 获取当前帧frame文件夹的所有ply文件
         frame_path = Config.get_frame_data_path(frame_id, Config.FRAME_TYPE_FRAME)
@@ -2020,31 +2268,16 @@ class PointCloudVisualizer:
         
         # 先清除之前的所有变换点云（以frame_id和transform_name为标识）
         # 包括可见和隐藏的变换点云
-        transformed_geometry_names = [
-            name for name in self.geometries.keys() 
-            if name.startswith(f"transformed_cloud_{frame_id}_{transform_name}_")
-        ]
-        for name in transformed_geometry_names:
-            self.remove_geometry(name)
+        self.remove_geometries_with_prefix(f"transformed_cloud_{frame_id}_{transform_name}_")
         
-        # 清除隐藏的变换点云
-        hidden_transformed_names = [
-            name for name in self.hidden_geometries.keys()
-            if name.startswith(f"transformed_cloud_{frame_id}_{transform_name}_")
-        ]
-        for name in hidden_transformed_names:
-            # 从hidden_geometries中移除
-            if name in self.hidden_geometries:
-                del self.hidden_geometries[name]
-            # 如果还在point_cloud_info中，也移除
-            if name in self.point_cloud_info:
-                del self.point_cloud_info[name]
+        # 各类型原始点云的可见状态，所有ply文件共用，只计算一次
+        type_visibility = self._frame_type_visibility()
         
         # 3. 遍历所有ply文件，对每个文件应用变换
         total_points = 0
-        for ply_file in sorted(ply_files):
-            # 加载点云
-            pcd = self.data_loader.load_point_cloud(ply_file)
+        ply_files.sort()
+        # 在后台线程中按顺序读取ply文件，变换当前文件时后续文件继续读取
+        for ply_file, pcd in zip(ply_files, self.data_loader.load_point_clouds(ply_files)):
             if pcd is None or len(pcd.points) == 0:
                 print(f"无法加载点云或点云为空: {ply_file}")
                 continue
@@ -2052,18 +2285,8 @@ class PointCloudVisualizer:
             # 将每个点使用位姿变换矩阵变换
             points = np.asarray(pcd.points)
             
-            # 转换为齐次坐标
-            points_homogeneous = np.ones((len(points), 4))
-            points_homogeneous[:, :3] = points
-            
-            # 应用变换矩阵
-            transformed_points_homogeneous = (T @ points_homogeneous.T).T
-            transformed_points = transformed_points_homogeneous[:, :3]
-            
-            # 应用x、y、z轴偏移
-            transformed_points[:, 0] += x_offset
-            transformed_points[:, 1] += y_offset
-            transformed_points[:, 2] += z_offset
+            # 应用变换矩阵和x、y、z轴偏移
+            transformed_points = self._transform_points(points, rotation, translation)
             
             # 创建新的点云对象
             transformed_pcd = o3d.geometry.PointCloud()
@@ -2072,8 +2295,7 @@ class PointCloudVisualizer:
             # 注意：数据文件不包含颜色信息，颜色由add_geometry函数设置
             
             # 设置统一的法向量（固定值）
-            uniform_normal = np.array([0.0, 0.0, 1.0])
-            normals = np.tile(uniform_normal, (len(transformed_points), 1))
+            normals = uniform_normals(len(transformed_points))
             transformed_pcd.normals = o3d.utility.Vector3dVector(normals)
             
             # 5. 叠加绘制到坐标系中，使用文件名作为标识
@@ -2085,36 +2307,16 @@ class PointCloudVisualizer:
             # 因为frame文件夹和map文件夹中的点云ID可能不一致
             # 只有在用户手动隐藏了某个类型的点云时，才隐藏对应的变换点云
             
-            # 检查map文件夹中是否有对应类型的点云（包括可见和隐藏的）
-            has_corresponding_type = False
-            if file_stem == 'dense_cloud':
-                has_corresponding_type = 'dense_cloud' in self.geometries or 'dense_cloud' in self.hidden_geometries
-            elif file_stem.startswith('ground_'):
-                has_corresponding_type = any(name.startswith('ground_') for name in list(self.geometries.keys()) + list(self.hidden_geometries.keys())
-                                           if not name.startswith('transformed_cloud_'))
-            elif file_stem.startswith('plane_'):
-                has_corresponding_type = any(name.startswith('plane_') for name in list(self.geometries.keys()) + list(self.hidden_geometries.keys())
-                                            if not name.startswith('transformed_cloud_'))
-            
-            # 检查对应类型的点云是否可见
-            original_type_visible = True
-            if has_corresponding_type:
-                # map中有对应类型的点云，检查是否可见
-                if file_stem == 'dense_cloud':
-                    original_type_visible = 'dense_cloud' in self.geometries
-                elif file_stem.startswith('ground_'):
-                    original_type_visible = any(name.startswith('ground_') for name in self.geometries.keys() 
-                                               if not name.startswith('transformed_cloud_'))
-                elif file_stem.startswith('plane_'):
-                    original_type_visible = any(name.startswith('plane_') for name in self.geometries.keys() 
-                                               if not name.startswith('transformed_cloud_'))
-            # 如果map中没有对应类型的点云，original_type_visible保持为True，默认显示变换点云
-            
-            # 根据文件类型分配颜色
+            # 检查对应类型的点云是否可见（类型状态在循环前已统一计算）
+            # 如果没有对应类型的点云，original_type_visible为True，默认显示变换点云
+            cloud_type = self._cloud_type_of(file_stem)
+            original_type_visible = type_visibility.get(cloud_type, True)
+            
+            # 根据文件类型分配颜色（类型已由_cloud_type_of判断，不再逐个前缀比较）
             transform_color = None
             use_per_point_colors = False  # 是否使用每个点不同的颜色
             
-            if file_stem == 'dense_cloud':
+            if cloud_type == 'dense_cloud':
                 # dense_cloud：为每个点生成不同的颜色
                 num_points = len(transformed_points)
                 distinct_colors = self.generate_distinct_colors(num_points)
@@ -2122,30 +2324,14 @@ class PointCloudVisualizer:
                 transformed_pcd.colors = o3d.utility.Vector3dVector(distinct_colors)
                 use_per_point_colors = True
                 
-                # 存储每个点的颜色映射（cur_id -> color），用于后续匹配map的dense_cloud
-                if frame_id not in self.transformed_dense_cloud_colors:
-                    self.transformed_dense_cloud_colors[frame_id] = {}
-                # 将颜色数组转换为字典，key为点的索引（cur_id），value为颜色
-                colors_dict = {}
-                for i, color in enumerate(distinct_colors):
-                    colors_dict[i] = color.tolist() if isinstance(color, np.ndarray) else list(color)
-                self.transformed_dense_cloud_colors[frame_id] = colors_dict
+                # 存储每个点的颜色映射（第cur_id行为cur_id点的颜色），用于后续匹配map的dense_cloud
+                self.transformed_dense_cloud_colors[frame_id] = distinct_colors
                 
                 print(f"  - dense_cloud: 为 {num_points} 个点生成了不同的颜色，已存储颜色映射")
-            elif file_stem.startswith('ground_'):
-                # 从文件名中提取ground的id
-                try:
-                    ground_id = int(file_stem.split('_')[1])
-                    transform_color = self.get_color_by_id(ground_id)
-                except (ValueError, IndexError):
-                    transform_color = self.get_color_by_id(0)
-            elif file_stem.startswith('plane_'):
-                # 从文件名中提取plane的id
-                try:
-                    plane_id = int(file_stem.split('_')[1])
-                    transform_color = self.get_color_by_id(plane_id)
-                except (ValueError, IndexError):
-                    transform_color = self.get_color_by_id(0)
+            elif cloud_type is not None:
+                # 从文件名中提取ground/plane的id（无法提取时使用id 0的颜色）
+                id_match = _CLOUD_FILE_ID_RE.match(file_stem)
+                transform_color = self.get_color_by_id(int(id_match.group(1)) if id_match else 0)
             else:
                 # 未知类型，使用默认灰色
                 transform_color = [0.5, 0.5, 0.5]
@@ -2155,13 +2341,12 @@ class PointCloudVisualizer:
             if use_per_point_colors:
                 self.add_geometry(transformed_pcd, geometry_name, None)
             else:
-                # 确保颜色值在0-1范围内
-                transform_color = [max(0.0, min(1.0, c)) for c in transform_color]
+                # add_geometry会把颜色截断到[0,1]
                 self.add_geometry(transformed_pcd, geometry_name, transform_color)
             
             # 如果map中有对应类型的点云但被隐藏了，隐藏变换点云（用于同步显示/隐藏）
-            # 如果map中没有对应类型的点云，默认显示变换点云
-            if has_corresponding_type and not original_type_visible:
+            # 如果map中没有对应类型的点云，original_type_visible为True，默认显示变换点云
+            if not original_type_visible:
                 self.hide_geometry(geometry_name)
             
             # 存储点云信息
@@ -2201,21 +2386,19 @@ class PointCloudVisualizer:
         
         num_points = len(map_dense_cloud.points)
         
-        # 获取所有匹配的map点id（other_id）
-        matched_map_ids = set()
+        # 一次遍历建立反向映射 {map点id: frame点id}（多个frame点匹配同一map点时保留第一个）
+        map_to_frame_id = {}
         for cur_id, other_id in dense_pt_match_mapping.items():
-            if isinstance(other_id, int) and other_id >= 0 and other_id < num_points:
-                matched_map_ids.add(other_id)
-        
-        # 获取所有map点id（0到num_points-1）
-        all_map_ids = set(range(num_points))
+            if type(other_id) is int and 0 <= other_id < num_points:
+                map_to_frame_id.setdefault(other_id, cur_id)
         
-        # 计算未匹配的点id
-        unmatched_map_ids = all_map_ids - matched_map_ids
+        # 未匹配的点id：所有map点id（0到num_points-1）中没有被匹配的
+        is_matched = np.zeros(num_points, dtype=bool)
+        is_matched[np.fromiter(map_to_frame_id, dtype=np.int64, count=len(map_to_frame_id))] = True
         
         # 按从大到小排序
-        matched_ids_sorted = sorted(matched_map_ids, reverse=True)
-        unmatched_ids_sorted = sorted(unmatched_map_ids, reverse=True)
+        matched_ids_sorted = sorted(map_to_frame_id, reverse=True)
+        unmatched_ids_sorted = np.flatnonzero(~is_matched)[::-1].tolist()
         
         # 保存到txt文件
         frame_dir = Config.get_data_frame_path(frame_id)
@@ -2227,14 +2410,9 @@ class PointCloudVisualizer:
             with open(matched_file, 'w', encoding='utf-8') as f:
                 f.write(f"匹配的map dense_cloud点id（共 {len(matched_ids_sorted)} 个，按id从大到小排序）\n")
                 f.write("=" * 50 + "\n")
-                for point_id in matched_ids_sorted:
-                    # 找到对应的frame点id
-                    frame_id_for_point = None
-                    for cur_id, other_id in dense_pt_match_mapping.items():
-                        if other_id == point_id:
-                            frame_id_for_point = cur_id
-                            break
-                    f.write(f"map_id: {point_id:6d} -> frame_id: {frame_id_for_point}\n")
+                # 先拼接成一个字符串再一次写入
+                f.write("".join([f"map_id: {point_id:6d} -> frame_id: {map_to_frame_id[point_id]}\n"
+                                 for point_id in matched_ids_sorted]))
             print(f"[INFO] 已保存匹配的点id到: {matched_file}")
             print(f"  - 匹配的点数: {len(matched_ids_sorted)}")
         except Exception as e:
@@ -2245,8 +2423,8 @@ class PointCloudVisualizer:
             with open(unmatched_file, 'w', encoding='utf-8') as f:
                 f.write(f"未匹配的map dense_cloud点id（共 {len(unmatched_ids_sorted)} 个，按id从大到小排序）\n")
                 f.write("=" * 50 + "\n")
-                for point_id in unmatched_ids_sorted:
-                    f.write(f"{point_id}\n")
+                if unmatched_ids_sorted:
+                    f.write("\n".join(map(str, unmatched_ids_sorted)) + "\n")
             print(f"[INFO] 已保存未匹配的点id到: {unmatched_file}")
             print(f"  - 未匹配的点数: {len(unmatched_ids_sorted)}")
         except Exception as e:
@@ -2267,23 +2445,9 @@ class PointCloudVisualizer:
         if self.vis is None:
             return
         
-        # 获取transformed dense_cloud点云
-        transformed_dense_name = f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud"
-        transformed_pcd = None
-        
-        if transformed_dense_name in self.geometries:
-            transformed_pcd = self.geometries[transformed_dense_name]
-        elif transformed_dense_name in self.hidden_geometries:
-            transformed_pcd = self.hidden_geometries[transformed_dense_name]['geometry']
-        
-        # 获取map dense_cloud点云
-        map_dense_name = "map_dense_cloud"
-        map_pcd = None
-        
-        if map_dense_name in self.geometries:
-            map_pcd = self.geometries[map_dense_name]
-        elif map_dense_name in self.hidden_geometries:
-            map_pcd = self.hidden_geometries[map_dense_name]['geometry']
+        # 获取transformed dense_cloud和map dense_cloud点云（无论显示还是隐藏）
+        transformed_pcd = self.get_geometry(f"transformed_cloud_{frame_id}_T_opt_w_b_dense_cloud")
+        map_pcd = self.get_geometry("map_dense_cloud")
         
         # 检查点云是否存在
         if transformed_pcd is None or map_pcd is None:
@@ -2294,13 +2458,14 @@ class PointCloudVisualizer:
             print(f"[WARNING] 无法绘制连接线: 点云类型不正确")
             return
         
-        # 获取点坐标
+        # 获取点坐标（只转换一次，直接传给_create_lineset_for_point_type）
         transformed_points = np.asarray(transformed_pcd.points)
         map_points = np.asarray(map_pcd.points)
         
         # 根据点类型分类匹配关系
         # matched_to_dense: 在dense_pt_match_mapping中的点（这些点有对应的连接线）
-        matched_to_dense_mapping = dense_pt_match_mapping.copy()
+        # 映射是DataLoader缓存的只读字典，这里直接共用，不复制
+        matched_to_dense_mapping = dense_pt_match_mapping
         
         # 为matched_to_dense类型创建连接线
         if len(matched_to_dense_mapping) > 0:
@@ -2335,47 +2500,32 @@ class PointCloudVisualizer:
         if len(match_mapping) == 0:
             return
         
-        # 创建连接线的点和线段
-        line_points = []
-        line_indices = []
-        
-        point_idx = 0
-        valid_matches = 0
-        
-        for cur_id, other_id in match_mapping.items():
-            # 检查索引是否有效
-            if cur_id < 0 or cur_id >= len(transformed_points):
-                continue
-            if other_id < 0 or other_id >= len(map_points):
-                continue
-            
-            # 添加frame点
-            frame_point = transformed_points[cur_id]
-            line_points.append(frame_point)
-            frame_point_idx = point_idx
-            point_idx += 1
-            
-            # 添加map点
-            map_point = map_points[other_id]
-            line_points.append(map_point)
-            map_point_idx = point_idx
-            point_idx += 1
-            
-            # 添加线段（连接frame点和map点）
-            line_indices.append([frame_point_idx, map_point_idx])
-            valid_matches += 1
-        
-        if len(line_points) == 0:
+        # 一次取出所有匹配的frame点id和map点id，去掉越界的索引
+        count = len(match_mapping)
+        cur_ids = np.fromiter(match_mapping.keys(), dtype=np.int64, count=count)
+        other_ids = np.fromiter(match_mapping.values(), dtype=np.int64, count=count)
+        valid = ((cur_ids >= 0) & (cur_ids < len(transformed_points)) &
+                 (other_ids >= 0) & (other_ids < len(map_points)))
+        cur_ids = cur_ids[valid]
+        other_ids = other_ids[valid]
+        
+        valid_matches = len(cur_ids)
+        if valid_matches == 0:
             return
         
+        # 创建连接线的点和线段：偶数点是frame点，奇数点是map点，第i条线段连接第2i和2i+1个点
+        line_points = np.empty((2 * valid_matches, 3), dtype=np.float64)
+        line_points[0::2] = transformed_points[cur_ids]
+        line_points[1::2] = map_points[other_ids]
+        line_indices = np.arange(2 * valid_matches, dtype=np.int32).reshape(-1, 2)
+        
         # 创建LineSet
         lineset = o3d.geometry.LineSet()
-        lineset.points = o3d.utility.Vector3dVector(np.array(line_points))
-        lineset.lines = o3d.utility.Vector2iVector(np.array(line_indices))
+        lineset.points = o3d.utility.Vector3dVector(line_points)
+        lineset.lines = o3d.utility.Vector2iVector(line_indices)
         
         # 设置连接线颜色（使用黄色，便于区分）
-        line_colors = np.tile(np.array([1.0, 1.0, 0.0]), (len(line_indices), 1))  # 黄色
-        lineset.colors = o3d.utility.Vector3dVector(line_colors)
+        lineset.paint_uniform_color([1.0, 1.0, 0.0])  # 黄色
         
         # 添加到可视化器
         geometry_name = f"dense_pt_match_lines_{frame_id}_{point_type}"